@@ -2,6 +2,7 @@ import re
 from collections import namedtuple
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, List, Mapping, NamedTuple, Sequence, Set, Tuple, Union
 
 from django.utils.functional import cached_property
@@ -34,6 +35,10 @@ from sentry.utils.validators import is_event_id
 
 WILDCARD_CHARS = re.compile(r"[\*]")
 
+# Maximum number of distinct queries whose parse trees are kept in memory, see
+# `parse_search_query`.
+PARSE_TREE_CACHE_SIZE = 1000
+
 event_search_grammar = Grammar(
     r"""
 search = spaces term*
@@ -986,12 +991,26 @@ default_config = SearchConfig(
 )
 
 
+@lru_cache(maxsize=PARSE_TREE_CACHE_SIZE)
+def _parse_tree(query):
+    return event_search_grammar.parse(query)
+
+
 def parse_search_query(query, config=None, params=None) -> Sequence[SearchFilter]:
+    """
+    Parses a search query into a list of search filters.
+
+    Parsing the grammar is the expensive part of this and its result neither
+    depends on the config nor the params, so parse trees are cached per query
+    and shared by all callers. The tree is visited on every call, since the
+    visitor depends on both and resolves relative dates against the current
+    time.
+    """
     if config is None:
         config = default_config
 
     try:
-        tree = event_search_grammar.parse(query)
+        tree = _parse_tree(query)
     except IncompleteParseError as e:
         idx = e.column()
         prefix = query[max(0, idx - 5) : idx]
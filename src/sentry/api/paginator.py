@@ -2,6 +2,7 @@ import bisect
 import functools
 import math
 from datetime import datetime
+from hashlib import md5
 
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import connections
@@ -9,6 +10,9 @@ from django.db.models.functions import Lower
 from django.db.models.sql.datastructures import EmptyResultSet
 from django.utils import timezone
 
+from sentry import options
+from sentry.utils import json, metrics
+from sentry.utils.cache import cache
 from sentry.utils.compat import map, zip
 from sentry.utils.cursors import Cursor, CursorResult, build_cursor
 
@@ -23,6 +27,83 @@ class BadPaginationError(Exception):
     pass
 
 
+def _get_hits_sql(queryset, max_hits=None):
+    hits_query = queryset.values()
+    if max_hits is not None:
+        hits_query = hits_query[:max_hits]
+    hits_query = hits_query.query
+    # clear out any select fields (include select_related) and pull just the id
+    hits_query.clear_select_clause()
+    hits_query.add_fields(["id"])
+    hits_query.clear_ordering(force_empty=True)
+    return hits_query.sql_with_params()
+
+
+def _count_hits_exact(queryset, max_hits):
+    h_sql, h_params = _get_hits_sql(queryset, max_hits)
+    cursor = connections[queryset.db].cursor()
+    cursor.execute(f"SELECT COUNT(*) FROM ({h_sql}) as t", h_params)
+    return cursor.fetchone()[0]
+
+
+def _count_hits_estimate(queryset, max_hits):
+    """
+    Uses the planner's estimate of the number of rows to skip counting them
+    if there are clearly more than `max_hits`. Hits are counted exactly if
+    the estimate is close to or below `max_hits`.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        h_sql, h_params = _get_hits_sql(queryset)
+        cursor = connection.cursor()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {h_sql}", h_params)
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = plan[0]["Plan"]["Plan Rows"]
+        if estimate >= max_hits * options.get("api.paginator.count-hits-estimate-factor"):
+            metrics.incr("api.paginator.count_hits.estimated", skip_internal=True)
+            return max_hits
+
+    return _count_hits_exact(queryset, max_hits)
+
+
+HIT_COUNTERS = {
+    "exact": _count_hits_exact,
+    "estimate": _count_hits_estimate,
+}
+
+
+def count_hits(queryset, max_hits):
+    """
+    Returns the number of rows of `queryset`, up to `max_hits`, as counted
+    by the strategy configured in `api.paginator.count-hits-strategy`.
+    Counts are cached for `api.paginator.count-hits-cache-ttl` seconds.
+    """
+    if not max_hits:
+        return 0
+    try:
+        h_sql, h_params = _get_hits_sql(queryset)
+    except EmptyResultSet:
+        return 0
+
+    cache_ttl = options.get("api.paginator.count-hits-cache-ttl")
+    if cache_ttl:
+        cache_key = "api.paginator.hits:{}".format(
+            md5(repr((queryset.db, h_sql, tuple(h_params), max_hits)).encode("utf-8")).hexdigest()
+        )
+        hits = cache.get(cache_key)
+        if hits is not None:
+            metrics.incr("api.paginator.count_hits.cache_hit", skip_internal=True)
+            return hits
+
+    hits = HIT_COUNTERS[options.get("api.paginator.count-hits-strategy")](queryset, max_hits)
+
+    if cache_ttl:
+        cache.set(cache_key, hits, cache_ttl)
+    return hits
+
+
 class BasePaginator:
     def __init__(
         self, queryset, order_by=None, max_limit=MAX_LIMIT, on_results=None, post_query_filter=None
@@ -175,20 +256,7 @@ class BasePaginator:
         return cursor
 
     def count_hits(self, max_hits):
-        if not max_hits:
-            return 0
-        hits_query = self.queryset.values()[:max_hits].query
-        # clear out any select fields (include select_related) and pull just the id
-        hits_query.clear_select_clause()
-        hits_query.add_fields(["id"])
-        hits_query.clear_ordering(force_empty=True)
-        try:
-            h_sql, h_params = hits_query.sql_with_params()
-        except EmptyResultSet:
-            return 0
-        cursor = connections[self.queryset.db].cursor()
-        cursor.execute(f"SELECT COUNT(*) FROM ({h_sql}) as t", h_params)
-        return cursor.fetchone()[0]
+        return count_hits(self.queryset, max_hits)
 
 
 class Paginator(BasePaginator):
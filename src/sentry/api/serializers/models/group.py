@@ -1,5 +1,6 @@
 import functools
 import logging
+import threading
 from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import Iterable, Mapping, Optional, Tuple
@@ -7,8 +8,10 @@ from typing import Iterable, Mapping, Optional, Tuple
 import pytz
 import sentry_sdk
 from django.conf import settings
+from django.db import close_old_connections
 from django.db.models import Min
 from django.utils import timezone
+from sentry_sdk import Hub
 
 from sentry import tagstore, tsdb
 from sentry.api.serializers import Serializer, register, serialize
@@ -57,6 +60,7 @@ from sentry.types.integrations import ExternalProviders
 from sentry.utils import metrics
 from sentry.utils.cache import cache
 from sentry.utils.compat import zip
+from sentry.utils.concurrent import SynchronousExecutor, ThreadedExecutor
 from sentry.utils.db import attach_foreignkey
 from sentry.utils.safe import safe_execute
 from sentry.utils.snuba import Dataset, aliased_query, raw_query
@@ -67,6 +71,49 @@ snuba_tsdb = SnubaTSDB(**settings.SENTRY_TSDB_OPTIONS)
 
 logger = logging.getLogger(__name__)
 
+_snuba_query_executor = None
+_snuba_query_executor_lock = threading.Lock()
+
+
+def get_snuba_query_executor():
+    """
+    Returns the process-wide executor for the Snuba queries of
+    `StreamGroupSerializerSnuba`, configured through
+    ``SENTRY_GROUP_SERIALIZER_SNUBA_WORKERS``. Queries are executed immediately
+    in the current thread if there are no workers.
+    """
+    global _snuba_query_executor
+
+    worker_count = settings.SENTRY_GROUP_SERIALIZER_SNUBA_WORKERS
+    if not worker_count:
+        return SynchronousExecutor()
+
+    with _snuba_query_executor_lock:
+        if _snuba_query_executor is None:
+            _snuba_query_executor = ThreadedExecutor(worker_count=worker_count)
+        return _snuba_query_executor
+
+
+def submit_snuba_query(executor, function, *args, **kwargs):
+    """
+    Submits `function(*args, **kwargs)` to `executor`, keeping the current Hub so
+    that its spans end up in the current transaction.
+    """
+    hub = Hub(Hub.current)
+    threaded = isinstance(executor, ThreadedExecutor)
+
+    def run():
+        try:
+            with hub:
+                return function(*args, **kwargs)
+        finally:
+            if threaded:
+                # Worker threads are long lived, so they have to clean up their
+                # database connections the same way a request would.
+                close_old_connections()
+
+    return executor.submit(run)
+
 
 def merge_list_dictionaries(dict1, dict2):
     for key, val in dict2.items():
@@ -898,30 +945,44 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
         self.stats_period_start = stats_period_start
         self.stats_period_end = stats_period_end
         self.matching_event_id = matching_event_id
+        self._pending_seen_stats = None
 
-    def _get_seen_stats(self, item_list, user):
-        if not self._collapse("stats"):
-            partial_execute_seen_stats_query = functools.partial(
-                self._execute_seen_stats_query,
-                item_list=item_list,
-                environment_ids=self.environment_ids,
-                start=self.start,
-                end=self.end,
-            )
-            time_range_result = partial_execute_seen_stats_query()
-            filtered_result = (
-                partial_execute_seen_stats_query(conditions=self.conditions)
-                if self.conditions and not self._collapse("filtered")
-                else None
+    def _submit_seen_stats_queries(self, executor, item_list):
+        """
+        Submits the seen stats queries to `executor`, and returns a function that
+        waits for them and returns their combined results.
+        """
+        if self._collapse("stats"):
+            return lambda: None
+
+        submit_seen_stats_query = functools.partial(
+            submit_snuba_query,
+            executor,
+            self._execute_seen_stats_query,
+            item_list=item_list,
+            environment_ids=self.environment_ids,
+            start=self.start,
+            end=self.end,
+        )
+        time_range_future = submit_seen_stats_query()
+        filtered_future = (
+            submit_seen_stats_query(conditions=self.conditions)
+            if self.conditions and not self._collapse("filtered")
+            else None
+        )
+        if not self._collapse("lifetime"):
+            lifetime_future = (
+                submit_seen_stats_query(start=None, end=None)
+                if self.start or self.end
+                else time_range_future
             )
-            if not self._collapse("lifetime"):
-                lifetime_result = (
-                    partial_execute_seen_stats_query(start=None, end=None)
-                    if self.start or self.end
-                    else time_range_result
-                )
-            else:
-                lifetime_result = None
+        else:
+            lifetime_future = None
+
+        def get_result():
+            time_range_result = time_range_future.result()
+            filtered_result = filtered_future.result() if filtered_future else None
+            lifetime_result = lifetime_future.result() if lifetime_future else None
 
             for item in item_list:
                 time_range_result[item].update(
@@ -931,7 +992,16 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
                     }
                 )
             return time_range_result
-        return None
+
+        return get_result
+
+    def _get_seen_stats(self, item_list, user):
+        # `get_attrs` submits the queries before loading the other attributes.
+        if self._pending_seen_stats is not None:
+            get_result, self._pending_seen_stats = self._pending_seen_stats, None
+        else:
+            get_result = self._submit_seen_stats_queries(SynchronousExecutor(), item_list)
+        return get_result()
 
     def query_tsdb(self, group_ids, query_params, conditions=None, environment_ids=None, **kwargs):
         return snuba_tsdb.get_range(
@@ -943,78 +1013,54 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
         )
 
     def get_attrs(self, item_list, user):
-        if not self._collapse("base"):
-            attrs = super().get_attrs(item_list, user)
-        else:
-            seen_stats = self._get_seen_stats(item_list, user)
-            if seen_stats:
-                attrs = {item: seen_stats.get(item, {}) for item in item_list}
-            else:
-                attrs = {item: {} for item in item_list}
+        # All Snuba queries that don't depend on each other are submitted up
+        # front, so that they can run while the Postgres lookups of the base
+        # serializer are made.
+        executor = get_snuba_query_executor()
+        self._pending_seen_stats = self._submit_seen_stats_queries(executor, item_list)
 
+        stats_future = filtered_stats_future = session_counts_future = None
         if self.stats_period and not self._collapse("stats"):
-            partial_get_stats = functools.partial(
-                self.get_stats, item_list=item_list, user=user, environment_ids=self.environment_ids
-            )
-            stats = partial_get_stats()
-            filtered_stats = (
-                partial_get_stats(conditions=self.conditions)
-                if self.conditions and not self._collapse("filtered")
-                else None
+            submit_get_stats = functools.partial(
+                submit_snuba_query,
+                executor,
+                self.get_stats,
+                item_list=item_list,
+                user=user,
+                environment_ids=self.environment_ids,
             )
+            stats_future = submit_get_stats()
+            if self.conditions and not self._collapse("filtered"):
+                filtered_stats_future = submit_get_stats(conditions=self.conditions)
+            if self._expand("sessions"):
+                session_counts_future = submit_snuba_query(
+                    executor, self._get_session_counts, item_list
+                )
+
+        try:
+            if not self._collapse("base"):
+                attrs = super().get_attrs(item_list, user)
+            else:
+                seen_stats = self._get_seen_stats(item_list, user)
+                if seen_stats:
+                    attrs = {item: seen_stats.get(item, {}) for item in item_list}
+                else:
+                    attrs = {item: {} for item in item_list}
+        finally:
+            self._pending_seen_stats = None
+
+        if stats_future is not None:
+            stats = stats_future.result()
+            filtered_stats = filtered_stats_future.result() if filtered_stats_future else None
             for item in item_list:
                 if filtered_stats:
                     attrs[item].update({"filtered_stats": filtered_stats[item.id]})
                 attrs[item].update({"stats": stats[item.id]})
 
-            if self._expand("sessions"):
-                uniq_project_ids = list({item.project_id for item in item_list})
-                cache_keys = {pid: self._build_session_cache_key(pid) for pid in uniq_project_ids}
-                cache_data = cache.get_many(cache_keys.values())
-                missed_items = []
-                for item in item_list:
-                    num_sessions = cache_data.get(cache_keys[item.project_id])
-                    if num_sessions is None:
-                        found = "miss"
-                        missed_items.append(item)
-                    else:
-                        found = "hit"
-                        attrs[item].update(
-                            {
-                                "sessionCount": num_sessions,
-                            }
-                        )
-                    metrics.incr(f"group.get_session_counts.{found}")
-
-                if missed_items:
-                    filters = {"project_id": list({item.project_id for item in missed_items})}
-                    if self.environment_ids:
-                        filters["environment"] = self.environment_ids
-
-                    result_totals = raw_query(
-                        selected_columns=["sessions"],
-                        dataset=Dataset.Sessions,
-                        start=self.start,
-                        end=self.end,
-                        filter_keys=filters,
-                        groupby=["project_id"],
-                        referrer="serializers.GroupSerializerSnuba.session_totals",
-                    )
-                    results = {}
-                    for data in result_totals["data"]:
-                        cache_key = self._build_session_cache_key(data["project_id"])
-                        results[data["project_id"]] = data["sessions"]
-                        cache.set(cache_key, data["sessions"], 3600)
-
-                    for item in missed_items:
-                        if item.project_id in results.keys():
-                            attrs[item].update(
-                                {
-                                    "sessionCount": results[item.project_id],
-                                }
-                            )
-                        else:
-                            attrs[item].update({"sessionCount": None})
+        if session_counts_future is not None:
+            session_counts = session_counts_future.result()
+            for item in item_list:
+                attrs[item].update({"sessionCount": session_counts[item]})
 
         if self._expand("inbox"):
             inbox_stats = get_inbox_details(item_list)
@@ -1073,6 +1119,47 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
 
         return result
 
+    def _get_session_counts(self, item_list):
+        uniq_project_ids = list({item.project_id for item in item_list})
+        cache_keys = {pid: self._build_session_cache_key(pid) for pid in uniq_project_ids}
+        cache_data = cache.get_many(cache_keys.values())
+        session_counts = {}
+        missed_items = []
+        for item in item_list:
+            num_sessions = cache_data.get(cache_keys[item.project_id])
+            if num_sessions is None:
+                found = "miss"
+                missed_items.append(item)
+            else:
+                found = "hit"
+                session_counts[item] = num_sessions
+            metrics.incr(f"group.get_session_counts.{found}")
+
+        if missed_items:
+            filters = {"project_id": list({item.project_id for item in missed_items})}
+            if self.environment_ids:
+                filters["environment"] = self.environment_ids
+
+            result_totals = raw_query(
+                selected_columns=["sessions"],
+                dataset=Dataset.Sessions,
+                start=self.start,
+                end=self.end,
+                filter_keys=filters,
+                groupby=["project_id"],
+                referrer="serializers.GroupSerializerSnuba.session_totals",
+            )
+            results = {}
+            for data in result_totals["data"]:
+                cache_key = self._build_session_cache_key(data["project_id"])
+                results[data["project_id"]] = data["sessions"]
+                cache.set(cache_key, data["sessions"], 3600)
+
+            for item in missed_items:
+                session_counts[item] = results.get(item.project_id)
+
+        return session_counts
+
     def _build_session_cache_key(self, project_id):
         session_count_key = f"w-s:{project_id}"
 
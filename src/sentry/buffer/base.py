@@ -1,11 +1,17 @@
 import logging
+from collections import defaultdict
 
-from django.db.models import F
+from django.db import connections, router
+from django.db.models import F, Model
 
 from sentry.signals import buffer_incr_complete
 from sentry.tasks.process_buffer import process_incr
+from sentry.utils.dates import to_timestamp
 from sentry.utils.services import Service
 
+# Maximum number of rows that are updated by a single ``process_batch`` query.
+BATCH_UPDATE_SIZE = 500
+
 
 class BufferMount(type):
     def __new__(cls, name, bases, attrs):
@@ -82,3 +88,146 @@ class Buffer(Service, metaclass=BufferMount):
             created=created,
             sender=model,
         )
+
+    def process_batch(self, model, updates):
+        """
+        Applies many ``process`` calls for the same ``model`` at once.
+
+        ``updates`` is a list of ``(columns, filters, extra, signal_only)``
+        tuples.  Updates of existing rows that are filtered by primary key
+        only are written with one ``UPDATE ... FROM (VALUES ...)`` query per
+        distinct set of columns, everything else falls back to ``process``.
+        """
+        batches = defaultdict(list)
+        for columns, filters, extra, signal_only in updates:
+            pk = self._get_batch_pk(model, columns, filters, extra, signal_only)
+            if pk is None:
+                Buffer.process(self, model, columns, filters, extra, signal_only)
+                continue
+            batches[tuple(sorted(columns)), tuple(sorted(extra or ()))].append(
+                (pk, columns, filters, extra)
+            )
+
+        for (column_names, extra_names), batch in batches.items():
+            for i in range(0, len(batch), BATCH_UPDATE_SIZE):
+                chunk = batch[i : i + BATCH_UPDATE_SIZE]
+                updated = self._batch_update(model, column_names, extra_names, chunk)
+
+                for pk, columns, filters, extra in chunk:
+                    if pk not in updated:
+                        # The row does not exist (yet), ``process`` creates it.
+                        Buffer.process(self, model, columns, filters, extra)
+                        continue
+
+                    buffer_incr_complete.send_robust(
+                        model=model,
+                        columns=columns,
+                        filters=filters,
+                        extra=extra,
+                        created=False,
+                        sender=model,
+                    )
+
+    def _get_batch_pk(self, model, columns, filters, extra, signal_only):
+        """
+        Returns the primary key of the row an update applies to if it can be
+        part of a batch update, otherwise ``None``.
+        """
+        from sentry.models import Group
+
+        if signal_only or len(filters) != 1:
+            return None
+
+        ((name, value),) = filters.items()
+        if name not in ("pk", model._meta.pk.name):
+            return None
+
+        extra = extra or {}
+        for column, extra_value in extra.items():
+            # Expressions can not be passed as values.  The score of groups is
+            # replaced by ``process`` anyways, and computed in the query itself.
+            if hasattr(extra_value, "resolve_expression") and not (
+                model is Group
+                and column == "score"
+                and "last_seen" in extra
+                and "times_seen" in columns
+            ):
+                return None
+
+        if isinstance(value, Model):
+            value = value.pk
+        return value
+
+    def _batch_update(self, model, column_names, extra_names, batch):
+        """
+        Increments ``column_names`` and sets ``extra_names`` for all rows in
+        ``batch`` with a single query.  Returns the set of primary keys of the
+        rows that exist and were updated.
+        """
+        from sentry.models import Group
+
+        using = router.db_for_write(model)
+        connection = connections[using]
+        quote_name = connection.ops.quote_name
+
+        meta = model._meta
+        table = quote_name(meta.db_table)
+
+        # Mirrors the score computation in ``process`` (see ``ScoreClause``).
+        compute_score = (
+            model is Group and "last_seen" in extra_names and "times_seen" in column_names
+        )
+        extra_names = tuple(name for name in extra_names if not (compute_score and name == "score"))
+
+        fields = [meta.pk]
+        fields.extend(meta.get_field(name) for name in column_names + extra_names)
+        if compute_score:
+            fields.append(meta.get_field("score"))
+        aliases = ["v%d" % i for i in range(len(fields))]
+        types = [field.rel_db_type(connection) for field in fields]
+
+        assignments = []
+        for field, alias in zip(fields[1:], aliases[1:]):
+            column = quote_name(field.column)
+            if field.name in column_names:
+                assignments.append(f"{column} = {table}.{column} + data.{alias}")
+            elif field.name in extra_names:
+                assignments.append(f"{column} = data.{alias}")
+            else:
+                times_seen = quote_name(meta.get_field("times_seen").column)
+                times_seen_alias = aliases[1 + column_names.index("times_seen")]
+                assignments.append(
+                    f"{column} = log({table}.{times_seen} + data.{times_seen_alias}) * 600"
+                    f" + data.{alias}"
+                )
+
+        row_sql = "(%s)" % ", ".join(f"%s::{db_type}" for db_type in types)
+        params = []
+        for pk, columns, filters, extra in batch:
+            values = [pk]
+            values.extend(columns[name] for name in column_names)
+            values.extend(extra[name] for name in extra_names)
+            if compute_score:
+                values.append(int(to_timestamp(extra["last_seen"])))
+            for field, value in zip(fields, values):
+                if isinstance(value, Model):
+                    value = value.pk
+                params.append(field.get_db_prep_save(value, connection))
+
+        pk_column = quote_name(meta.pk.column)
+        sql = """
+            UPDATE {table}
+            SET {assignments}
+            FROM (VALUES {rows}) AS data ({aliases})
+            WHERE {table}.{pk_column} = data.v0
+            RETURNING {table}.{pk_column}""".format(
+            table=table,
+            assignments=", ".join(assignments),
+            rows=", ".join([row_sql] * len(batch)),
+            aliases=", ".join(aliases),
+            pk_column=pk_column,
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return {row[0] for row in cursor.fetchall()}
@@ -1,5 +1,7 @@
+import atexit
 import pickle
 import threading
+from collections import defaultdict
 from datetime import datetime
 from time import time
 
@@ -47,17 +49,62 @@ class PendingBuffer:
         return rv
 
 
+class _PendingIncr:
+    """
+    Increments for a single buffer key that have not been written to Redis
+    yet. ``filters`` and ``extra`` values are already pickled.
+    """
+
+    __slots__ = ("model", "filters", "columns", "extra", "signal_only")
+
+    def __init__(self, model, filters, columns, extra, signal_only):
+        self.model = model
+        self.filters = filters
+        self.columns = columns
+        self.extra = extra
+        self.signal_only = signal_only
+
+    def merge(self, other):
+        for column, amount in other.columns.items():
+            self.columns[column] = self.columns.get(column, 0) + amount
+        # Last write wins, same as in Redis.
+        self.extra.update(other.extra)
+        if other.signal_only is True:
+            self.signal_only = True
+
+
 class RedisBuffer(Buffer):
     key_expire = 60 * 60  # 1 hour
     pending_key = "b:p"
 
-    def __init__(self, pending_partitions=1, incr_batch_size=2, **options):
+    def __init__(
+        self,
+        pending_partitions=1,
+        incr_batch_size=2,
+        incr_coalesce_window=0,
+        incr_coalesce_max_keys=1000,
+        **options,
+    ):
         self.cluster, options = get_cluster_from_options("SENTRY_BUFFER_OPTIONS", options)
         self.pending_partitions = pending_partitions
         self.incr_batch_size = incr_batch_size
         assert self.pending_partitions > 0
         assert self.incr_batch_size > 0
 
+        # When enabled, ``incr`` calls for the same key are aggregated in
+        # process for up to ``incr_coalesce_window`` seconds (or until
+        # ``incr_coalesce_max_keys`` distinct keys are pending) and written
+        # to Redis in one pipeline per host.
+        self.incr_coalesce_window = incr_coalesce_window
+        self.incr_coalesce_max_keys = incr_coalesce_max_keys
+        assert self.incr_coalesce_window >= 0
+        assert self.incr_coalesce_max_keys > 0
+        self._pending_incrs = {}
+        self._pending_incrs_lock = threading.Lock()
+        self._pending_incrs_timer = None
+        if self.incr_coalesce_window:
+            atexit.register(self.flush_pending_incrs)
+
     def validate(self):
         try:
             with self.cluster.all() as client:
@@ -151,41 +198,34 @@ class RedisBuffer(Buffer):
             - Perform a set (last write wins) on extra
             - Perform a set on signal_only (only if True)
         - Add hashmap key to pending flushes
+
+        If coalescing is enabled, the above is deferred and done for all keys
+        that were incremented within the coalescing window at once.
         """
 
         # TODO(dcramer): longer term we'd rather not have to serialize values
         # here (unless it's to JSON)
         key = self._make_key(model, filters)
-        pending_key = self._make_pending_key_from_key(key)
-        # We can't use conn.map() due to wanting to support multiple pending
-        # keys (one per Redis partition)
-        conn = self.cluster.get_local_client_for_key(key)
 
-        pipe = conn.pipeline()
-        pipe.hsetnx(key, "m", f"{model.__module__}.{model.__name__}")
         # TODO(dcramer): once this goes live in production, we can kill the pickle path
         # (this is to ensure a zero downtime deploy where we can transition event processing)
-        pipe.hsetnx(key, "f", pickle.dumps(filters))
-        # pipe.hsetnx(key, 'f', json.dumps(self._dump_values(filters)))
-        for column, amount in columns.items():
-            pipe.hincrby(key, "i+" + column, amount)
-
-        if extra:
+        # Values are pickled right away so that later changes by the caller
+        # do not leak into coalesced increments.
+        incr = _PendingIncr(
+            model,
+            pickle.dumps(filters),
+            dict(columns),
             # Group tries to serialize 'score', so we'd need some kind of processing
             # hook here
             # e.g. "update score if last_seen or times_seen is changed"
-            for column, value in extra.items():
-                # TODO(dcramer): once this goes live in production, we can kill the pickle path
-                # (this is to ensure a zero downtime deploy where we can transition event processing)
-                pipe.hset(key, "e+" + column, pickle.dumps(value))
-                # pipe.hset(key, 'e+' + column, json.dumps(self._dump_value(value)))
-
-        if signal_only is True:
-            pipe.hset(key, "s", "1")
+            {column: pickle.dumps(value) for column, value in (extra or {}).items()},
+            signal_only,
+        )
 
-        pipe.expire(key, self.key_expire)
-        pipe.zadd(pending_key, {key: time()})
-        pipe.execute()
+        if self.incr_coalesce_window:
+            self._coalesce_incr(key, incr)
+        else:
+            self._write_incrs({key: incr})
 
         metrics.incr(
             "buffer.incr",
@@ -193,6 +233,76 @@ class RedisBuffer(Buffer):
             tags={"module": model.__module__, "model": model.__name__},
         )
 
+    def _coalesce_incr(self, key, incr):
+        with self._pending_incrs_lock:
+            pending = self._pending_incrs.get(key)
+            if pending is None:
+                self._pending_incrs[key] = incr
+            else:
+                pending.merge(incr)
+
+            flush = len(self._pending_incrs) >= self.incr_coalesce_max_keys
+            if not flush and self._pending_incrs_timer is None:
+                self._pending_incrs_timer = threading.Timer(
+                    self.incr_coalesce_window, self.flush_pending_incrs
+                )
+                self._pending_incrs_timer.daemon = True
+                self._pending_incrs_timer.start()
+
+        if flush:
+            self.flush_pending_incrs()
+
+    def flush_pending_incrs(self):
+        """
+        Writes all increments that are currently coalesced in this process to
+        Redis.
+        """
+        with self._pending_incrs_lock:
+            pending, self._pending_incrs = self._pending_incrs, {}
+            if self._pending_incrs_timer is not None:
+                self._pending_incrs_timer.cancel()
+                self._pending_incrs_timer = None
+
+        if pending:
+            metrics.timing("buffer.incr.coalesced-keys", len(pending))
+            self._write_incrs(pending)
+
+    def _write_incrs(self, pending):
+        """
+        Writes ``{key: _PendingIncr}`` to Redis with one pipeline per host.
+        """
+        router = self.cluster.get_router()
+        keys_by_host = defaultdict(list)
+        for key in pending:
+            keys_by_host[router.get_host_for_key(key)].append(key)
+
+        for host_id, keys in keys_by_host.items():
+            # We can't use conn.map() due to wanting to support multiple pending
+            # keys (one per Redis partition), which have to live on the same
+            # host as the keys they point to.
+            conn = self.cluster.get_local_client(host_id)
+            pipe = conn.pipeline()
+            now = time()
+            for key in keys:
+                incr = pending[key]
+                model = incr.model
+                pipe.hsetnx(key, "m", f"{model.__module__}.{model.__name__}")
+                pipe.hsetnx(key, "f", incr.filters)
+                # pipe.hsetnx(key, 'f', json.dumps(self._dump_values(filters)))
+                for column, amount in incr.columns.items():
+                    pipe.hincrby(key, "i+" + column, amount)
+
+                for column, value in incr.extra.items():
+                    pipe.hset(key, "e+" + column, value)
+                    # pipe.hset(key, 'e+' + column, json.dumps(self._dump_value(value)))
+
+                if incr.signal_only is True:
+                    pipe.hset(key, "s", "1")
+
+                pipe.expire(key, self.key_expire)
+                pipe.zadd(self._make_pending_key_from_key(key), {key: now})
+            pipe.execute()
+
     def process_pending(self, partition=None):
         if partition is None and self.pending_partitions > 1:
             # If we're using partitions, this one task fans out into
@@ -241,10 +351,67 @@ class RedisBuffer(Buffer):
         assert not (key is not None and batch_keys is not None)
 
         if key is not None:
-            batch_keys = [key]
-
-        for key in batch_keys:
             self._process_single_incr(key)
+        else:
+            self._process_batch_incr(batch_keys)
+
+    def _process_batch_incr(self, keys):
+        """
+        Processes many keys at once: all locks are taken and all values are
+        read in one round trip per host, and the updates are applied with
+        ``process_batch`` so that rows of the same model share their queries.
+        """
+        router = self.cluster.get_router()
+        keys_by_host = defaultdict(list)
+        for key in keys:
+            keys_by_host[router.get_host_for_key(self._make_lock_key(key))].append(key)
+
+        locked_keys = []
+        for host_id, host_keys in keys_by_host.items():
+            pipe = self.cluster.get_local_client(host_id).pipeline()
+            for key in host_keys:
+                # prevent a stampede due to the way we use celery etas + duplicate
+                # tasks
+                pipe.set(self._make_lock_key(key), "1", nx=True, ex=10)
+            for key, acquired in zip(host_keys, pipe.execute()):
+                if acquired:
+                    locked_keys.append(key)
+                else:
+                    metrics.incr("buffer.revoked", tags={"reason": "locked"}, skip_internal=False)
+                    self.logger.debug("buffer.revoked.locked", extra={"redis_key": key})
+
+        try:
+            keys_by_host = defaultdict(list)
+            for key in locked_keys:
+                keys_by_host[router.get_host_for_key(key)].append(key)
+
+            updates_by_model = defaultdict(list)
+            for host_id, host_keys in keys_by_host.items():
+                pipe = self.cluster.get_local_client(host_id).pipeline()
+                for key in host_keys:
+                    pipe.hgetall(key)
+                    pipe.zrem(self._make_pending_key_from_key(key), key)
+                    pipe.delete(key)
+                results = pipe.execute()
+
+                for key, values in zip(host_keys, results[::3]):
+                    if not values:
+                        metrics.incr(
+                            "buffer.revoked", tags={"reason": "empty"}, skip_internal=False
+                        )
+                        self.logger.debug("buffer.revoked.empty", extra={"redis_key": key})
+                        continue
+
+                    model, columns, filters, extra, signal_only = self._load_incr(values)
+                    updates_by_model[model].append((columns, filters, extra, signal_only))
+
+            for model, updates in updates_by_model.items():
+                self.process_batch(model, updates)
+        finally:
+            if locked_keys:
+                with self.cluster.map() as client:
+                    for key in locked_keys:
+                        client.delete(self._make_lock_key(key))
 
     def _process_single_incr(self, key):
         client = self.cluster.get_routing_client()
@@ -266,42 +433,49 @@ class RedisBuffer(Buffer):
             pipe.delete(key)
             values = pipe.execute()[0]
 
-            # XXX(python3): In python2 this isn't as important since redis will
-            # return string tyes (be it, byte strings), but in py3 we get bytes
-            # back, and really we just want to deal with keys as strings.
-            values = {force_text(k): v for k, v in values.items()}
-
             if not values:
                 metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
                 self.logger.debug("buffer.revoked.empty", extra={"redis_key": key})
                 return
 
-            # XXX(py3): Note that ``import_string`` explicitly wants a str in
-            # python2, so we'll decode (for python3) and then translate back to
-            # a byte string (in python2) for import_string.
-            model = import_string(str(values.pop("m").decode("utf-8")))  # NOQA
-
-            if values["f"].startswith(b"{"):
-                filters = self._load_values(json.loads(values.pop("f").decode("utf-8")))
-            else:
-                # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                filters = pickle.loads(values.pop("f"))
-
-            incr_values = {}
-            extra_values = {}
-            signal_only = None
-            for k, v in values.items():
-                if k.startswith("i+"):
-                    incr_values[k[2:]] = int(v)
-                elif k.startswith("e+"):
-                    if v.startswith(b"["):
-                        extra_values[k[2:]] = self._load_value(json.loads(v.decode("utf-8")))
-                    else:
-                        # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                        extra_values[k[2:]] = pickle.loads(v)
-                elif k == "s":
-                    signal_only = bool(int(v))  # Should be 1 if set
-
-            super().process(model, incr_values, filters, extra_values, signal_only)
+            super().process(*self._load_incr(values))
         finally:
             client.delete(lock_key)
+
+    def _load_incr(self, values):
+        """
+        Decodes the hash written by ``incr`` into the arguments of
+        ``Buffer.process``.
+        """
+        # XXX(python3): In python2 this isn't as important since redis will
+        # return string tyes (be it, byte strings), but in py3 we get bytes
+        # back, and really we just want to deal with keys as strings.
+        values = {force_text(k): v for k, v in values.items()}
+
+        # XXX(py3): Note that ``import_string`` explicitly wants a str in
+        # python2, so we'll decode (for python3) and then translate back to
+        # a byte string (in python2) for import_string.
+        model = import_string(str(values.pop("m").decode("utf-8")))  # NOQA
+
+        if values["f"].startswith(b"{"):
+            filters = self._load_values(json.loads(values.pop("f").decode("utf-8")))
+        else:
+            # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+            filters = pickle.loads(values.pop("f"))
+
+        incr_values = {}
+        extra_values = {}
+        signal_only = None
+        for k, v in values.items():
+            if k.startswith("i+"):
+                incr_values[k[2:]] = int(v)
+            elif k.startswith("e+"):
+                if v.startswith(b"["):
+                    extra_values[k[2:]] = self._load_value(json.loads(v.decode("utf-8")))
+                else:
+                    # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+                    extra_values[k[2:]] = pickle.loads(v)
+            elif k == "s":
+                signal_only = bool(int(v))  # Should be 1 if set
+
+        return model, incr_values, filters, extra_values, signal_only
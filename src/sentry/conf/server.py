@@ -1193,6 +1193,11 @@ SENTRY_ALLOW_ORIGIN = None
 # Enable scraping of javascript context for source code
 SENTRY_SCRAPE_JAVASCRIPT_CONTEXT = True
 
+# Maximum total size in bytes of the source maps whose parsed views are kept in
+# an in-process LRU cache, shared by all events processed by that process.
+# The cache is disabled if the size is 0.
+SENTRY_JS_SOURCEMAP_CACHE_SIZE = 0
+
 # Buffer backend
 SENTRY_BUFFER = "sentry.buffer.Buffer"
 SENTRY_BUFFER_OPTIONS = {}
@@ -1250,10 +1255,21 @@ SENTRY_SNUBA = os.environ.get("SNUBA", "http://127.0.0.1:1218")
 SENTRY_SNUBA_TIMEOUT = 30
 SENTRY_SNUBA_CACHE_TTL_SECONDS = 60
 
+# Number of worker threads that run the independent Snuba queries of the issue
+# stream serializer concurrently with each other and with its Postgres lookups.
+# The queries are run one after another in the request thread if this is 0.
+SENTRY_GROUP_SERIALIZER_SNUBA_WORKERS = 0
+
 # Node storage backend
 SENTRY_NODESTORE = "sentry.nodestore.django.DjangoNodeStorage"
 SENTRY_NODESTORE_OPTIONS = {}
 
+# Maximum size in bytes of the in-process LRU cache of node payloads that is
+# shared by all threads of a process, and how many seconds entries are kept
+# there.  The cache is disabled if the size is 0.
+SENTRY_NODESTORE_LOCAL_CACHE_SIZE = 0
+SENTRY_NODESTORE_LOCAL_CACHE_TTL = 60
+
 # Tag storage backend
 SENTRY_TAGSTORE = os.environ.get("SENTRY_TAGSTORE", "sentry.tagstore.snuba.SnubaTagStorage")
 SENTRY_TAGSTORE_OPTIONS = {}
@@ -4,6 +4,7 @@ from enum import Enum
 MAX_BATCH_SIZE = 8 * 1024 * 1024
 EXPORTED_ROWS_LIMIT = 10000000
 SNUBA_MAX_RESULTS = 10000
+MAX_CONCURRENT_TIME_SLICES = 4
 DEFAULT_EXPIRATION = timedelta(weeks=4)
 
 
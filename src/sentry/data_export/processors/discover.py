@@ -1,8 +1,11 @@
 import logging
 
+from sentry import options
+from sentry.api.event_search import AggregateFilter, ParenExpression, parse_search_query
 from sentry.api.utils import get_date_range_from_params
+from sentry.exceptions import InvalidSearchQuery
 from sentry.models import Environment, Group, Project
-from sentry.search.events.fields import get_function_alias
+from sentry.search.events.fields import get_function_alias, is_function
 from sentry.snuba import discover
 from sentry.utils.compat import map
 
@@ -31,6 +34,7 @@ class DiscoverProcessor:
         if self.environments:
             self.params["environment"] = self.environments
         self.header_fields = map(lambda x: get_function_alias(x), discover_query["field"])
+        self.time_slices = self.get_time_slices(discover_query, self.start, self.end)
         self.data_fn = self.get_data_fn(
             fields=discover_query["field"],
             query=discover_query["query"],
@@ -66,13 +70,57 @@ class DiscoverProcessor:
 
         return environment_names
 
+    @staticmethod
+    def get_time_slices(query, start, end):
+        """
+        Splits the time range of the export into disjoint ``(start, end)``
+        slices that can be queried independently and whose results can be
+        concatenated in order.
+
+        Returns ``None`` if slicing is disabled, or if the rows of the query
+        depend on the whole time range (aggregates) or are not sorted by time.
+        """
+        count = options.get("data-export.discover-time-slices")
+        if count <= 1:
+            return None
+
+        if any(is_function(field) for field in query["field"]):
+            return None
+
+        sort = query.get("sort") or []
+        if not isinstance(sort, list):
+            sort = [sort]
+        if sort not in ([], ["timestamp"], ["-timestamp"]):
+            return None
+
+        try:
+            if _has_aggregate_filter(parse_search_query(query["query"])):
+                return None
+        except InvalidSearchQuery:
+            # The export fails with a proper error when the query is run.
+            return None
+
+        step = (end - start) / count
+        time_slices = [(start + step * i, start + step * (i + 1)) for i in range(count)]
+        # Snuba includes the start and excludes the end of a range, make sure
+        # rounding does not drop rows at the very end.
+        time_slices[-1] = (time_slices[-1][0], end)
+
+        if sort == ["-timestamp"]:
+            time_slices.reverse()
+        return time_slices
+
     @staticmethod
     def get_data_fn(fields, query, params, sort):
-        def data_fn(offset, limit):
+        def data_fn(offset, limit, time_slice=None):
+            if time_slice is not None:
+                params_ = dict(params, start=time_slice[0], end=time_slice[1])
+            else:
+                params_ = params
             return discover.query(
                 selected_columns=fields,
                 query=query,
-                params=params,
+                params=params_,
                 offset=offset,
                 orderby=sort,
                 limit=limit,
@@ -102,3 +150,12 @@ class DiscoverProcessor:
                 if "issue.id" in result:
                     result["issue"] = issues.get(result["issue.id"], "unknown")
         return new_result_list
+
+
+def _has_aggregate_filter(terms):
+    for term in terms:
+        if isinstance(term, AggregateFilter):
+            return True
+        if isinstance(term, ParenExpression) and _has_aggregate_filter(term.children):
+            return True
+    return False
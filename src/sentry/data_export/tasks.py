@@ -2,13 +2,14 @@ import codecs
 import csv
 import logging
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from hashlib import sha1
 
 import sentry_sdk
 from celery.exceptions import MaxRetriesExceededError
 from celery.task import current
 from django.core.files.base import ContentFile
-from django.db import IntegrityError, transaction
+from django.db import IntegrityError, connections, transaction
 from django.utils import timezone
 
 from sentry.models import (
@@ -26,6 +27,7 @@ from sentry.utils.sdk import capture_exception
 from .base import (
     EXPORTED_ROWS_LIMIT,
     MAX_BATCH_SIZE,
+    MAX_CONCURRENT_TIME_SLICES,
     SNUBA_MAX_RESULTS,
     ExportError,
     ExportQueryType,
@@ -54,6 +56,9 @@ def assemble_download(
     environment_id=None,
     export_retries=3,
     countdown=60,
+    time_slices=None,
+    time_slice=0,
+    slice_offset=0,
     **kwargs,
 ):
     with sentry_sdk.start_transaction(
@@ -93,6 +98,8 @@ def assemble_download(
             scope.set_extra("export.query", data_export.query_info)
 
         base_bytes_written = bytes_written
+        base_time_slice = time_slice
+        base_slice_offset = slice_offset
 
         try:
             # ensure that the export limit is set and capped at EXPORTED_ROWS_LIMIT
@@ -103,6 +110,18 @@ def assemble_download(
 
             processor = get_processor(data_export, environment_id)
 
+            # Sliced exports are paginated within disjoint time ranges instead
+            # of with an offset over the whole result. The slices are fixed
+            # when the export starts and passed on to the following tasks.
+            if first_page and time_slices is None:
+                time_slices = getattr(processor, "time_slices", None)
+
+            pages = None
+            if time_slices is not None:
+                pages = iter_discover_pages(
+                    processor, time_slices, time_slice, slice_offset, batch_size
+                )
+
             with tempfile.TemporaryFile(mode="w+b") as tf:
                 # XXX(python3):
                 #
@@ -127,10 +146,17 @@ def assemble_download(
                 next_offset = offset + fragment_offset
 
                 while True:
-                    # the number of rows to export in the next batch fragment
-                    fragment_row_count = min(batch_size, max(export_limit - next_offset, 1))
+                    if pages is None:
+                        # the number of rows to export in the next batch fragment
+                        fragment_row_count = min(batch_size, max(export_limit - next_offset, 1))
+
+                        rows = process_rows(processor, data_export, fragment_row_count, next_offset)
+                        has_more = len(rows) >= batch_size
+                    else:
+                        rows, time_slice, slice_offset = next(pages, ([], None, 0))
+                        rows = rows[: max(export_limit - next_offset, 0)]
+                        has_more = time_slice is not None
 
-                    rows = process_rows(processor, data_export, fragment_row_count, next_offset)
                     writer.writerows(rows)
 
                     fragment_offset += len(rows)
@@ -138,12 +164,15 @@ def assemble_download(
 
                     if (
                         not rows
-                        or len(rows) < batch_size
+                        or not has_more
                         # the batch may exceed MAX_BATCH_SIZE but immediately stops
                         or tf.tell() - starting_pos >= MAX_BATCH_SIZE
                     ):
                         break
 
+                if pages is not None:
+                    pages.close()
+
                 tf.seek(0)
                 new_bytes_written = store_export_chunk_as_blob(data_export, bytes_written, tf)
                 bytes_written += new_bytes_written
@@ -158,6 +187,9 @@ def assemble_download(
                         "bytes_written": base_bytes_written,
                         "environment_id": environment_id,
                         "export_retries": export_retries - 1,
+                        "time_slices": time_slices,
+                        "time_slice": base_time_slice,
+                        "slice_offset": base_slice_offset,
                     },
                     countdown=countdown,
                 )
@@ -182,12 +214,7 @@ def assemble_download(
                 )
                 return data_export.email_failure(message="Internal processing failure")
         else:
-            if (
-                rows
-                and len(rows) >= batch_size
-                and new_bytes_written
-                and next_offset < export_limit
-            ):
+            if rows and has_more and new_bytes_written and next_offset < export_limit:
                 assemble_download.delay(
                     data_export_id,
                     export_limit=export_limit,
@@ -196,6 +223,9 @@ def assemble_download(
                     bytes_written=bytes_written,
                     environment_id=environment_id,
                     export_retries=export_retries,
+                    time_slices=time_slices,
+                    time_slice=time_slice,
+                    slice_offset=slice_offset,
                 )
             else:
                 metrics.timing("dataexport.row_count", next_offset, sample_rate=1.0)
@@ -242,6 +272,74 @@ def process_rows(processor, data_export, batch_size, offset):
         raise
 
 
+def iter_discover_pages(processor, time_slices, time_slice, slice_offset, batch_size):
+    """
+    Yields ``(rows, time_slice, slice_offset)`` for the consecutive pages of a
+    time sliced Discover export, starting at ``slice_offset`` rows into
+    ``time_slices[time_slice]``. The yielded ``time_slice`` and
+    ``slice_offset`` point at the next page, ``time_slice`` is ``None`` once
+    all slices are exhausted.
+
+    The first pages of the upcoming slices are always needed, so they are
+    fetched concurrently while the current slice is paginated.
+    """
+    executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_TIME_SLICES)
+    prefetched = {}
+
+    def fetch_page(time_slice, offset):
+        try:
+            return fetch_discover(processor, batch_size, offset, time_slice)
+        finally:
+            # Worker threads end with the export, so close the database
+            # connections they opened.
+            connections.close_all()
+
+    def fetch(index, offset):
+        return executor.submit(fetch_page, time_slices[index], offset)
+
+    try:
+        while time_slice < len(time_slices):
+            for index in range(
+                time_slice + 1, min(time_slice + MAX_CONCURRENT_TIME_SLICES, len(time_slices))
+            ):
+                if index not in prefetched:
+                    prefetched[index] = fetch(index, 0)
+
+            future = prefetched.pop(time_slice, None)
+            if future is None:
+                future = fetch(time_slice, slice_offset)
+
+            try:
+                raw_data_unicode = future.result()
+            except ExportError as error:
+                error_str = str(error)
+                metrics.incr("dataexport.error", tags={"error": error_str}, sample_rate=1.0)
+                logger.info(f"dataexport.error: {error_str}")
+                capture_exception(error)
+                raise
+
+            rows = processor.handle_fields(raw_data_unicode)
+            if len(rows) < batch_size:
+                time_slice += 1
+                slice_offset = 0
+            else:
+                slice_offset += len(rows)
+
+            if rows:
+                yield rows, time_slice if time_slice < len(time_slices) else None, slice_offset
+    finally:
+        # Do not leave queries running once the export stopped, e.g. because
+        # of an error.
+        for future in prefetched.values():
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+@handle_snuba_errors(logger)
+def fetch_discover(processor, limit, offset, time_slice):
+    return processor.data_fn(limit=limit, offset=offset, time_slice=time_slice)["data"]
+
+
 @handle_snuba_errors(logger)
 def process_issues_by_tag(processor, limit, offset):
     return processor.get_serialized_data(limit=limit, offset=offset)
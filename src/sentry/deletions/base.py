@@ -137,12 +137,24 @@ class ModelDeletionTask(BaseDeletionTask):
     DEFAULT_QUERY_LIMIT = None
     manager_name = "objects"
 
-    def __init__(self, manager, model, query, query_limit=None, order_by=None, **kwargs):
+    def __init__(
+        self,
+        manager,
+        model,
+        query,
+        query_limit=None,
+        order_by=None,
+        num_shards=None,
+        shard_id=None,
+        **kwargs,
+    ):
         super().__init__(manager, **kwargs)
         self.model = model
         self.query = query
         self.query_limit = query_limit or self.DEFAULT_QUERY_LIMIT or self.chunk_size
         self.order_by = order_by
+        self.num_shards = num_shards
+        self.shard_id = shard_id
 
     def __repr__(self):
         return "<{}: model={} query={} order_by={} transaction_id={} actor_id={}>".format(
@@ -154,6 +166,18 @@ class ModelDeletionTask(BaseDeletionTask):
             self.actor_id,
         )
 
+    def get_queryset(self, num_shards=None, shard_id=None):
+        queryset = getattr(self.model, self.manager_name).filter(**self.query)
+        if self.order_by:
+            queryset = queryset.order_by(self.order_by)
+
+        if num_shards:
+            assert num_shards > 1
+            assert shard_id < num_shards
+            queryset = queryset.extra(where=[f"id %% {num_shards} = {shard_id}"])
+
+        return queryset
+
     def extend_relations(self, child_relations, obj):
         from sentry.deletions import default_manager
 
@@ -170,20 +194,17 @@ class ModelDeletionTask(BaseDeletionTask):
         """
         Deletes a chunk of this instance's data. Return ``True`` if there is
         more work, or ``False`` if the entity has been removed.
+
+        Only rows whose id modulo ``num_shards`` equals ``shard_id`` are
+        deleted if ``num_shards`` is given, either here or to the constructor.
         """
+        if num_shards is None:
+            num_shards, shard_id = self.num_shards, self.shard_id
+
         query_limit = self.query_limit
         remaining = self.chunk_size
         while remaining > 0:
-            queryset = getattr(self.model, self.manager_name).filter(**self.query)
-            if self.order_by:
-                queryset = queryset.order_by(self.order_by)
-
-            if num_shards:
-                assert num_shards > 1
-                assert shard_id < num_shards
-                queryset = queryset.extra(where=[f"id %% {num_shards} = {shard_id}"])
-
-            queryset = list(queryset[:query_limit])
+            queryset = list(self.get_queryset(num_shards, shard_id)[:query_limit])
             if not queryset:
                 return False
 
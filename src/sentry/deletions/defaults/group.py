@@ -1,7 +1,12 @@
 import os
 
+from django.db import transaction
+
 from sentry import eventstore, models, nodestore
 from sentry.eventstore.models import Event
+from sentry.models.eventattachment import get_crashreport_key
+from sentry.utils import metrics
+from sentry.utils.cache import cache
 
 from ..base import BaseDeletionTask, BaseRelation, ModelDeletionTask, ModelRelation
 
@@ -36,6 +41,38 @@ _GROUP_RELATED_MODELS = DIRECT_GROUP_RELATED_MODELS + (
 )
 
 
+class EventAttachmentDeletionTask(ModelDeletionTask):
+    """
+    Deletes event attachments and their files in bulk, instead of one by one
+    through `EventAttachment.delete`.
+    """
+
+    DEFAULT_CHUNK_SIZE = 1000
+
+    def delete_instance_bulk(self, instance_list):
+        from sentry.models import File, FileBlobIndex
+        from sentry.tasks.files import delete_unreferenced_blobs
+
+        file_ids = [instance.file_id for instance in instance_list]
+        blob_ids = list(
+            FileBlobIndex.objects.filter(file_id__in=file_ids)
+            .values_list("blob_id", flat=True)
+            .distinct()
+        )
+
+        models.EventAttachment.objects.filter(id__in=[i.id for i in instance_list]).delete()
+        File.objects.filter(id__in=file_ids).delete()
+        cache.delete_many({get_crashreport_key(i.group_id) for i in instance_list})
+
+        # Wait to delete blobs, like `File.delete` does.
+        if blob_ids:
+            transaction.on_commit(
+                lambda: delete_unreferenced_blobs.apply_async(
+                    kwargs={"blob_ids": blob_ids}, countdown=60 * 5
+                )
+            )
+
+
 class EventDataDeletionTask(BaseDeletionTask):
     """
     Deletes nodestore data, EventAttachment and UserReports for group
@@ -84,13 +121,19 @@ class EventDataDeletionTask(BaseDeletionTask):
         # group ID, therefore there may be dangling ones after "regular" model
         # deletion.
         event_ids = [event.event_id for event in events]
-        models.EventAttachment.objects.filter(
-            event_id__in=event_ids, project_id=self.project_id
-        ).delete()
+        self.delete_children(
+            [
+                ModelRelation(
+                    models.EventAttachment,
+                    {"event_id__in": event_ids, "project_id": self.project_id},
+                )
+            ]
+        )
         models.UserReport.objects.filter(
             event_id__in=event_ids, project_id=self.project_id
         ).delete()
 
+        metrics.incr("deletions.group.events", amount=len(events), skip_internal=True)
         return True
 
 
@@ -1,7 +1,64 @@
-from ..base import BulkModelDeletionTask, ModelDeletionTask, ModelRelation
+from sentry import options
+from sentry.constants import ObjectStatus
+
+from ..base import BaseRelation, BulkModelDeletionTask, ModelDeletionTask, ModelRelation
+
+
+class _GroupShardsRelation(BaseRelation):
+    """
+    Marks the point in a project's child relations from which on the groups
+    deleted by the `delete_project_groups` tasks have to be gone.
+    """
+
+    def __init__(self, project_id, num_shards):
+        super().__init__({"project_id": project_id, "num_shards": num_shards}, None)
 
 
 class ProjectDeletionTask(ModelDeletionTask):
+    def mark_deletion_in_progress(self, instance_list):
+        from sentry.tasks.deletion import delete_project_groups
+
+        # Groups are the bulk of a project's data. Once per project, all but
+        # the first shard of them are handed to their own tasks, while this
+        # task deletes the first shard and then whatever is left over.
+        num_shards = options.get("deletions.project.group-shards")
+        if num_shards > 1:
+            for instance in instance_list:
+                if instance.status == ObjectStatus.DELETION_IN_PROGRESS:
+                    continue
+                for shard_id in range(1, num_shards):
+                    delete_project_groups.apply_async(
+                        kwargs={
+                            "project_id": instance.id,
+                            "num_shards": num_shards,
+                            "shard_id": shard_id,
+                            "transaction_id": self.transaction_id,
+                        }
+                    )
+
+        super().mark_deletion_in_progress(instance_list)
+
+    def delete_children(self, relations):
+        from sentry.models import Group
+
+        for relation in relations:
+            if not isinstance(relation, _GroupShardsRelation):
+                super().delete_children([relation])
+                continue
+
+            # Sweeping up the remaining groups while the shard tasks are still
+            # deleting theirs would delete the same groups twice, so this task
+            # is rescheduled until they are done.
+            num_shards = relation.params["num_shards"]
+            if (
+                Group.objects.filter(project_id=relation.params["project_id"])
+                .extra(where=[f"id %% {num_shards} != 0"])
+                .exists()
+            ):
+                return True
+
+        return False
+
     def get_child_relations(self, instance):
         from sentry import models
         from sentry.discover.models import DiscoverSavedQueryProject, KeyTransaction
@@ -62,6 +119,21 @@ class ProjectDeletionTask(ModelDeletionTask):
             ]
         )
 
+        num_shards = options.get("deletions.project.group-shards")
+        if num_shards > 1:
+            relations.append(
+                BaseRelation(
+                    {
+                        "model": models.Group,
+                        "query": {"project_id": instance.id},
+                        "num_shards": num_shards,
+                        "shard_id": 0,
+                    },
+                    None,
+                )
+            )
+            relations.append(_GroupShardsRelation(instance.id, num_shards))
+
         # in bulk
         # Release needs to handle deletes after Group is cleaned up as the foreign
         # key is protected
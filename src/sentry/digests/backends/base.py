@@ -53,7 +53,16 @@ class Backend(Service):
     be transitioned to "waiting" instead.)
     """
 
-    __all__ = ("add", "delete", "digest", "enabled", "maintenance", "schedule", "validate")
+    __all__ = (
+        "add",
+        "delete",
+        "digest",
+        "digest_many",
+        "enabled",
+        "maintenance",
+        "schedule",
+        "validate",
+    )
 
     def __init__(self, **options):
         # The ``minimum_delay`` option defines the default minimum amount of
@@ -156,6 +165,21 @@ class Backend(Service):
         """
         raise NotImplementedError
 
+    def digest_many(self, keys, minimum_delays=None):
+        """
+        Extract records from several timelines for processing.
+
+        This behaves like ``digest`` for each timeline, but the target of the
+        ``as`` clause is a mapping of timeline keys to their records.
+        Timelines that cannot be digested right now (e.g. because they are not
+        in the "ready" state) are left out of the mapping. The minimum delay
+        of each timeline can be given in the ``minimum_delays`` mapping.
+
+        Timelines that are removed from the mapping within the block are not
+        closed, as if their processing had raised an exception.
+        """
+        raise NotImplementedError
+
     def schedule(self, deadline):
         """
         Identify timelines that are ready for processing.
@@ -1,12 +1,14 @@
 import logging
 import time
-from contextlib import contextmanager
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
 
 from redis.client import ResponseError
 
 from sentry.digests import Record, ScheduleEntry
 from sentry.digests.backends.base import Backend, InvalidState
 from sentry.utils.compat import map
+from sentry.utils.locking import UnableToAcquireLock
 from sentry.utils.locking.backends.redis import RedisLockBackend
 from sentry.utils.locking.manager import LockManager
 from sentry.utils.redis import check_cluster_versions, get_cluster_from_options, load_script
@@ -202,16 +204,7 @@ class RedisBackend(Backend):
                 else:
                     raise
 
-            records = map(
-                lambda key__value__timestamp: Record(
-                    key__value__timestamp[0].decode("utf-8"),
-                    self.codec.decode(key__value__timestamp[1])
-                    if key__value__timestamp[1] is not None
-                    else None,
-                    float(key__value__timestamp[2]),
-                ),
-                response,
-            )
+            records = self.__decode_records(response)
 
             # If the record value is `None`, this means the record data was
             # missing (it was presumably evicted by Redis) so we don't need to
@@ -225,6 +218,106 @@ class RedisBackend(Backend):
                 + [record.key for record in records],
             )
 
+    def __decode_records(self, response):
+        return map(
+            lambda key__value__timestamp: Record(
+                key__value__timestamp[0].decode("utf-8"),
+                self.codec.decode(key__value__timestamp[1])
+                if key__value__timestamp[1] is not None
+                else None,
+                float(key__value__timestamp[2]),
+            ),
+            response,
+        )
+
+    @contextmanager
+    def digest_many(self, keys, minimum_delays=None, timestamp=None):
+        """
+        Like ``digest``, but the timelines on each Redis host are opened and
+        closed with one pipelined request. Timelines that are not in the ready
+        state or whose lock is held by someone else are left out, and
+        timelines that the caller removes from the result are not closed.
+        """
+        if minimum_delays is None:
+            minimum_delays = {}
+
+        if timestamp is None:
+            timestamp = time.time()
+
+        # The locks are held while the digests of all timelines are built, so
+        # they have to last as long as building a digest for each of them.
+        lock_duration = 30 * len(keys)
+
+        router = self.cluster.get_router()
+        with ExitStack() as stack:
+            keys_by_host = defaultdict(list)
+            for key in keys:
+                try:
+                    stack.enter_context(
+                        self._get_timeline_lock(key, duration=lock_duration).acquire()
+                    )
+                except UnableToAcquireLock as error:
+                    logger.info("Skipped digest of %r: %s", key, error)
+                    continue
+                keys_by_host[router.get_host_for_key(f"{self.namespace}:t:{key}")].append(key)
+
+            records_by_key = {}
+            for host, host_keys in keys_by_host.items():
+                pipeline = self.cluster.get_local_client(host).pipeline(transaction=False)
+                for key in host_keys:
+                    script(
+                        pipeline,
+                        [key],
+                        [
+                            "DIGEST_OPEN",
+                            self.namespace,
+                            self.ttl,
+                            timestamp,
+                            key,
+                            self.capacity if self.capacity else -1,
+                        ],
+                    )
+
+                for key, response in zip(host_keys, pipeline.execute(raise_on_error=False)):
+                    if isinstance(response, ResponseError):
+                        if "err(invalid_state):" in str(response):
+                            logger.info("Skipped digest of %r: %s", key, response)
+                            continue
+                        raise response
+                    records_by_key[key] = self.__decode_records(response)
+
+            # If the record value is `None`, this means the record data was
+            # missing (it was presumably evicted by Redis) so we don't need to
+            # return it here.
+            result = {
+                key: [record for record in records if record.value is not None]
+                for key, records in records_by_key.items()
+            }
+            yield result
+
+            for host, host_keys in keys_by_host.items():
+                pipeline = self.cluster.get_local_client(host).pipeline(transaction=False)
+                for key in host_keys:
+                    if key not in result:
+                        continue
+                    minimum_delay = minimum_delays.get(key)
+                    if minimum_delay is None:
+                        minimum_delay = self.minimum_delay
+                    script(
+                        pipeline,
+                        [key],
+                        [
+                            "DIGEST_CLOSE",
+                            self.namespace,
+                            self.ttl,
+                            timestamp,
+                            key,
+                            minimum_delay,
+                        ]
+                        + [record.key for record in records_by_key[key]],
+                    )
+                pipeline.execute()
+
     def delete(self, key, timestamp=None):
         if timestamp is None:
             timestamp = time.time()
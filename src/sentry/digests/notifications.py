@@ -1,3 +1,4 @@
+import copy
 import functools
 import itertools
 import logging
@@ -14,11 +15,11 @@ logger = logging.getLogger("sentry.digests")
 Notification = namedtuple("Notification", "event rules")
 
 
-def split_key(key):
+def _parse_key(key):
     from sentry.mail.adapter import ActionTargetType
 
     key_parts = key.split(":", 4)
-    project_id = key_parts[2]
+    project_id = int(key_parts[2])
     # XXX: We transitioned to new style keys (len == 5) a while ago on sentry.io. But
     # on-prem users might transition at any time, so we need to keep this transition
     # code around for a while, maybe indefinitely.
@@ -28,9 +29,28 @@ def split_key(key):
     else:
         target_type = ActionTargetType.ISSUE_OWNERS
         target_identifier = None
+    return project_id, target_type, target_identifier
+
+
+def split_key(key):
+    project_id, target_type, target_identifier = _parse_key(key)
     return Project.objects.get(pk=project_id), target_type, target_identifier
 
 
+def split_keys(keys):
+    """
+    Like `split_key` for many keys, loading their projects with one query.
+    Keys of projects that don't exist are left out.
+    """
+    parsed = {key: _parse_key(key) for key in keys}
+    projects = Project.objects.in_bulk({project_id for project_id, _, _ in parsed.values()})
+    return {
+        key: (projects[project_id], target_type, target_identifier)
+        for key, (project_id, target_type, target_identifier) in parsed.items()
+        if project_id in projects
+    }
+
+
 def unsplit_key(project, target_type, target_identifier):
     return "mail:p:{}:{}:{}".format(
         project.id, target_type.value, target_identifier if target_identifier is not None else ""
@@ -48,7 +68,15 @@ def event_to_record(event, rules):
     )
 
 
-def fetch_state(project, records):
+def _get_group_ids(records):
+    return {record.value.event.group_id for record in records}
+
+
+def _get_rule_ids(records):
+    return set(itertools.chain.from_iterable(record.value.rules for record in records))
+
+
+def _fetch_state(project, records, groups, rules):
     # This reads a little strange, but remember that records are returned in
     # reverse chronological order, and we query the database in chronological
     # order.
@@ -56,13 +84,10 @@ def fetch_state(project, records):
     start = records[-1].datetime
     end = records[0].datetime
 
-    groups = Group.objects.in_bulk(record.value.event.group_id for record in records)
     return {
         "project": project,
         "groups": groups,
-        "rules": Rule.objects.in_bulk(
-            itertools.chain.from_iterable(record.value.rules for record in records)
-        ),
+        "rules": rules,
         "event_counts": tsdb.get_sums(tsdb.models.group, list(groups.keys()), start, end),
         "user_counts": tsdb.get_distinct_counts_totals(
             tsdb.models.users_affected_by_group, list(groups.keys()), start, end
@@ -70,6 +95,40 @@ def fetch_state(project, records):
     }
 
 
+def fetch_state(project, records):
+    return _fetch_state(
+        project,
+        records,
+        Group.objects.in_bulk(_get_group_ids(records)),
+        Rule.objects.in_bulk(_get_rule_ids(records)),
+    )
+
+
+def fetch_state_many(items):
+    """
+    Like `fetch_state` for a sequence of `(project, records)` pairs, loading
+    the groups and rules of all of them with one query each. The records of
+    every pair must not be empty.
+    """
+    groups = Group.objects.in_bulk(
+        set(itertools.chain.from_iterable(_get_group_ids(records) for _, records in items))
+    )
+    rules = Rule.objects.in_bulk(
+        set(itertools.chain.from_iterable(_get_rule_ids(records) for _, records in items))
+    )
+
+    # Every digest gets its own copies, since building a digest annotates them.
+    return [
+        _fetch_state(
+            project,
+            records,
+            {id: copy.copy(groups[id]) for id in _get_group_ids(records) if id in groups},
+            {id: copy.copy(rules[id]) for id in _get_rule_ids(records) if id in rules},
+        )
+        for project, records in items
+    ]
+
+
 def attach_state(project, groups, rules, event_counts, user_counts):
     for id, group in groups.items():
         assert group.project_id == project.id, "Group must belong to Project"
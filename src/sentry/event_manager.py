@@ -1,8 +1,11 @@
 import copy
+import functools
 import ipaddress
 import logging
+import math
 import random
 import time
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta
 from io import BytesIO
 
@@ -23,6 +26,7 @@ from sentry.constants import (
     DataCategory,
 )
 from sentry.culprit import generate_culprit
+from sentry.db.models.fields.node import NodeData
 from sentry.eventstore.processing import event_processing_store
 from sentry.grouping.api import (
     BackgroundGroupingConfigLoader,
@@ -318,160 +322,108 @@ class EventManager:
 
             return jobs[0]["event"]
 
-        with metrics.timer("event_manager.save.organization.get_from_cache"):
-            project._organization_cache = Organization.objects.get_from_cache(
-                id=project.organization_id
-            )
-
-        job = {"data": self._data, "project_id": project_id, "raw": raw, "start_time": start_time}
-        jobs = [job]
-
-        is_reprocessed = is_reprocessed_event(job["data"])
-
-        with sentry_sdk.start_span(op="event_manager.save.pull_out_data"):
-            _pull_out_data(jobs, projects)
-
-        with sentry_sdk.start_span(op="event_manager.save.get_or_create_release_many"):
-            _get_or_create_release_many(jobs, projects)
-
-        with sentry_sdk.start_span(op="event_manager.save.get_event_user_many"):
-            _get_event_user_many(jobs, projects)
-
-        job["project_key"] = None
-        if job["key_id"] is not None:
-            with metrics.timer("event_manager.load_project_key"):
-                try:
-                    job["project_key"] = ProjectKey.objects.get_from_cache(id=job["key_id"])
-                except ProjectKey.DoesNotExist:
-                    pass
-
-        _derive_plugin_tags_many(jobs, projects)
-        _derive_interface_tags_many(jobs)
-
-        do_background_grouping_before = options.get("store.background-grouping-before")
-        if do_background_grouping_before:
-            _run_background_grouping(project, job)
-
-        secondary_flat_hashes = []
-
-        try:
-            if (project.get_option("sentry:secondary_grouping_expiry") or 0) >= time.time():
-                with metrics.timer("event_manager.secondary_grouping"):
-                    secondary_event = copy.deepcopy(job["event"])
-                    loader = SecondaryGroupingConfigLoader()
-                    secondary_grouping_config = loader.get_config_dict(project)
-                    _calculate_event_grouping(project, secondary_event, secondary_grouping_config)
-                    secondary_flat_hashes.extend(secondary_event.data["hashes"])
-        except Exception:
-            sentry_sdk.capture_exception()
-
-        with metrics.timer("event_manager.load_grouping_config"):
-            # At this point we want to normalize the in_app values in case the
-            # clients did not set this appropriately so far.
-            grouping_config = get_grouping_config_dict_for_event_data(
-                job["event"].data.data, project
-            )
+        job = {
+            "data": self._data,
+            "project_id": project_id,
+            "raw": raw,
+            "start_time": start_time,
+            "cache_key": cache_key,
+        }
+        save_error_events([job], projects)
 
-        with sentry_sdk.start_span(op="event_manager.save.calculate_event_grouping"), metrics.timer(
-            "event_manager.calculate_event_grouping"
-        ):
-            _calculate_event_grouping(project, job["event"], grouping_config)
+        if job.get("hash_discarded") is not None:
+            raise job["hash_discarded"]
 
-        flat_hashes = job["event"].data["hashes"] + secondary_flat_hashes
-        hierarchical_hashes = job["event"].data.get("hierarchical_hashes") or []
+        self._data = job["event"].data.data
 
-        if not do_background_grouping_before:
-            _run_background_grouping(project, job)
+        return job["event"]
 
-        _materialize_metadata_many(jobs)
 
-        # The group gets the same metadata as the event when it's flushed but
-        # additionally the `last_received` key is set.  This key is used by
-        # _save_aggregate.
-        group_metadata = dict(job["materialized_metadata"])
-        group_metadata["last_received"] = job["received_timestamp"]
-        kwargs = {
-            "platform": job["platform"],
-            "message": job["event"].search_message,
-            "culprit": job["culprit"],
-            "logger": job["logger_name"],
-            "level": LOG_LEVELS_MAP.get(job["level"]),
-            "last_seen": job["event"].datetime,
-            "first_seen": job["event"].datetime,
-            "active_at": job["event"].datetime,
-            "data": group_metadata,
+@metrics.wraps("event_manager.save_error_events")
+def save_error_events(jobs, projects, failed_jobs=None):
+    """
+    Saves a batch of normalized error events. This is the batched counterpart
+    of ``EventManager.save``: release, environment, user and group release
+    lookups are deduplicated across the batch, and the nodestore and TSDB
+    writes are issued once for all events instead of once per event.
+
+    Every job is a dictionary containing ``data``, ``project_id``, ``raw``,
+    ``start_time`` and ``cache_key``. ``projects`` maps project ids to the
+    projects of all jobs.
+
+    Events that are discarded because of their hash are refunded and get the
+    ``HashDiscarded`` exception stored at ``job["hash_discarded"]``. They are
+    not part of the returned list of jobs.
+
+    Nothing is written before the events are assigned to groups, which sets
+    ``job["group"]``. If a list is passed as ``failed_jobs``, jobs that cannot
+    be assigned to a group are added to it and left out instead of failing the
+    whole batch, so that they can be saved again.
+    """
+    with metrics.timer("event_manager.save_error_events.fetch_organizations"):
+        organization_ids = {project.organization_id for project in projects.values()}
+        organizations = {
+            o.id: o for o in Organization.objects.get_many_from_cache(organization_ids)
         }
 
-        if job["release"]:
-            kwargs["first_release"] = job["release"]
+        for project in projects.values():
+            try:
+                project._organization_cache = organizations[project.organization_id]
+            except KeyError:
+                continue
 
-        # Load attachments first, but persist them at the very last after
-        # posting to eventstream to make sure all counters and eventstream are
-        # incremented for sure. Also wait for grouping to remove attachments
-        # based on the group counter.
-        with metrics.timer("event_manager.get_attachments"):
-            with sentry_sdk.start_span(op="event_manager.save.get_attachments"):
-                attachments = get_attachments(cache_key, job)
+    for job in jobs:
+        job["is_reprocessed"] = is_reprocessed_event(job["data"])
 
-        try:
-            with sentry_sdk.start_span(op="event_manager.save.save_aggregate_fn"):
-                job["group"], job["is_new"], job["is_regression"] = _save_aggregate(
-                    event=job["event"],
-                    flat_hashes=flat_hashes,
-                    hierarchical_hashes=hierarchical_hashes,
-                    release=job["release"],
-                    **kwargs,
-                )
-        except HashDiscarded:
-            discard_event(job, attachments)
-            raise
+    with sentry_sdk.start_span(op="event_manager.save.pull_out_data"):
+        _pull_out_data(jobs, projects)
 
-        job["event"].group = job["group"]
+    with sentry_sdk.start_span(op="event_manager.save.get_or_create_release_many"):
+        _get_or_create_release_many(jobs, projects)
 
-        # store a reference to the group id to guarantee validation of isolation
-        # XXX(markus): No clue what this does
-        job["event"].data.bind_ref(job["event"])
+    with sentry_sdk.start_span(op="event_manager.save.get_event_user_many"):
+        _get_event_user_many(jobs, projects)
 
-        _get_or_create_environment_many(jobs, projects)
+    _get_project_key_many(jobs)
+    _derive_plugin_tags_many(jobs, projects)
+    _derive_interface_tags_many(jobs)
 
-        if job["group"]:
-            group_environment, job["is_new_group_environment"] = GroupEnvironment.get_or_create(
-                group_id=job["group"].id,
-                environment_id=job["environment"].id,
-                defaults={"first_release": job["release"] or None},
-            )
-        else:
-            job["is_new_group_environment"] = False
+    with sentry_sdk.start_span(op="event_manager.save.calculate_event_grouping"):
+        _calculate_event_grouping_many(jobs, projects)
 
-        _get_or_create_release_associated_models(jobs, projects)
+    _materialize_metadata_many(jobs)
 
-        if job["release"] and job["group"]:
-            job["grouprelease"] = GroupRelease.get_or_create(
-                group=job["group"],
-                release=job["release"],
-                environment=job["environment"],
-                datetime=job["event"].datetime,
-            )
+    jobs = _save_aggregate_many(jobs, failed_jobs)
 
-        _tsdb_record_all_metrics(jobs)
+    _get_or_create_environment_many(jobs, projects)
+    _get_or_create_group_environment_many(jobs)
+    _get_or_create_release_associated_models(jobs, projects)
+    _get_or_create_group_release_many(jobs)
+    _tsdb_record_all_metrics(jobs)
 
+    for job in jobs:
         if job["group"]:
-            UserReport.objects.filter(project_id=project.id, event_id=job["event"].event_id).update(
-                group_id=job["group"].id, environment_id=job["environment"].id
-            )
+            UserReport.objects.filter(
+                project_id=job["project_id"], event_id=job["event"].event_id
+            ).update(group_id=job["group"].id, environment_id=job["environment"].id)
 
-        with metrics.timer("event_manager.filter_attachments_for_group"):
-            attachments = filter_attachments_for_group(attachments, job)
+    with metrics.timer("event_manager.filter_attachments_for_group"):
+        for job in jobs:
+            job["attachments"] = filter_attachments_for_group(job["attachments"], job)
 
-        # XXX: DO NOT MUTATE THE EVENT PAYLOAD AFTER THIS POINT
-        _materialize_event_metrics(jobs)
+    # XXX: DO NOT MUTATE THE EVENT PAYLOAD AFTER THIS POINT
+    _materialize_event_metrics(jobs)
 
-        for attachment in attachments:
+    for job in jobs:
+        for attachment in job["attachments"]:
             key = f"bytes.stored.{attachment.type}"
             old_bytes = job["event_metrics"].get(key) or 0
             job["event_metrics"][key] = old_bytes + attachment.size
 
-        _nodestore_save_many(jobs)
+    _nodestore_save_many(jobs)
+
+    for job in jobs:
+        project = projects[job["project_id"]]
         save_unprocessed_event(project, job["event"].event_id)
 
         if job["release"]:
@@ -491,28 +443,30 @@ class EventManager:
                         "environment_id": job["environment"].id,
                     },
                 )
-        if not raw:
+        if not job["raw"]:
             if not project.first_event:
                 project.update(first_event=job["event"].datetime)
                 first_event_received.send_robust(
                     project=project, event=job["event"], sender=Project
                 )
 
-        if is_reprocessed:
+        if job["is_reprocessed"]:
             safe_execute(delete_old_primary_hash, job["event"])
 
-        _eventstream_insert_many(jobs)
+    _eventstream_insert_many(jobs)
 
-        # Do this last to ensure signals get emitted even if connection to the
-        # file store breaks temporarily.
-        #
-        # We do not need this for reprocessed events as for those we update the
-        # group_id on existing models in post_process_group, which already does
-        # this because of indiv. attachments.
-        if not is_reprocessed:
-            with metrics.timer("event_manager.save_attachments"):
-                save_attachments(cache_key, attachments, job)
+    # Do this last to ensure signals get emitted even if connection to the
+    # file store breaks temporarily.
+    #
+    # We do not need this for reprocessed events as for those we update the
+    # group_id on existing models in post_process_group, which already does
+    # this because of indiv. attachments.
+    with metrics.timer("event_manager.save_attachments"):
+        for job in jobs:
+            if not job["is_reprocessed"]:
+                save_attachments(job["cache_key"], job["attachments"], job)
 
+    for job in jobs:
         metric_tags = {"from_relay": "_relay_processed" in job["data"]}
 
         metrics.timing(
@@ -527,11 +481,9 @@ class EventManager:
             tags=metric_tags,
         )
 
-        _track_outcome_accepted_many(jobs)
-
-        self._data = job["event"].data.data
+    _track_outcome_accepted_many(jobs)
 
-        return job["event"]
+    return jobs
 
 
 @metrics.wraps("event_manager.background_grouping")
@@ -649,16 +601,39 @@ def _get_or_create_release_many(jobs, projects):
 
 @metrics.wraps("save_event.get_event_user_many")
 def _get_event_user_many(jobs, projects):
+    # Events of a batch frequently belong to the same user, so users are
+    # deduplicated by their hash and only looked up once.
+    event_users = {}
+
     for job in jobs:
         data = job["data"]
         user = _get_event_user(projects[job["project_id"]], data)
 
         if user:
+            user, _ = event_users.setdefault(
+                (job["project_id"], user.hash), (user, data.get("user"))
+            )
             pop_tag(data, "user")
             set_tag(data, "sentry:user", user.tag_value)
 
         job["user"] = user
 
+    if event_users:
+        _save_event_users(event_users)
+
+
+@metrics.wraps("save_event.get_project_key_many")
+def _get_project_key_many(jobs):
+    key_ids = {job["key_id"] for job in jobs if job["key_id"] is not None}
+
+    with metrics.timer("event_manager.load_project_key"):
+        project_keys = (
+            {k.id: k for k in ProjectKey.objects.get_many_from_cache(key_ids)} if key_ids else {}
+        )
+
+    for job in jobs:
+        job["project_key"] = project_keys.get(job["key_id"])
+
 
 @metrics.wraps("save_event.derive_plugin_tags_many")
 def _derive_plugin_tags_many(jobs, projects):
@@ -710,11 +685,154 @@ def _materialize_metadata_many(jobs):
         data["culprit"] = job["culprit"]
 
 
+@metrics.wraps("save_event.calculate_event_grouping_many")
+def _calculate_event_grouping_many(jobs, projects):
+    do_background_grouping_before = options.get("store.background-grouping-before")
+
+    for job in jobs:
+        project = projects[job["project_id"]]
+
+        if do_background_grouping_before:
+            _run_background_grouping(project, job)
+
+        secondary_flat_hashes = []
+
+        try:
+            if (project.get_option("sentry:secondary_grouping_expiry") or 0) >= time.time():
+                with metrics.timer("event_manager.secondary_grouping"):
+                    secondary_event = copy.deepcopy(job["event"])
+                    loader = SecondaryGroupingConfigLoader()
+                    secondary_grouping_config = loader.get_config_dict(project)
+                    _calculate_event_grouping(project, secondary_event, secondary_grouping_config)
+                    secondary_flat_hashes.extend(secondary_event.data["hashes"])
+        except Exception:
+            sentry_sdk.capture_exception()
+
+        with metrics.timer("event_manager.load_grouping_config"):
+            # At this point we want to normalize the in_app values in case the
+            # clients did not set this appropriately so far.
+            grouping_config = get_grouping_config_dict_for_event_data(
+                job["event"].data.data, project
+            )
+
+        with metrics.timer("event_manager.calculate_event_grouping"):
+            _calculate_event_grouping(project, job["event"], grouping_config)
+
+        job["flat_hashes"] = job["event"].data["hashes"] + secondary_flat_hashes
+        job["hierarchical_hashes"] = job["event"].data.get("hierarchical_hashes") or []
+
+        if not do_background_grouping_before:
+            _run_background_grouping(project, job)
+
+
+@metrics.wraps("save_event.save_aggregate_many")
+def _save_aggregate_many(jobs, failed_jobs=None):
+    """
+    Assigns every job to a group. Returns the jobs whose events were not
+    discarded because of their hash, see ``save_error_events`` for
+    ``failed_jobs``.
+    """
+    saved_jobs = []
+
+    for job in jobs:
+        # The group gets the same metadata as the event when it's flushed but
+        # additionally the `last_received` key is set.  This key is used by
+        # _save_aggregate.
+        group_metadata = dict(job["materialized_metadata"])
+        group_metadata["last_received"] = job["received_timestamp"]
+        kwargs = {
+            "platform": job["platform"],
+            "message": job["event"].search_message,
+            "culprit": job["culprit"],
+            "logger": job["logger_name"],
+            "level": LOG_LEVELS_MAP.get(job["level"]),
+            "last_seen": job["event"].datetime,
+            "first_seen": job["event"].datetime,
+            "active_at": job["event"].datetime,
+            "data": group_metadata,
+        }
+
+        if job["release"]:
+            kwargs["first_release"] = job["release"]
+
+        # Load attachments first, but persist them at the very last after
+        # posting to eventstream to make sure all counters and eventstream are
+        # incremented for sure. Also wait for grouping to remove attachments
+        # based on the group counter.
+        with metrics.timer("event_manager.get_attachments"):
+            with sentry_sdk.start_span(op="event_manager.save.get_attachments"):
+                job["attachments"] = get_attachments(job["cache_key"], job)
+
+        try:
+            with sentry_sdk.start_span(op="event_manager.save.save_aggregate_fn"):
+                job["group"], job["is_new"], job["is_regression"] = _save_aggregate(
+                    event=job["event"],
+                    flat_hashes=job["flat_hashes"],
+                    hierarchical_hashes=job["hierarchical_hashes"],
+                    release=job["release"],
+                    **kwargs,
+                )
+        except HashDiscarded as e:
+            discard_event(job, job["attachments"])
+            job["hash_discarded"] = e
+            continue
+        except Exception:
+            if failed_jobs is None:
+                raise
+            logger.exception(
+                "event_manager.save_aggregate_many.failed",
+                extra={"event_id": job["event"].event_id, "project_id": job["project_id"]},
+            )
+            failed_jobs.append(job)
+            continue
+
+        job["event"].group = job["group"]
+
+        # store a reference to the group id to guarantee validation of isolation
+        # XXX(markus): No clue what this does
+        job["event"].data.bind_ref(job["event"])
+
+        saved_jobs.append(job)
+
+    return saved_jobs
+
+
 @metrics.wraps("save_event.get_or_create_environment_many")
 def _get_or_create_environment_many(jobs, projects):
+    environments = {}
+
     for job in jobs:
-        job["environment"] = Environment.get_or_create(
-            project=projects[job["project_id"]], name=job["environment"]
+        environment_key = (job["project_id"], job["environment"])
+        environment = environments.get(environment_key)
+        if environment is None:
+            environment = environments[environment_key] = Environment.get_or_create(
+                project=projects[job["project_id"]], name=job["environment"]
+            )
+
+        job["environment"] = environment
+
+
+@metrics.wraps("save_event.get_or_create_group_environment_many")
+def _get_or_create_group_environment_many(jobs):
+    seen_group_environments = set()
+
+    for job in jobs:
+        job["is_new_group_environment"] = False
+
+        if not job["group"]:
+            continue
+
+        # Only the first event of a group environment within the batch can
+        # create it.
+        group_environment_key = (job["group"].id, job["environment"].id)
+        if group_environment_key in seen_group_environments:
+            continue
+        seen_group_environments.add(group_environment_key)
+
+        group_environment, job["is_new_group_environment"] = GroupEnvironment.get_or_create(
+            group_id=job["group"].id,
+            environment_id=job["environment"].id,
+            defaults={"first_release": job["release"] or None},
         )
 
 
@@ -723,22 +841,78 @@ def _get_or_create_release_associated_models(jobs, projects):
     # XXX: This is possibly unnecessarily detached from
     # _get_or_create_release_many, but we do not want to destroy order of
     # execution right now
+    release_environments = {}
+    release_environment_dates = {}
+
     for job in jobs:
         release = job["release"]
         if not release:
             continue
 
+        release_environment_key = (job["project_id"], release.id, job["environment"].id)
+        release_environments.setdefault(release_environment_key, job)
+        _extend_date_range(release_environment_dates, release_environment_key, job)
+
+    for release_environment_key, job in release_environments.items():
         project = projects[job["project_id"]]
+        release = job["release"]
         environment = job["environment"]
-        date = job["event"].datetime
 
-        ReleaseEnvironment.get_or_create(
-            project=project, release=release, environment=environment, datetime=date
-        )
+        # Rows are created with the earliest date of the batch as first_seen,
+        # the latest one only bumps last_seen.
+        for date in release_environment_dates[release_environment_key]:
+            ReleaseEnvironment.get_or_create(
+                project=project, release=release, environment=environment, datetime=date
+            )
 
-        ReleaseProjectEnvironment.get_or_create(
-            project=project, release=release, environment=environment, datetime=date
-        )
+            ReleaseProjectEnvironment.get_or_create(
+                project=project, release=release, environment=environment, datetime=date
+            )
+
+
+def _extend_date_range(date_ranges, key, job):
+    """
+    Extends the ``(earliest, latest)`` event dates stored in ``date_ranges``
+    for ``key`` by the date of ``job``'s event. A single date is stored as a
+    one-element tuple.
+    """
+    date = job["event"].datetime
+    date_range = date_ranges.get(key)
+    if date_range is None:
+        date_ranges[key] = (date,)
+    else:
+        earliest, latest = date_range[0], date_range[-1]
+        if date < earliest:
+            date_ranges[key] = (date, latest)
+        elif date > latest:
+            date_ranges[key] = (earliest, date)
+
+
+@metrics.wraps("save_event.get_or_create_group_release_many")
+def _get_or_create_group_release_many(jobs):
+    jobs_with_group_releases = {}
+    group_release_dates = {}
+
+    for job in jobs:
+        if not job["release"] or not job["group"]:
+            continue
+
+        group_release_key = (job["group"].id, job["release"].id, job["environment"].id)
+        jobs_with_group_releases.setdefault(group_release_key, []).append(job)
+        _extend_date_range(group_release_dates, group_release_key, job)
+
+    for group_release_key, jobs_to_update in jobs_with_group_releases.items():
+        job = jobs_to_update[0]
+        for date in group_release_dates[group_release_key]:
+            grouprelease = GroupRelease.get_or_create(
+                group=job["group"],
+                release=job["release"],
+                environment=job["environment"],
+                datetime=date,
+            )
+
+        for job in jobs_to_update:
+            job["grouprelease"] = grouprelease
 
 
 @metrics.wraps("save_event.tsdb_record_all_metrics")
@@ -746,73 +920,118 @@ def _tsdb_record_all_metrics(jobs):
     """
     Do all tsdb-related things for save_event in here s.t. we can potentially
     put everything in a single redis pipeline someday.
+
+    Writes of all jobs are merged: counters are issued with one ``incr_multi``
+    per environment, distinct counters and frequencies with one call per
+    environment and time bucket.
     """
 
     # XXX: validate whether anybody actually uses those metrics
 
-    for job in jobs:
-        incrs = []
-        frequencies = []
-        records = []
+    # Timestamps are truncated to the greatest common divisor of all rollups,
+    # which keeps every write in the same bucket of every rollup while
+    # allowing events of the same bucket to share writes.
+    resolution = functools.reduce(math.gcd, tsdb.get_rollups())
+
+    # environment_id -> (model, key, timestamp) -> count
+    incrs = defaultdict(Counter)
+    # (environment_id, timestamp) -> (model, key) -> set of values
+    records = defaultdict(lambda: defaultdict(set))
+    # timestamp -> model -> key -> member -> count
+    frequencies = defaultdict(lambda: defaultdict(lambda: defaultdict(Counter)))
 
-        incrs.append((tsdb.models.project, job["project_id"]))
+    for job in jobs:
         event = job["event"]
         group = job["group"]
         release = job["release"]
         environment = job["environment"]
 
+        timestamp = to_datetime(tsdb.normalize_to_epoch(event.datetime, resolution))
+        env_incrs = incrs[environment.id]
+        env_records = records[(environment.id, timestamp)]
+
+        env_incrs[(tsdb.models.project, job["project_id"], timestamp)] += 1
+
         if group:
-            incrs.append((tsdb.models.group, group.id))
-            frequencies.append(
-                (tsdb.models.frequent_environments_by_group, {group.id: {environment.id: 1}})
-            )
+            env_incrs[(tsdb.models.group, group.id, timestamp)] += 1
+            frequencies[timestamp][tsdb.models.frequent_environments_by_group][group.id][
+                environment.id
+            ] += 1
 
             if release:
-                frequencies.append(
-                    (
-                        tsdb.models.frequent_releases_by_group,
-                        {group.id: {job["grouprelease"].id: 1}},
-                    )
-                )
+                frequencies[timestamp][tsdb.models.frequent_releases_by_group][group.id][
+                    job["grouprelease"].id
+                ] += 1
 
         if release:
-            incrs.append((tsdb.models.release, release.id))
+            env_incrs[(tsdb.models.release, release.id, timestamp)] += 1
 
         user = job["user"]
 
         if user:
             project_id = job["project_id"]
-            records.append((tsdb.models.users_affected_by_project, project_id, (user.tag_value,)))
+            env_records[(tsdb.models.users_affected_by_project, project_id)].add(user.tag_value)
 
             if group:
-                records.append((tsdb.models.users_affected_by_group, group.id, (user.tag_value,)))
-
-        if incrs:
-            tsdb.incr_multi(incrs, timestamp=event.datetime, environment_id=environment.id)
+                env_records[(tsdb.models.users_affected_by_group, group.id)].add(user.tag_value)
+
+    for environment_id, counts in incrs.items():
+        tsdb.incr_multi(
+            [
+                (model, key, {"timestamp": timestamp, "count": count})
+                for (model, key, timestamp), count in counts.items()
+            ],
+            environment_id=environment_id,
+        )
 
-        if records:
-            tsdb.record_multi(records, timestamp=event.datetime, environment_id=environment.id)
+    for (environment_id, timestamp), values in records.items():
+        if values:
+            tsdb.record_multi(
+                [(model, key, tuple(sorted(v))) for (model, key), v in values.items()],
+                timestamp=timestamp,
+                environment_id=environment_id,
+            )
 
-        if frequencies:
-            tsdb.record_frequency_multi(frequencies, timestamp=event.datetime)
+    for timestamp, requests in frequencies.items():
+        tsdb.record_frequency_multi(
+            [
+                (model, {key: dict(members) for key, members in request.items()})
+                for model, request in requests.items()
+            ],
+            timestamp=timestamp,
+        )
 
 
 @metrics.wraps("save_event.nodestore_save_many")
 def _nodestore_save_many(jobs):
+    # Unprocessed payloads are attached to all events that are part of a group
+    # so they can be reprocessed later.
+    unprocessed_keys = {
+        id(job): cache_key_for_event(
+            {"project": job["event"].project_id, "event_id": job["event"].event_id}
+        )
+        for job in jobs
+        if job["group"]
+    }
+
+    unprocessed = {}
+    if unprocessed_keys:
+        unprocessed = event_processing_store.get_many(
+            list(set(unprocessed_keys.values())), unprocessed=True
+        )
+
+    items = []
     for job in jobs:
         # Write the event to Nodestore
         subkeys = {}
 
-        if job["group"]:
-            event = job["event"]
-            data = event_processing_store.get(
-                cache_key_for_event({"project": event.project_id, "event_id": event.event_id}),
-                unprocessed=True,
-            )
-            if data is not None:
-                subkeys["unprocessed"] = data
+        data = unprocessed.get(unprocessed_keys.get(id(job)))
+        if data is not None:
+            subkeys["unprocessed"] = data
 
-        job["event"].data.save(subkeys=subkeys)
+        items.append((job["event"].data, subkeys))
+
+    NodeData.save_many(items)
 
 
 @metrics.wraps("save_event.eventstream_insert_many")
@@ -876,6 +1095,10 @@ def _get_event_user(project, data):
 
 
 def _get_event_user_impl(project, data, metrics_tags):
+    """
+    Builds the (unsaved) ``EventUser`` for the event. Use
+    ``_save_event_users`` to ensure it exists in the database.
+    """
     user_data = data.get("user")
     if not user_data:
         metrics_tags["event_has_user"] = "false"
@@ -903,33 +1126,54 @@ def _get_event_user_impl(project, data, metrics_tags):
     if not euser.hash:
         return
 
-    cache_key = f"euserid:1:{project.id}:{euser.hash}"
-    euser_id = cache.get(cache_key)
-    if euser_id is None:
-        metrics_tags["cache_hit"] = "false"
-        try:
-            with transaction.atomic(using=router.db_for_write(EventUser)):
-                euser.save()
-            metrics_tags["created"] = "true"
-        except IntegrityError:
-            metrics_tags["created"] = "false"
-            try:
-                euser = EventUser.objects.get(project_id=project.id, hash=euser.hash)
-            except EventUser.DoesNotExist:
-                metrics_tags["created"] = "lol"
-                # why???
-                e_userid = -1
-            else:
-                if euser.name != (user_data.get("name") or euser.name):
-                    euser.update(name=user_data["name"])
-                e_userid = euser.id
-            cache.set(cache_key, e_userid, 3600)
-    else:
-        metrics_tags["cache_hit"] = "true"
-
     return euser
 
 
+@metrics.wraps("save_event.save_event_users")
+def _save_event_users(event_users):
+    """
+    Persists event users that are not known yet.
+
+    :param event_users: A mapping of ``(project_id, hash)`` to pairs of
+        ``(euser, user_data)``.
+    """
+    cache_keys = {
+        f"euserid:1:{project_id}:{euser_hash}": (project_id, euser_hash)
+        for project_id, euser_hash in event_users
+    }
+    cached = cache.get_many(list(cache_keys))
+
+    for cache_key, event_user_key in cache_keys.items():
+        with metrics.timer("event_manager.save_event_user") as metrics_tags:
+            if cached.get(cache_key) is not None:
+                metrics_tags["cache_hit"] = "true"
+                continue
+
+            metrics_tags["cache_hit"] = "false"
+            euser, user_data = event_users[event_user_key]
+            _save_event_user(euser, user_data, cache_key, metrics_tags)
+
+
+def _save_event_user(euser, user_data, cache_key, metrics_tags):
+    try:
+        with transaction.atomic(using=router.db_for_write(EventUser)):
+            euser.save()
+        metrics_tags["created"] = "true"
+    except IntegrityError:
+        metrics_tags["created"] = "false"
+        try:
+            euser = EventUser.objects.get(project_id=euser.project_id, hash=euser.hash)
+        except EventUser.DoesNotExist:
+            metrics_tags["created"] = "lol"
+            # why???
+            e_userid = -1
+        else:
+            if euser.name != (user_data.get("name") or euser.name):
+                euser.update(name=user_data["name"])
+            e_userid = euser.id
+        cache.set(cache_key, e_userid, 3600)
+
+
 def get_event_type(data):
     return eventtypes.get(data.get("type", "default"))()
 
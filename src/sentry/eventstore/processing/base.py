@@ -1,5 +1,5 @@
 from datetime import timedelta
-from typing import Any, Optional
+from typing import Any, Mapping, Optional, Sequence
 
 import sentry_sdk
 
@@ -46,6 +46,21 @@ class EventProcessingStore:
                 key = self.__get_unprocessed_key(key)
             return self.inner.get(key)
 
+    def get_many(self, keys: Sequence[str], unprocessed: bool = False) -> Mapping[str, Event]:
+        """
+        Fetch multiple events by their keys. Missing events are omitted from
+        the result.
+        """
+        with sentry_sdk.start_span(op="eventstore.processing.get_many"):
+            if unprocessed:
+                inner_keys = {self.__get_unprocessed_key(key): key for key in keys}
+            else:
+                inner_keys = {key: key for key in keys}
+            return {
+                inner_keys[inner_key]: value
+                for inner_key, value in self.inner.get_many(list(inner_keys))
+            }
+
     def delete_by_key(self, key: str) -> None:
         with sentry_sdk.start_span(op="eventstore.processing.delete_by_key"):
             self.inner.delete(key)
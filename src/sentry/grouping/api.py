@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 
 from sentry import options
 from sentry.grouping.component import GroupingComponent
@@ -22,6 +23,8 @@ from sentry.grouping.variants import (
 
 HASH_RE = re.compile(r"^[0-9a-f]{32}$")
 
+FINGERPRINTING_RULES_CACHE_SIZE = 1000
+
 
 class GroupingConfigNotFound(LookupError):
     pass
@@ -152,12 +155,21 @@ def load_default_grouping_config():
 
 
 def get_fingerprinting_config_for_project(project):
-    from sentry.grouping.fingerprinting import FingerprintingRules, InvalidFingerprintingConfig
-
     rules = project.get_option("sentry:fingerprinting_rules")
     if not rules:
+        from sentry.grouping.fingerprinting import FingerprintingRules
+
         return FingerprintingRules([])
 
+    return _load_fingerprinting_rules(rules)
+
+
+@lru_cache(maxsize=FINGERPRINTING_RULES_CACHE_SIZE)
+def _load_fingerprinting_rules(rules):
+    # Fingerprinting rules are needed for every event, but there are only a
+    # few distinct configs per process. Compiled rules are never mutated so
+    # they can be shared between projects with the same rules.
+    from sentry.grouping.fingerprinting import FingerprintingRules, InvalidFingerprintingConfig
     from sentry.utils.cache import cache
     from sentry.utils.hashlib import md5_text
 
@@ -1,6 +1,7 @@
 import base64
 import os
 import zlib
+from functools import lru_cache
 
 import msgpack
 from parsimonious.exceptions import ParseError
@@ -70,6 +71,9 @@ _        = space*
 VERSIONS = [1, 2]
 LATEST_VERSION = VERSIONS[-1]
 
+# Maximum number of decoded enhancements kept around per process.
+LOADS_CACHE_SIZE = 1000
+
 
 class StacktraceState:
     def __init__(self):
@@ -251,6 +255,14 @@ class Enhancements:
     def loads(cls, data):
         if isinstance(data, str):
             data = data.encode("ascii", "ignore")
+        return cls._loads_cached(data)
+
+    @classmethod
+    @lru_cache(maxsize=LOADS_CACHE_SIZE)
+    def _loads_cached(cls, data):
+        # Enhancements are decoded for every event that is grouped, but there
+        # are only ever a few distinct configs per process.  Instances are
+        # never mutated after construction so they can be shared.
         padded = data + b"=" * (4 - (len(data) % 4))
         try:
             return cls._from_config_structure(
@@ -319,21 +331,31 @@ class Rule:
         if not self.matchers:
             return []
 
+        if cache is None:
+            cache = {}
+
         # 1 - Check if exception matchers match
         for m in self._exception_matchers:
             if not m.matches_frame(frames, -1, platform, exception_data, cache):
                 return []
 
-        rv = []
+        # 2 - Check if frame matchers match.  Every matcher produces a bitmask
+        # of the frames it matches, so a rule only needs a bitwise and of
+        # those instead of calling every matcher for every frame.
+        mask = (1 << len(frames)) - 1
+        for m in self._other_matchers:
+            mask &= m.get_match_mask(frames, platform, exception_data, cache)
+            if not mask:
+                return []
 
-        # 2 - Check if frame matchers match
-        for idx, frame in enumerate(frames):
-            if all(
-                m.matches_frame(frames, idx, platform, exception_data, cache)
-                for m in self._other_matchers
-            ):
+        rv = []
+        idx = 0
+        while mask:
+            if mask & 1:
                 for action in self.actions:
                     rv.append((idx, action))
+            mask >>= 1
+            idx += 1
 
         return rv
 
@@ -87,6 +87,16 @@ class Match:
     def matches_frame(self, frames, idx, platform, exception_data, cache):
         raise NotImplementedError()
 
+    def get_match_mask(self, frames, platform, exception_data, cache):
+        """Returns an integer bitmask in which bit ``idx`` is set if the
+        matcher matches ``frames[idx]``.
+        """
+        rv = 0
+        for idx in range(len(frames)):
+            if self.matches_frame(frames, idx, platform, exception_data, cache):
+                rv |= 1 << idx
+        return rv
+
     def _to_config_structure(self, version):
         raise NotImplementedError()
 
@@ -163,6 +173,11 @@ class FrameMatch(Match):
             self.pattern.split() != [self.pattern] and '"%s"' % self.pattern or self.pattern,
         )
 
+    # Whether the match mask only depends on frame values that are not
+    # changed by actions, and can thus be shared by all rules evaluated
+    # against the same frames.
+    mask_cacheable = True
+
     def matches_frame(self, frames, idx, platform, exception_data, cache):
         match_frame = frames[idx]
         rv = self._positive_frame_match(match_frame, platform, exception_data, cache)
@@ -170,6 +185,20 @@ class FrameMatch(Match):
             rv = not rv
         return rv
 
+    def get_match_mask(self, frames, platform, exception_data, cache):
+        if not self.mask_cacheable:
+            return Match.get_match_mask(self, frames, platform, exception_data, cache)
+
+        # Matchers are shared between rules (see ``from_key``), so every
+        # matcher is evaluated at most once per frame list.
+        cache_key = (FrameMatch.get_match_mask, self)
+        rv = cache.get(cache_key)
+        if rv is None:
+            rv = cache[cache_key] = Match.get_match_mask(
+                self, frames, platform, exception_data, cache
+            )
+        return rv
+
     def _positive_frame_match(self, match_frame, platform, exception_data, cache):
         # Implement is subclasses
         raise NotImplementedError
@@ -231,6 +260,10 @@ class FamilyMatch(FrameMatch):
 
 
 class InAppMatch(FrameMatch):
+
+    # ``+app`` and ``-app`` actions modify this value.
+    mask_cacheable = False
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._ref_val = get_rule_bool(self.pattern)
@@ -264,6 +297,9 @@ class CategoryMatch(FrameFieldMatch):
 
     field = "category"
 
+    # ``category=...`` actions modify this value.
+    mask_cacheable = False
+
 
 class ExceptionFieldMatch(FrameMatch):
     def _positive_frame_match(self, frame_data, platform, exception_data, cache):
@@ -302,6 +338,10 @@ class CallerMatch(Match):
             frames, idx - 1, platform, exception_data, cache
         )
 
+    def get_match_mask(self, frames, platform, exception_data, cache):
+        mask = self.caller.get_match_mask(frames, platform, exception_data, cache)
+        return (mask << 1) & ((1 << len(frames)) - 1)
+
 
 class CalleeMatch(Match):
     def __init__(self, caller: FrameMatch):
@@ -318,3 +358,7 @@ class CalleeMatch(Match):
         return idx < len(frames) - 1 and self.caller.matches_frame(
             frames, idx + 1, platform, exception_data, cache
         )
+
+    def get_match_mask(self, frames, platform, exception_data, cache):
+        mask = self.caller.get_match_mask(frames, platform, exception_data, cache)
+        return mask >> 1
@@ -5,7 +5,7 @@ from parsimonious.grammar import Grammar, NodeVisitor
 
 from sentry.grouping.utils import get_rule_bool
 from sentry.stacktraces.platform import get_behavior_family_for_platform
-from sentry.utils.glob import glob_match
+from sentry.utils.glob import GLOB_CHARACTERS, glob_match
 from sentry.utils.safe import get_path
 from sentry.utils.strings import unescape_string
 
@@ -170,14 +170,46 @@ class FingerprintingRules:
         self.rules = rules
         self.changelog = changelog
 
+        # Rules that can only match events with a specific value for some key
+        # are indexed by that ``(key, value)`` pair so that events are only
+        # evaluated against rules they can possibly match.
+        self._unindexed_rules = []
+        self._rules_by_literal = {}
+        for position, rule in enumerate(rules):
+            literal = rule.get_literal()
+            if literal is None:
+                self._unindexed_rules.append(position)
+            else:
+                self._rules_by_literal.setdefault(literal, []).append(position)
+        self._literal_keys = {key for key, _ in self._rules_by_literal}
+
     def iter_rules(self):
         return iter(self.rules)
 
+    def iter_candidate_rules(self, access):
+        """
+        Yields the rules that might match the event behind ``access``, in the
+        order in which they are defined.
+        """
+        if not self._rules_by_literal:
+            yield from self.rules
+            return
+
+        positions = set(self._unindexed_rules)
+        for key in self._literal_keys:
+            for values in access.get_values(get_match_group(key)):
+                value = values.get(key)
+                if isinstance(value, str):
+                    positions.update(self._rules_by_literal.get((key, value), ()))
+
+        for position in sorted(positions):
+            yield self.rules[position]
+
     def get_fingerprint_values_for_event(self, event):
         if not self.rules:
             return
         access = EventAccess(event)
-        for rule in self.iter_rules():
+        for rule in self.iter_candidate_rules(access):
             new_values = rule.get_fingerprint_values_for_event_access(access)
             if new_values is not None:
                 return (rule,) + new_values
@@ -239,6 +271,22 @@ MATCHERS = {
     "app": "app",
 }
 
+#: Keys whose values are matched case-sensitively and without normalization,
+#: so that a pattern without wildcards only matches that exact value.
+LITERAL_MATCH_KEYS = frozenset(["type", "module", "function", "logger"])
+
+
+def get_match_group(key):
+    if key == "message":
+        return "toplevel"
+    if key in ("logger", "level"):
+        return "log_info"
+    if key in ("type", "value"):
+        return "exceptions"
+    if key.startswith("tags."):
+        return "tags"
+    return "frames"
+
 
 class Match:
     def __init__(self, key, pattern, negated=False):
@@ -254,15 +302,18 @@ class Match:
 
     @property
     def match_group(self):
-        if self.key == "message":
-            return "toplevel"
-        if self.key in ("logger", "level"):
-            return "log_info"
-        if self.key in ("type", "value"):
-            return "exceptions"
-        if self.key.startswith("tags."):
-            return "tags"
-        return "frames"
+        return get_match_group(self.key)
+
+    @property
+    def literal(self):
+        """The only value this matcher matches, if it matches exactly one."""
+        if self.negated:
+            return None
+        if self.key not in LITERAL_MATCH_KEYS and not self.key.startswith("tags."):
+            return None
+        if GLOB_CHARACTERS.intersection(self.pattern):
+            return None
+        return self.pattern
 
     def matches(self, values):
         rv = self._positive_match(values)
@@ -350,12 +401,22 @@ class Rule:
         self.fingerprint = fingerprint
         self.attributes = attributes
 
-    def get_fingerprint_values_for_event_access(self, access):
-        by_match_group = {}
+        self._by_match_group = {}
+        for matcher in matchers:
+            self._by_match_group.setdefault(matcher.match_group, []).append(matcher)
+
+    def get_literal(self):
+        """
+        Returns a ``(key, value)`` pair that events must contain for this rule
+        to match, or ``None``.
+        """
         for matcher in self.matchers:
-            by_match_group.setdefault(matcher.match_group, []).append(matcher)
+            literal = matcher.literal
+            if literal is not None:
+                return matcher.key, literal
 
-        for match_group, matchers in by_match_group.items():
+    def get_fingerprint_values_for_event_access(self, access):
+        for match_group, matchers in self._by_match_group.items():
             for values in access.get_values(match_group):
                 if all(x.matches(values) for x in matchers):
                     break
@@ -335,6 +335,41 @@ class AlertRuleManager(BaseManager):
 
         return alert_rule
 
+    def get_for_subscriptions(self, subscriptions):
+        """
+        Fetches the AlertRules associated with multiple Subscriptions at once. Returns a
+        dict of subscription id to AlertRule, subscriptions without an AlertRule are
+        left out. Attempts to fetch from cache then hits the database
+        """
+        cache_keys = {self.__build_subscription_cache_key(sub.id): sub.id for sub in subscriptions}
+        alert_rules = {
+            cache_keys[cache_key]: alert_rule
+            for cache_key, alert_rule in cache.get_many(list(cache_keys)).items()
+            if alert_rule is not None
+        }
+
+        missing = [
+            sub
+            for sub in subscriptions
+            if sub.id not in alert_rules and sub.snuba_query_id is not None
+        ]
+        if missing:
+            alert_rules_by_snuba_query = {
+                alert_rule.snuba_query_id: alert_rule
+                for alert_rule in AlertRule.objects.filter(
+                    snuba_query_id__in={sub.snuba_query_id for sub in missing}
+                )
+            }
+            to_cache = {}
+            for sub in missing:
+                alert_rule = alert_rules_by_snuba_query.get(sub.snuba_query_id)
+                if alert_rule is not None:
+                    alert_rules[sub.id] = alert_rule
+                    to_cache[self.__build_subscription_cache_key(sub.id)] = alert_rule
+            cache.set_many(to_cache, 3600)
+
+        return alert_rules
+
     @classmethod
     def clear_subscription_cache(cls, instance, **kwargs):
         cache.delete(cls.__build_subscription_cache_key(instance.id))
@@ -482,6 +517,40 @@ class AlertRuleTriggerManager(BaseManager):
             cache.set(cache_key, triggers, 3600)
         return triggers
 
+    def get_for_alert_rules(self, alert_rules):
+        """
+        Fetches the AlertRuleTriggers associated with multiple AlertRules at once. Returns
+        a dict of alert rule id to a list of AlertRuleTriggers. Attempts to fetch from
+        cache then hits the database
+        """
+        cache_keys = {
+            self._build_trigger_cache_key(alert_rule.id): alert_rule.id
+            for alert_rule in alert_rules
+        }
+        triggers = {
+            cache_keys[cache_key]: alert_rule_triggers
+            for cache_key, alert_rule_triggers in cache.get_many(list(cache_keys)).items()
+            if alert_rule_triggers is not None
+        }
+
+        missing = [
+            alert_rule_id for alert_rule_id in cache_keys.values() if alert_rule_id not in triggers
+        ]
+        if missing:
+            for alert_rule_id in missing:
+                triggers[alert_rule_id] = []
+            for trigger in AlertRuleTrigger.objects.filter(alert_rule_id__in=missing):
+                triggers[trigger.alert_rule_id].append(trigger)
+            cache.set_many(
+                {
+                    self._build_trigger_cache_key(alert_rule_id): triggers[alert_rule_id]
+                    for alert_rule_id in missing
+                },
+                3600,
+            )
+
+        return triggers
+
     @classmethod
     def clear_trigger_cache(cls, instance, **kwargs):
         cache.delete(cls._build_trigger_cache_key(instance.alert_rule_id))
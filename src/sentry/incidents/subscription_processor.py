@@ -55,21 +55,33 @@ class SubscriptionProcessor:
         AlertRuleThresholdType.BELOW: (operator.lt, operator.gt),
     }
 
-    def __init__(self, subscription):
+    def __init__(self, subscription, state=None, pipeline=None):
+        """
+        :param state: Optionally, a tuple of the alert rule, its triggers and the alert
+        rule stats for the subscription, if they have already been fetched.
+        :param pipeline: Optionally, a Redis pipeline that alert rule stats updates are
+        added to, rather than being written immediately.
+        """
         self.subscription = subscription
-        try:
-            self.alert_rule = AlertRule.objects.get_for_subscription(subscription)
-        except AlertRule.DoesNotExist:
-            return
+        self.pipeline = pipeline
+        if state is None:
+            try:
+                alert_rule = AlertRule.objects.get_for_subscription(subscription)
+            except AlertRule.DoesNotExist:
+                return
+            triggers = AlertRuleTrigger.objects.get_for_alert_rule(alert_rule)
+            alert_rule_stats = get_alert_rule_stats(alert_rule, self.subscription, triggers)
+        else:
+            alert_rule, triggers, alert_rule_stats = state
 
-        self.triggers = AlertRuleTrigger.objects.get_for_alert_rule(self.alert_rule)
-        self.triggers.sort(key=lambda trigger: trigger.alert_threshold)
+        self.alert_rule = alert_rule
+        self.triggers = sorted(triggers, key=lambda trigger: trigger.alert_threshold)
 
         (
             self.last_update,
             self.trigger_alert_counts,
             self.trigger_resolve_counts,
-        ) = get_alert_rule_stats(self.alert_rule, self.subscription, self.triggers)
+        ) = alert_rule_stats
         self.orig_trigger_alert_counts = deepcopy(self.trigger_alert_counts)
         self.orig_trigger_resolve_counts = deepcopy(self.trigger_resolve_counts)
 
@@ -406,6 +418,7 @@ class SubscriptionProcessor:
             self.last_update,
             updated_trigger_alert_counts,
             updated_trigger_resolve_counts,
+            pipeline=self.pipeline,
         )
 
 
@@ -448,6 +461,52 @@ def partition(iterable, n):
     return zip(*args)
 
 
+def process_updates(subscription_updates):
+    """
+    Processes a batch of subscription updates. Updates for the same subscription are
+    processed in order by a single `SubscriptionProcessor`. The alert rules, triggers
+    and alert rule stats for all subscriptions are fetched up front, and the alert rule
+    stats are written back with a single pipeline once all updates have been processed.
+    :param subscription_updates: A list of `(subscription_update, subscription)` tuples
+    """
+    updates_by_subscription = {}
+    for subscription_update, subscription in subscription_updates:
+        updates_by_subscription.setdefault(subscription.id, (subscription, []))[1].append(
+            subscription_update
+        )
+    subscriptions = [subscription for subscription, _ in updates_by_subscription.values()]
+
+    alert_rules = AlertRule.objects.get_for_subscriptions(subscriptions)
+    triggers = AlertRuleTrigger.objects.get_for_alert_rules(set(alert_rules.values()))
+    alert_rule_stats = get_alert_rule_stats_many(
+        [
+            (
+                alert_rules[subscription.id],
+                subscription,
+                triggers[alert_rules[subscription.id].id],
+            )
+            for subscription in subscriptions
+            if subscription.id in alert_rules
+        ]
+    )
+
+    pipeline = get_redis_client().pipeline()
+    try:
+        for subscription, updates in updates_by_subscription.values():
+            state = None
+            if subscription.id in alert_rules:
+                alert_rule = alert_rules[subscription.id]
+                state = (alert_rule, triggers[alert_rule.id], alert_rule_stats[subscription.id])
+
+            processor = SubscriptionProcessor(subscription, state=state, pipeline=pipeline)
+            for subscription_update in updates:
+                processor.process_update(subscription_update)
+    finally:
+        # Stats are only added to the pipeline once the transaction for an update has
+        # been committed, so we write them even if a later update failed.
+        pipeline.execute()
+
+
 def get_alert_rule_stats(alert_rule, subscription, triggers):
     """
     Fetches stats about the alert rule, specific to the current subscription
@@ -463,6 +522,39 @@ def get_alert_rule_stats(alert_rule, subscription, triggers):
     alert_rule_keys = build_alert_rule_stat_keys(alert_rule, subscription)
     trigger_keys = build_trigger_stat_keys(alert_rule, subscription, triggers)
     results = get_redis_client().mget(alert_rule_keys + trigger_keys)
+    return parse_alert_rule_stats(triggers, results)
+
+
+def get_alert_rule_stats_many(items):
+    """
+    Fetches stats about multiple alert rules with a single pipeline.
+    :param items: A list of `(alert_rule, subscription, triggers)` tuples
+    :return: A dict of subscription id to the stats, as returned by
+    `get_alert_rule_stats`
+    """
+    if not items:
+        return {}
+
+    # Keys for different alert rules live in different hash slots, so they can't be
+    # fetched with a single `MGET`.
+    pipeline = get_redis_client().pipeline()
+    for alert_rule, subscription, triggers in items:
+        pipeline.mget(
+            build_alert_rule_stat_keys(alert_rule, subscription)
+            + build_trigger_stat_keys(alert_rule, subscription, triggers)
+        )
+
+    return {
+        subscription.id: parse_alert_rule_stats(triggers, results)
+        for (alert_rule, subscription, triggers), results in zip(items, pipeline.execute())
+    }
+
+
+def parse_alert_rule_stats(triggers, results):
+    """
+    Parses the raw values of the keys built by `build_alert_rule_stat_keys` and
+    `build_trigger_stat_keys` into the stats returned by `get_alert_rule_stats`.
+    """
     results = tuple(0 if result is None else int(result) for result in results)
     last_update = to_datetime(results[0])
     trigger_results = results[1:]
@@ -477,11 +569,17 @@ def get_alert_rule_stats(alert_rule, subscription, triggers):
     return last_update, trigger_alert_counts, trigger_resolve_counts
 
 
-def update_alert_rule_stats(alert_rule, subscription, last_update, alert_counts, resolve_counts):
+def update_alert_rule_stats(
+    alert_rule, subscription, last_update, alert_counts, resolve_counts, pipeline=None
+):
     """
     Updates stats about the alert rule, subscription and triggers if they've changed.
+    If a pipeline is passed the updates are only added to it, and the caller is
+    responsible for executing it.
     """
-    pipeline = get_redis_client().pipeline()
+    execute = pipeline is None
+    if execute:
+        pipeline = get_redis_client().pipeline()
 
     counts_with_stat_keys = zip(ALERT_RULE_TRIGGER_STAT_KEYS, (alert_counts, resolve_counts))
     for stat_key, trigger_counts in counts_with_stat_keys:
@@ -496,7 +594,8 @@ def update_alert_rule_stats(alert_rule, subscription, last_update, alert_counts,
 
     last_update_key = build_alert_rule_stat_keys(alert_rule, subscription)[0]
     pipeline.set(last_update_key, int(to_timestamp(last_update)), ex=REDIS_TTL)
-    pipeline.execute()
+    if execute:
+        pipeline.execute()
 
 
 def get_redis_client():
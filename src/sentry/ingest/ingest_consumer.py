@@ -22,7 +22,7 @@ import sentry_sdk
 from django.conf import settings
 from django.core.cache import cache
 
-from sentry import eventstore, features
+from sentry import eventstore, features, options
 from sentry.attachments import CachedAttachment, attachment_cache
 from sentry.event_manager import save_attachment
 from sentry.eventstore.processing import event_processing_store
@@ -31,7 +31,7 @@ from sentry.ingest.userreport import Conflict, save_userreport
 from sentry.killswitches import killswitch_matches_context
 from sentry.models import Project
 from sentry.signals import event_accepted
-from sentry.tasks.store import preprocess_event
+from sentry.tasks.store import SaveEventBatch, preprocess_event
 from sentry.utils import json, metrics
 from sentry.utils.batching_kafka_consumer import AbstractBatchWorker
 from sentry.utils.cache import cache_key_for_event
@@ -96,13 +96,22 @@ class IngestConsumerWorker(AbstractBatchWorker):
 
         projects_to_fetch = set()
 
+        # Error events that do not require further processing are saved in
+        # batches per project once all messages have been processed.
+        save_batch = None
+        save_batch_size = options.get("store.save-event-batch-size")
+        if save_batch_size > 1:
+            save_batch = SaveEventBatch(save_batch_size, on_submit=_mark_events_processed)
+
+        process_event = functools.partial(self.__process_event, save_batch=save_batch)
+
         with metrics.timer("ingest_consumer.prepare_messages"):
             for message in batch:
                 message_type = message["type"]
                 projects_to_fetch.add(message["project_id"])
 
                 if message_type == "event":
-                    other_messages.append((self.__process_event, message))
+                    other_messages.append((process_event, message))
                 elif message_type == "attachment_chunk":
                     attachment_chunks.append(message)
                 elif message_type == "attachment":
@@ -143,6 +152,10 @@ class IngestConsumerWorker(AbstractBatchWorker):
                 for future in as_completed(results.keys()):
                     results[future].callback(future)
 
+                if save_batch is not None:
+                    with metrics.timer("ingest_consumer.submit_save_event_batch"):
+                        save_batch.submit()
+
                 metrics.timing(
                     "ingest_consumer.process_other_messages_batch.normalized",
                     (time.monotonic() - other_messages_flush_start) / len(other_messages),
@@ -169,8 +182,12 @@ def trace_func(**span_kwargs):
 
 
 @metrics.wraps("ingest_consumer.process_event")
-def _do_process_event(message: Message, projects: Mapping[int, Project]) -> None:
-    result = _load_event(message, projects)
+def _do_process_event(
+    message: Message,
+    projects: Mapping[int, Project],
+    save_batch: Optional[SaveEventBatch] = None,
+) -> None:
+    result = _load_event(message, projects, save_batch)
     if result is None:
         return
 
@@ -179,7 +196,9 @@ def _do_process_event(message: Message, projects: Mapping[int, Project]) -> None
 
 
 def _load_event(
-    message: Message, projects: Mapping[int, Project]
+    message: Message,
+    projects: Mapping[int, Project],
+    save_batch: Optional[SaveEventBatch] = None,
 ) -> Optional[Tuple[Any, Callable[[str], None]]]:
     """
     Perform some initial filtering and deserialize the message payload. If the
@@ -187,6 +206,9 @@ def _load_event(
     function that can be called with the event's storage key to resume
     processing after the event has been persisted and is available to be read by
     other processing components.
+
+    If ``save_batch`` is given, events that can be saved right away are added
+    to it instead of being dispatched to ``save_event`` individually.
     """
     payload = message["payload"]
     start_time = float(message["start_time"])
@@ -215,7 +237,7 @@ def _load_event(
     # This code has been ripped from the old python store endpoint. We're
     # keeping it around because it does provide some protection against
     # reprocessing good events if a single consumer is in a restart loop.
-    deduplication_key = f"ev:{project_id}:{event_id}"
+    deduplication_key = _get_deduplication_key(project_id, event_id)
     if cache.get(deduplication_key) is not None:
         logger.warning(
             "pre-process-forwarder detected a duplicated event" " with id:%s for project:%s.",
@@ -289,10 +311,15 @@ def _load_event(
                 start_time=start_time,
                 event_id=event_id,
                 project=project,
+                save_batch=save_batch,
             )
 
-        # remember for an 1 hour that we saved this event (deduplication protection)
-        cache.set(deduplication_key, "", CACHE_TIMEOUT)
+        # remember for an 1 hour that we saved this event (deduplication protection).
+        # Events held back in a save batch are remembered once their batch has
+        # been dispatched, so they are not dropped if the consumer restarts
+        # before that.
+        if save_batch is None or not save_batch.is_pending(cache_key):
+            cache.set(deduplication_key, "", CACHE_TIMEOUT)
 
         # emit event_accepted once everything is done
         event_accepted.send_robust(ip=remote_addr, data=data, project=project, sender=process_event)
@@ -300,19 +327,37 @@ def _load_event(
     return data, dispatch_task
 
 
+def _get_deduplication_key(project_id: int, event_id: str) -> str:
+    return f"ev:{project_id}:{event_id}"
+
+
+def _mark_events_processed(project_id: int, events: Sequence[Mapping[str, Any]]) -> None:
+    cache.set_many(
+        {_get_deduplication_key(project_id, event["event_id"]): "" for event in events},
+        CACHE_TIMEOUT,
+    )
+
+
 def _store_event(data) -> str:
     return event_processing_store.store(data)
 
 
 @trace_func(name="ingest_consumer.process_event")
-def process_event(message: Message, projects: Mapping[int, Project]) -> None:
-    return _do_process_event(message, projects)
+def process_event(
+    message: Message,
+    projects: Mapping[int, Project],
+    save_batch: Optional[SaveEventBatch] = None,
+) -> None:
+    return _do_process_event(message, projects, save_batch)
 
 
 def process_event_async(
-    executor: ThreadPoolExecutor, message: Message, projects: Mapping[int, Project]
+    executor: ThreadPoolExecutor,
+    message: Message,
+    projects: Mapping[int, Project],
+    save_batch: Optional[SaveEventBatch] = None,
 ) -> Optional["AsyncResult[str]"]:
-    result = _load_event(message, projects)
+    result = _load_event(message, projects, save_batch)
     if result is None:
         return None
 
@@ -1,8 +1,15 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
 from symbolic import SourceView
 
 from sentry.utils.strings import codec_lookup
 
-__all__ = ["SourceCache", "SourceMapCache"]
+__all__ = ["SourceCache", "SourceMapCache", "SourceMapViewCache", "get_sourcemap_view_cache"]
+
+_sourcemap_view_cache = None
+_sourcemap_view_cache_lock = threading.Lock()
 
 
 def is_utf8(codec):
@@ -90,3 +97,61 @@ class SourceMapCache:
             sourcemap = self.get(sourcemap_url)
             return (sourcemap_url, sourcemap)
         return (None, None)
+
+
+class SourceMapViewCache:
+    """
+    A thread-safe LRU cache of parsed source maps, shared by all events that
+    are processed in a process.
+
+    Entries are keyed by a digest of the raw source map, and the cache is
+    bounded by the total size of the raw source maps (``max_size`` bytes).
+    """
+
+    def __init__(self, max_size):
+        assert max_size > 0
+        self.max_size = max_size
+        self.size = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._cache)
+
+    def get(self, key):
+        with self._lock:
+            item = self._cache.get(key)
+            if item is None:
+                return None
+            self._cache.move_to_end(key)
+            return item[1]
+
+    def set(self, key, sourcemap_view, size):
+        if size > self.max_size:
+            return
+
+        with self._lock:
+            if key in self._cache:
+                self.size -= self._cache.pop(key)[0]
+            self._cache[key] = (size, sourcemap_view)
+            self.size += size
+            while self.size > self.max_size:
+                _, (evicted_size, _) = self._cache.popitem(last=False)
+                self.size -= evicted_size
+
+
+def get_sourcemap_view_cache():
+    """
+    Returns the process-wide ``SourceMapViewCache`` configured through
+    ``SENTRY_JS_SOURCEMAP_CACHE_SIZE``, or ``None`` if it is disabled.
+    """
+    global _sourcemap_view_cache
+
+    max_size = settings.SENTRY_JS_SOURCEMAP_CACHE_SIZE
+    if not max_size:
+        return None
+
+    with _sourcemap_view_cache_lock:
+        if _sourcemap_view_cache is None:
+            _sourcemap_view_cache = SourceMapViewCache(max_size)
+        return _sourcemap_view_cache
@@ -12,15 +12,19 @@ __all__ = ["JavaScriptStacktraceProcessor"]
 
 import base64
 import errno
+import hashlib
 import logging
 import re
 import sys
+import threading
 import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from os.path import splitext
 from urllib.parse import urlsplit
 
 import sentry_sdk
 from django.conf import settings
+from django.db import connections
 from requests.utils import get_encoding_from_headers
 from symbolic import SourceMapView
 
@@ -41,7 +45,7 @@ from sentry.utils.retries import ConditionalRetryPolicy, exponential_delay
 from sentry.utils.safe import get_path
 from sentry.utils.urls import non_standard_url_join
 
-from .cache import SourceCache, SourceMapCache
+from .cache import SourceCache, SourceMapCache, get_sourcemap_view_cache
 
 # number of surrounding lines (on each side) to fetch
 LINES_OF_CONTEXT = 5
@@ -71,6 +75,9 @@ CACHE_CONTROL_MIN = 60
 # the maximum number of remote resources (i.e. source files) that should be
 # fetched
 MAX_RESOURCE_FETCHES = 100
+# the maximum number of concurrent fetches from a single host when prefetching
+# sources, see the `processing.javascript-fetch-concurrency` option
+MAX_CONCURRENT_FETCHES_PER_HOST = 4
 
 CACHE_MAX_VALUE_SIZE = settings.SENTRY_CACHE_MAX_VALUE_SIZE
 
@@ -476,9 +483,13 @@ def fetch_release_archive_for_url(release, dist, url) -> Optional[IO]:
 
                 return None
 
-            # This will implicitly skip too large payloads.
-            cache.set(cache_key, file_.read(), 3600)
-            file_.seek(0)
+            # Reading the entire archive would defeat reading only the
+            # needed entries from it, so skip payloads that are too large for
+            # the cache anyway.
+            if CACHE_MAX_VALUE_SIZE is None or (releasefile.file.size or 0) <= CACHE_MAX_VALUE_SIZE:
+                # This will implicitly skip too large payloads.
+                cache.set(cache_key, file_.read(), 3600)
+                file_.seek(0)
 
             return file_
 
@@ -715,13 +726,34 @@ def fetch_sourcemap(url, project=None, release=None, dist=None, allow_scraping=T
         )
         body = result.body
     try:
-        return SourceMapView.from_json_bytes(body)
+        return parse_sourcemap(body)
     except Exception as exc:
         # This is in debug because the product shows an error already.
         logger.debug(str(exc), exc_info=True)
         raise UnparseableSourcemap({"url": http.expose_url(url)})
 
 
+def parse_sourcemap(body):
+    """
+    Parses a source map, reusing views of identical source maps parsed before
+    if the shared source map cache is enabled.
+    """
+    sourcemap_cache = get_sourcemap_view_cache()
+    if sourcemap_cache is None:
+        return SourceMapView.from_json_bytes(body)
+
+    key = hashlib.sha1(body).digest()
+    sourcemap_view = sourcemap_cache.get(key)
+    if sourcemap_view is not None:
+        metrics.incr("sourcemaps.view_cache.hit", skip_internal=True)
+        return sourcemap_view
+
+    metrics.incr("sourcemaps.view_cache.miss", skip_internal=True)
+    sourcemap_view = SourceMapView.from_json_bytes(body)
+    sourcemap_cache.set(key, sourcemap_view, len(body))
+    return sourcemap_view
+
+
 def is_data_uri(url):
     return url[:BASE64_PREAMBLE_LENGTH] == BASE64_SOURCEMAP_PREAMBLE
 
@@ -799,6 +831,10 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
         self.release = None
         self.dist = None
 
+        # futures of source files and source maps fetched by `prefetch_sources`
+        self.prefetched_files = {}
+        self.prefetched_sourcemaps = {}
+
     def get_stacktraces(self, data):
         exceptions = get_path(data, "exception", "values", filter=True, default=())
         stacktraces = [e["stacktrace"] for e in exceptions if e.get("stacktrace")]
@@ -1108,13 +1144,7 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
                 op="JavaScriptStacktraceProcessor.cache_source.fetch_file"
             ) as span:
                 span.set_data("filename", filename)
-                result = fetch_file(
-                    filename,
-                    project=self.project,
-                    release=self.release,
-                    dist=self.dist,
-                    allow_scraping=self.allow_scraping,
-                )
+                result = self.fetch_file(filename)
         except http.BadSource as exc:
             # most people don't upload release artifacts for their third-party libraries,
             # so ignore missing node_modules files
@@ -1146,13 +1176,7 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
                 op="JavaScriptStacktraceProcessor.cache_source.fetch_sourcemap"
             ) as span:
                 span.set_data("sourcemap_url", sourcemap_url)
-                sourcemap_view = fetch_sourcemap(
-                    sourcemap_url,
-                    project=self.project,
-                    release=self.release,
-                    dist=self.dist,
-                    allow_scraping=self.allow_scraping,
-                )
+                sourcemap_view = self.fetch_sourcemap(sourcemap_url)
         except http.BadSource as exc:
             # we don't perform the same check here as above, because if someone has
             # uploaded a node_modules file, which has a sourceMappingURL, they
@@ -1171,12 +1195,89 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
             if source_view is not None:
                 self.cache.add(non_standard_url_join(sourcemap_url, source_name), source_view)
 
+    def fetch_file(self, url):
+        future = self.prefetched_files.pop(url, None)
+        if future is not None:
+            return future.result()
+
+        return fetch_file(
+            url,
+            project=self.project,
+            release=self.release,
+            dist=self.dist,
+            allow_scraping=self.allow_scraping,
+        )
+
+    def fetch_sourcemap(self, url):
+        future = self.prefetched_sourcemaps.pop(url, None)
+        if future is not None:
+            return future.result()
+
+        return fetch_sourcemap(
+            url,
+            project=self.project,
+            release=self.release,
+            dist=self.dist,
+            allow_scraping=self.allow_scraping,
+        )
+
+    def prefetch_sources(self, filenames, concurrency):
+        """
+        Concurrently fetch the given source files and the source maps they
+        reference, so that `cache_source` does not have to wait for each of
+        them in turn. Fetch errors are raised when the results are consumed.
+        """
+        host_semaphores = {}
+
+        def submit(executor, fetch_fn, url):
+            host = urlsplit(url).netloc
+            if host not in host_semaphores:
+                host_semaphores[host] = threading.BoundedSemaphore(MAX_CONCURRENT_FETCHES_PER_HOST)
+            semaphore = host_semaphores[host]
+
+            def fetch():
+                try:
+                    with semaphore:
+                        return fetch_fn(
+                            url,
+                            project=self.project,
+                            release=self.release,
+                            dist=self.dist,
+                            allow_scraping=self.allow_scraping,
+                        )
+                finally:
+                    # Worker threads end with the prefetch, so close the
+                    # database connections they opened.
+                    connections.close_all()
+
+            return executor.submit(fetch)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            file_futures = {}
+            for filename in filenames:
+                file_futures[submit(executor, fetch_file, filename)] = filename
+
+            # Source maps are fetched as soon as the file referencing them is
+            # available, while other files are still being fetched.
+            for future in as_completed(file_futures):
+                filename = file_futures[future]
+                self.prefetched_files[filename] = future
+                try:
+                    sourcemap_url = discover_sourcemap(future.result())
+                except Exception:
+                    continue
+
+                if sourcemap_url and sourcemap_url not in self.prefetched_sourcemaps:
+                    self.prefetched_sourcemaps[sourcemap_url] = submit(
+                        executor, fetch_sourcemap, sourcemap_url
+                    )
+
     def populate_source_cache(self, frames):
         """
         Fetch all sources that we know are required (being referenced directly
         in frames).
         """
-        pending_file_list = set()
+        pending_file_list = {}
         for f in frames:
             # We can't even attempt to fetch source if abs_path is None
             if f.get("abs_path") is None:
@@ -1190,7 +1291,14 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
             # we cannot fetch any other files than those uploaded by user
             if self.data.get("platform") == "node" and not f.get("abs_path").startswith("app:"):
                 continue
-            pending_file_list.add(f["abs_path"])
+            pending_file_list[f["abs_path"]] = None
+
+        concurrency = options.get("processing.javascript-fetch-concurrency")
+        if concurrency > 1 and len(pending_file_list) > 1:
+            with sentry_sdk.start_span(
+                op="JavaScriptStacktraceProcessor.populate_source_cache.prefetch_sources"
+            ):
+                self.prefetch_sources(list(pending_file_list)[: self.max_fetches], concurrency)
 
         for idx, filename in enumerate(pending_file_list):
             with sentry_sdk.start_span(
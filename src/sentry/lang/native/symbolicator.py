@@ -1,5 +1,6 @@
 import base64
 import logging
+import os
 import random
 import sys
 import time
@@ -407,6 +408,26 @@ def get_sources_for_project(project):
     return sources
 
 
+_pooled_session = None
+_pooled_session_pid = None
+
+
+def get_pooled_session():
+    """
+    Returns the HTTP session that all `SymbolicatorSession`s of this process
+    share, so that connections to symbolicator are kept alive across events
+    instead of being established for every event.
+    """
+    global _pooled_session, _pooled_session_pid
+
+    # Connections must not be shared with forked processes.
+    pid = os.getpid()
+    if _pooled_session is None or _pooled_session_pid != pid:
+        _pooled_session = Session()
+        _pooled_session_pid = pid
+    return _pooled_session
+
+
 class SymbolicatorSession:
     def __init__(
         self, url=None, sources=None, project_id=None, event_id=None, timeout=None, options=None
@@ -440,12 +461,11 @@ class SymbolicatorSession:
 
     def open(self):
         if self.session is None:
-            self.session = Session()
+            self.session = get_pooled_session()
 
     def close(self):
-        if self.session is not None:
-            self.session.close()
-            self.session = None
+        # The pooled session stays open for the next event.
+        self.session = None
 
     def _ensure_open(self):
         if not self.session:
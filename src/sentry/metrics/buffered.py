@@ -0,0 +1,158 @@
+__all__ = ["BufferedMetricsBackend"]
+
+import atexit
+import logging
+import os
+import threading
+import time
+from random import randint, random
+
+from sentry.utils.imports import import_string
+
+logger = logging.getLogger("sentry.errors")
+
+
+def _get_series(key, instance, tags):
+    return (key, instance, tuple(sorted(tags.items())) if tags else ())
+
+
+class BufferedMetricsBackend:
+    """
+    Aggregates metrics in-process and periodically flushes them in bulk to
+    another metrics backend, e.g.::
+
+        SENTRY_METRICS_BACKEND = "sentry.metrics.buffered.BufferedMetricsBackend"
+        SENTRY_METRICS_OPTIONS = {
+            "backend": "sentry.metrics.dogstatsd.DogStatsdMetricsBackend",
+            "backend_options": {"statsd_host": "localhost", "statsd_port": 8125},
+        }
+
+    Counters are summed and gauges keep their last value per series (key,
+    instance and tags). Timings keep at most ``max_timing_samples`` randomly
+    chosen values per series and interval. They are flushed with the overall
+    rate they were sampled at, so that each value is weighted by the number of
+    values it stands in for.
+
+    The buffer is flushed every ``flush_interval`` seconds by a background
+    thread, as soon as it holds more than ``max_series`` series, and when the
+    process exits.
+    """
+
+    def __init__(
+        self,
+        backend,
+        backend_options=None,
+        flush_interval=10,
+        max_series=10000,
+        max_timing_samples=100,
+    ):
+        self.backend = import_string(backend)(**(backend_options or {}))
+        self.flush_interval = flush_interval
+        self.max_series = max_series
+        self.max_timing_samples = max_timing_samples
+        self._lock = threading.Lock()
+        self._pid = None
+        self._reset()
+        atexit.register(self.flush)
+
+    def _reset(self):
+        self._counters = {}
+        self._gauges = {}
+        # series -> [values, number of values seen, sample rate]
+        #
+        # Values are sampled with their sample rate when they are recorded,
+        # so all values of a series are expected to share a sample rate.
+        self._timings = {}
+        self._size = 0
+
+    def _start(self):
+        # The buffer is inherited by forked processes, but the flusher
+        # thread is not.
+        self._pid = os.getpid()
+        self._reset()
+
+        thread = threading.Thread(target=self._run, name="sentry.metrics.buffered")
+        thread.daemon = True
+        thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def _record(self, func, *args):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._start()
+            func(*args)
+            should_flush = self._size > self.max_series
+
+        if should_flush:
+            self.flush()
+
+    def _incr(self, series, amount):
+        if series in self._counters:
+            self._counters[series] += amount
+        else:
+            self._counters[series] = amount
+            self._size += 1
+
+    def _gauge(self, series, value):
+        if series not in self._gauges:
+            self._size += 1
+        self._gauges[series] = value
+
+    def _timing(self, series, value, sample_rate):
+        entry = self._timings.get(series)
+        if entry is None:
+            self._timings[series] = [[value], 1, sample_rate]
+            self._size += 1
+            return
+
+        values = entry[0]
+        entry[1] += 1
+        if len(values) < self.max_timing_samples:
+            values.append(value)
+        else:
+            # Reservoir sampling keeps a uniform sample of all values seen.
+            index = randint(0, entry[1] - 1)
+            if index < len(values):
+                values[index] = value
+
+    def incr(self, key, instance=None, tags=None, amount=1, sample_rate=1):
+        if sample_rate < 1:
+            if random() >= sample_rate:
+                return
+            amount = amount / sample_rate
+        self._record(self._incr, _get_series(key, instance, tags), amount)
+
+    def gauge(self, key, value, instance=None, tags=None, sample_rate=1):
+        self._record(self._gauge, _get_series(key, instance, tags), value)
+
+    def timing(self, key, value, instance=None, tags=None, sample_rate=1):
+        if sample_rate < 1 and random() >= sample_rate:
+            return
+        self._record(self._timing, _get_series(key, instance, tags), value, sample_rate)
+
+    def flush(self):
+        with self._lock:
+            counters, gauges, timings = self._counters, self._gauges, self._timings
+            self._reset()
+
+        backend = self.backend
+        try:
+            for (key, instance, tags), amount in counters.items():
+                backend.incr(key, instance, dict(tags), int(round(amount)), 1)
+
+            for (key, instance, tags), value in gauges.items():
+                backend.gauge(key, value, instance, dict(tags), 1)
+
+            for (key, instance, tags), (values, seen, sample_rate) in timings.items():
+                # Every flushed value stands in for ``seen / len(values)``
+                # recorded values, which in turn stand in for
+                # ``1 / sample_rate`` values each.
+                sample_rate = sample_rate * len(values) / seen
+                for value in values:
+                    backend.timing(key, value, instance, dict(tags), sample_rate)
+        except Exception:
+            logger.exception("Unable to flush buffered metrics")
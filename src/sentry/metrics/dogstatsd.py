@@ -33,3 +33,14 @@ class DogStatsdMetricsBackend(MetricsBackend):
         if tags:
             tags = [f"{k}:{v}" for k, v in tags.items()]
         statsd.timing(self._get_key(key), value, sample_rate=sample_rate, tags=tags)
+
+    def gauge(self, key, value, instance=None, tags=None, sample_rate=1):
+        if tags is None:
+            tags = {}
+        if self.tags:
+            tags.update(self.tags)
+        if instance:
+            tags["instance"] = instance
+        if tags:
+            tags = [f"{k}:{v}" for k, v in tags.items()]
+        statsd.gauge(self._get_key(key), value, sample_rate=sample_rate, tags=tags)
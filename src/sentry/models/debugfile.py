@@ -1,5 +1,4 @@
 import enum
-import errno
 import hashlib
 import logging
 import os
@@ -12,10 +11,9 @@ from django.db import models
 from symbolic import Archive, ObjectErrorUnsupportedObject, SymbolicError, normalize_debug_id
 from symbolic.debuginfo import BcSymbolMap, UuidMapping
 
-from sentry import options
 from sentry.constants import KNOWN_DIF_FORMATS
 from sentry.db.models import BaseManager, FlexibleForeignKey, JSONField, Model, sane_repr
-from sentry.models.file import File, clear_cached_files
+from sentry.models.file import File, LocalFileCache
 from sentry.reprocessing import bump_reprocessing_revision, resolve_processing_issue
 from sentry.utils.zip import safe_extract_zip
 
@@ -474,9 +472,12 @@ def create_files_from_dif_zip(fileobj, project):
 
 
 class DIFCache:
+    def __init__(self):
+        self.file_cache = LocalFileCache("dsym", "dsym.cache-path", "dsym.cache-max-size")
+
     @property
     def cache_path(self):
-        return options.get("dsym.cache-path")
+        return self.file_cache.cache_path
 
     def get_project_path(self, project):
         return os.path.join(self.cache_path, str(project.id))
@@ -490,19 +491,14 @@ class DIFCache:
 
         rv = {}
         for debug_id, dif in difs.items():
-            dif_path = os.path.join(self.get_project_path(project), debug_id)
-            try:
-                os.stat(dif_path)
-            except OSError as e:
-                if e.errno != errno.ENOENT:
-                    raise
-                dif.file.save_to(dif_path)
-            rv[debug_id] = dif_path
+            rv[debug_id] = self.file_cache.get_path(
+                os.path.join(str(project.id), debug_id), dif.file.save_to
+            )
 
         return rv
 
     def clear_old_entries(self):
-        clear_cached_files(self.cache_path)
+        self.file_cache.clear_old_entries()
 
 
 ProjectDebugFile.difcache = DIFCache()
@@ -1,12 +1,14 @@
+import fcntl
 import io
 import mmap
 import os
 import tempfile
 import time
+from bisect import bisect_right
 from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from hashlib import sha1
-from threading import Semaphore
+from threading import Lock, Semaphore
 from uuid import uuid4
 
 from django.conf import settings
@@ -37,6 +39,7 @@ UPLOAD_RETRY_TIME = getattr(settings, "SENTRY_UPLOAD_RETRY_TIME", 60)  # 1min
 DEFAULT_BLOB_SIZE = 1024 * 1024  # one mb
 CHUNK_STATE_HEADER = "__state"
 MULTI_BLOB_UPLOAD_CONCURRENCY = 8
+READAHEAD_CONCURRENCY = 4
 MAX_FILE_SIZE = 2 ** 31  # 2GB is the maximum offset supported by fileblob
 
 
@@ -476,12 +479,36 @@ class FileBlobIndex(Model):
         unique_together = (("file", "blob", "offset"),)
 
 
+_readahead_executor = None
+_readahead_executor_lock = Lock()
+
+
+def _get_readahead_executor():
+    global _readahead_executor
+
+    with _readahead_executor_lock:
+        if _readahead_executor is None:
+            _readahead_executor = ThreadPoolExecutor(
+                max_workers=READAHEAD_CONCURRENCY, thread_name_prefix="sentry.files.readahead"
+            )
+        return _readahead_executor
+
+
+def _fetch_blob(blob):
+    with blob.getfile() as f:
+        return io.BytesIO(f.read())
+
+
 class ChunkedFileBlobIndexWrapper:
     def __init__(self, indexes, mode=None, prefetch=False, prefetch_to=None, delete=True):
         # eager load from database incase its a queryset
         self._indexes = list(indexes)
+        self._offsets = [idx.offset for idx in self._indexes]
         self._curfile = None
         self._curidx = None
+        self._curpos = None
+        # (position, future) of the blob that is read ahead
+        self._readahead = None
         if prefetch:
             self.prefetched = True
             self._prefetch(prefetch_to, delete)
@@ -505,20 +532,48 @@ class ChunkedFileBlobIndexWrapper:
         rv.seek(0)
         return rv
 
-    def _nextidx(self):
-        assert not self.prefetched, "this makes no sense"
+    def _getblobfile(self, pos, sequential):
+        readahead, self._readahead = self._readahead, None
+        rv = None
+        if readahead is not None:
+            if readahead[0] == pos:
+                try:
+                    rv = readahead[1].result()
+                except Exception:
+                    # Retry in the foreground and raise from there.
+                    pass
+            else:
+                readahead[1].cancel()
+        if rv is None:
+            rv = self._indexes[pos].blob.getfile()
+
+        # Consumers that read across the end of a blob are likely to read the
+        # next one as well, so fetch it in the background in the meantime.
+        if sequential and pos + 1 < len(self._indexes):
+            future = _get_readahead_executor().submit(_fetch_blob, self._indexes[pos + 1].blob)
+            self._readahead = (pos + 1, future)
+
+        return rv
+
+    def _openidx(self, pos, sequential=False):
         old_file = self._curfile
         try:
-            try:
-                self._curidx = next(self._idxiter)
-                self._curfile = self._curidx.blob.getfile()
-            except StopIteration:
-                self._curidx = None
+            if pos < len(self._indexes):
+                self._curfile = self._getblobfile(pos, sequential)
+                self._curidx = self._indexes[pos]
+                self._curpos = pos
+            else:
                 self._curfile = None
+                self._curidx = None
+                self._curpos = None
         finally:
             if old_file is not None:
                 old_file.close()
 
+    def _nextidx(self):
+        assert not self.prefetched, "this makes no sense"
+        self._openidx(self._curpos + 1, sequential=True)
+
     @property
     def size(self):
         return sum(i.blob.size for i in self._indexes)
@@ -560,8 +615,12 @@ class ChunkedFileBlobIndexWrapper:
     def close(self):
         if self._curfile:
             self._curfile.close()
+        if self._readahead is not None:
+            self._readahead[1].cancel()
         self._curfile = None
         self._curidx = None
+        self._curpos = None
+        self._readahead = None
         self.closed = True
 
     def _seek(self, pos):
@@ -577,14 +636,12 @@ class ChunkedFileBlobIndexWrapper:
             # Empty file, there's no seeking to be done.
             return
 
-        for n, idx in enumerate(self._indexes[::-1]):
-            if idx.offset <= pos:
-                if idx != self._curidx:
-                    self._idxiter = iter(self._indexes[-(n + 1) :])
-                    self._nextidx()
-                break
-        else:
+        # Only the blob containing pos needs to be fetched.
+        n = bisect_right(self._offsets, pos) - 1
+        if n < 0:
             raise ValueError("Cannot seek to pos")
+        if n != self._curpos:
+            self._openidx(n)
         self._curfile.seek(pos - self._curidx.offset)
 
     def seek(self, pos, whence=io.SEEK_SET):
@@ -674,3 +731,186 @@ def clear_cached_files(cache_path):
                     os.remove(cached_file)
                 except OSError:
                     pass
+
+
+class LocalFileCache:
+    """
+    A size-bounded cache of files on the local disk that is shared by all
+    processes of a host.
+
+    Entries live at ``<cache_path>/<key>``, where keys have the form
+    ``<folder>/<name>`` so that ``clear_cached_files`` can clean them up. Every
+    hit bumps the mtime of an entry, and once the cache grows beyond
+    ``max_size`` bytes the least recently used entries are evicted.
+
+    Concurrent misses for the same entry are serialized with a file lock, so
+    only one process on the host fetches it while the others wait for the
+    result.
+    """
+
+    #: Seconds to wait for another process fetching the same entry before
+    #: fetching it anyway.
+    lock_timeout = 300
+
+    #: Minimum seconds between two evictions triggered by the same process.
+    eviction_interval = 60
+
+    #: Entries used within this many seconds are never evicted, since their
+    #: paths may just have been handed out.
+    eviction_grace_period = 60
+
+    #: Evictions shrink the cache to this fraction of ``max_size``.
+    eviction_target = 0.9
+
+    def __init__(self, name, cache_path_option, max_size_option):
+        self.name = name
+        self.cache_path_option = cache_path_option
+        self.max_size_option = max_size_option
+        self._last_eviction = 0
+
+    @property
+    def cache_path(self):
+        from sentry import options
+
+        return options.get(self.cache_path_option)
+
+    @property
+    def max_size(self):
+        from sentry import options
+
+        return options.get(self.max_size_option)
+
+    def _touch(self, path):
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    @contextmanager
+    def _lock(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(path + ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            deadline = time.monotonic() + self.lock_timeout
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    if time.monotonic() > deadline:
+                        metrics.incr(
+                            "filecache.lock_timeout", tags={"cache": self.name}, skip_internal=True
+                        )
+                        break
+                    time.sleep(0.05)
+                else:
+                    break
+            yield
+        finally:
+            # Closing the descriptor releases the lock.
+            os.close(fd)
+
+    def get_path(self, key, fetch):
+        """
+        Returns the path of the cached file for ``key``. On a miss,
+        ``fetch(path)`` is called to atomically write the file to ``path``,
+        e.g. ``File.save_to``.
+        """
+        path = os.path.join(self.cache_path, key)
+        if self._touch(path):
+            metrics.incr("filecache.hit", tags={"cache": self.name}, skip_internal=True)
+            return path
+
+        with self._lock(path):
+            if self._touch(path):
+                # Another process fetched the file while we were waiting.
+                metrics.incr("filecache.wait", tags={"cache": self.name}, skip_internal=True)
+                return path
+
+            with metrics.timer("filecache.fetch", tags={"cache": self.name}):
+                fetch(path)
+
+        metrics.incr("filecache.miss", tags={"cache": self.name}, skip_internal=True)
+
+        if self.max_size and time.time() - self._last_eviction > self.eviction_interval:
+            self.evict()
+
+        return path
+
+    def open(self, key, fetch):
+        """
+        Like ``get_path``, but returns a read-only, memory-mapped file object.
+        Mapped files stay readable even if they are evicted in the meantime.
+        """
+        path = self.get_path(key, fetch)
+        with open(path, "rb") as f:
+            try:
+                mem = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped.
+                return FileObj(io.BytesIO(), name=path)
+
+        rv = FileObj(mem, name=path)
+        # mmap objects have a ``size`` method that would shadow the file size.
+        rv.size = len(mem)
+        return rv
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache fits into its
+        size budget again.
+        """
+        self._last_eviction = time.time()
+        max_size = self.max_size
+        if not max_size:
+            return
+
+        cache_path = self.cache_path
+        try:
+            cache_folders = os.listdir(cache_path)
+        except OSError:
+            return
+
+        entries = []
+        total_size = 0
+        for cache_folder in cache_folders:
+            cache_folder = os.path.join(cache_path, cache_folder)
+            try:
+                items = os.listdir(cache_folder)
+            except OSError:
+                continue
+            for cached_file in items:
+                if cached_file.endswith(".lock"):
+                    continue
+                cached_file = os.path.join(cache_folder, cached_file)
+                try:
+                    stat = os.stat(cached_file)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, cached_file))
+                total_size += stat.st_size
+
+        metrics.timing("filecache.size", total_size, tags={"cache": self.name})
+        if total_size <= max_size:
+            return
+
+        target_size = max_size * self.eviction_target
+        cutoff = time.time() - self.eviction_grace_period
+        evicted = 0
+        for mtime, size, cached_file in sorted(entries):
+            if total_size <= target_size or mtime > cutoff:
+                break
+            try:
+                os.remove(cached_file)
+            except OSError:
+                continue
+            total_size -= size
+            evicted += 1
+
+        metrics.incr(
+            "filecache.evict", amount=evicted, tags={"cache": self.name}, skip_internal=True
+        )
+
+    def clear_old_entries(self):
+        clear_cached_files(self.cache_path)
+        self.evict()
@@ -52,6 +52,43 @@ class ProjectOptionManager(OptionManager):
                 self._option_cache[cache_key] = result
         return self._option_cache.get(cache_key, {})
 
+    def get_all_values_bulk(self, projects):
+        """
+        Loads the options of all ``projects`` into the local cache with a
+        single cache round trip and at most one database query, and returns
+        them as ``{project_id: values}``.
+        """
+        project_ids = [p.id if isinstance(p, models.Model) else p for p in projects]
+        cache_keys = {project_id: self._make_key(project_id) for project_id in project_ids}
+
+        missing = [
+            project_id
+            for project_id, cache_key in cache_keys.items()
+            if cache_key not in self._option_cache
+        ]
+        if missing:
+            cached = cache.get_many([cache_keys[project_id] for project_id in missing])
+            uncached = []
+            for project_id in missing:
+                values = cached.get(cache_keys[project_id])
+                if values is None:
+                    uncached.append(project_id)
+                else:
+                    self._option_cache[cache_keys[project_id]] = values
+
+            if uncached:
+                loaded = {project_id: {} for project_id in uncached}
+                for option in self.filter(project__in=uncached):
+                    loaded[option.project_id][option.key] = option.value
+                cache.set_many({cache_keys[pid]: values for pid, values in loaded.items()})
+                for project_id, values in loaded.items():
+                    self._option_cache[cache_keys[project_id]] = values
+
+        return {
+            project_id: self._option_cache.get(cache_key, {})
+            for project_id, cache_key in cache_keys.items()
+        }
+
     def reload_cache(self, project_id, update_reason):
         if update_reason != "projectoption.get_all_values":
             schedule_update_config_cache(
@@ -1,4 +1,7 @@
 import operator
+import threading
+from collections import OrderedDict
+from copy import deepcopy
 from functools import reduce
 
 from django.db import models
@@ -8,12 +11,23 @@ from django.utils import timezone
 
 from sentry.db.models import Model, sane_repr
 from sentry.db.models.fields import FlexibleForeignKey, JSONField
-from sentry.ownership.grammar import load_schema
+from sentry.ownership.grammar import RuleIndex
 from sentry.utils import metrics
 from sentry.utils.cache import cache
 
 READ_CACHE_DURATION = 3600
 
+# Maximum number of projects for which compiled rule indexes are kept in
+# process memory.
+RULE_INDEX_CACHE_SIZE = 1000
+
+# A project can have up to three distinct schemas: the ownership rules, the
+# CODEOWNERS rules, and their combination.
+RULE_INDEX_CACHE_SCHEMAS_PER_PROJECT = 3
+
+_rule_index_cache = OrderedDict()
+_rule_index_cache_lock = threading.Lock()
+
 
 class ProjectOwnership(Model):
     __core__ = True
@@ -183,15 +197,51 @@ class ProjectOwnership(Model):
                 assigned_by_codeowners,
             )
 
+    @classmethod
+    def get_rule_index(cls, project_id, schema):
+        """
+        Returns a ``RuleIndex`` for the given ownership schema of a project.
+
+        Indexes are cached in process memory and reused as long as the schema
+        of the project stays the same. Entries of a project are additionally
+        dropped when its ``ProjectOwnership`` is saved or deleted.
+        """
+        with _rule_index_cache_lock:
+            entries = _rule_index_cache.get(project_id)
+            if entries is not None:
+                _rule_index_cache.move_to_end(project_id)
+                for cached_schema, index in entries:
+                    if cached_schema == schema:
+                        metrics.incr("projectownership.rule_index.hit", skip_internal=True)
+                        return index
+
+        metrics.incr("projectownership.rule_index.miss", skip_internal=True)
+        index = RuleIndex.from_schema(schema)
+        # Keep a private copy, so that changes to the schema in place are
+        # still detected as a new version.
+        schema = deepcopy(schema)
+
+        with _rule_index_cache_lock:
+            entries = _rule_index_cache.setdefault(project_id, [])
+            entries.insert(0, (schema, index))
+            del entries[RULE_INDEX_CACHE_SCHEMAS_PER_PROJECT:]
+            _rule_index_cache.move_to_end(project_id)
+            while len(_rule_index_cache) > RULE_INDEX_CACHE_SIZE:
+                _rule_index_cache.popitem(last=False)
+
+        return index
+
+    @classmethod
+    def clear_rule_index(cls, project_id):
+        with _rule_index_cache_lock:
+            _rule_index_cache.pop(project_id, None)
+
     @classmethod
     def _matching_ownership_rules(cls, ownership, project_id, data):
-        rules = []
-        if ownership.schema is not None:
-            for rule in load_schema(ownership.schema):
-                if rule.test(data):
-                    rules.append(rule)
+        if ownership.schema is None:
+            return []
 
-        return rules
+        return cls.get_rule_index(project_id, ownership.schema).get_matching_rules(data)
 
 
 def resolve_actors(owners, project_id):
@@ -261,3 +311,13 @@ post_delete.connect(
     sender=ProjectOwnership,
     weak=False,
 )
+post_save.connect(
+    lambda instance, **kwargs: ProjectOwnership.clear_rule_index(instance.project_id),
+    sender=ProjectOwnership,
+    weak=False,
+)
+post_delete.connect(
+    lambda instance, **kwargs: ProjectOwnership.clear_rule_index(instance.project_id),
+    sender=ProjectOwnership,
+    weak=False,
+)
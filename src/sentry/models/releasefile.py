@@ -1,4 +1,3 @@
-import errno
 import logging
 import os
 import zipfile
@@ -9,14 +8,12 @@ from tempfile import TemporaryDirectory
 from typing import IO, Optional, Tuple
 from urllib.parse import urlsplit, urlunsplit
 
-from django.core.files.base import File as FileObj
 from django.db import models, transaction
 
 from sentry import options
 from sentry.db.models import BoundedPositiveIntegerField, FlexibleForeignKey, Model, sane_repr
-from sentry.models import clear_cached_files
 from sentry.models.distribution import Distribution
-from sentry.models.file import File
+from sentry.models.file import File, LocalFileCache
 from sentry.models.release import Release
 from sentry.utils import json, metrics
 from sentry.utils.hashlib import sha1_text
@@ -128,9 +125,14 @@ class ReleaseFile(Model):
 
 
 class ReleaseFileCache:
+    def __init__(self):
+        self.file_cache = LocalFileCache(
+            "releasefile", "releasefile.cache-path", "releasefile.cache-max-size"
+        )
+
     @property
     def cache_path(self):
-        return options.get("releasefile.cache-path")
+        return self.file_cache.cache_path
 
     def getfile(self, releasefile):
         cutoff = options.get("releasefile.cache-limit")
@@ -141,22 +143,14 @@ class ReleaseFileCache:
 
         file_id = str(releasefile.file.id)
         organization_id = str(releasefile.organization_id)
-        file_path = os.path.join(self.cache_path, organization_id, file_id)
 
-        hit = True
-        try:
-            os.stat(file_path)
-        except OSError as e:
-            if e.errno != errno.ENOENT:
-                raise
-            releasefile.file.save_to(file_path)
-            hit = False
-
-        metrics.timing("release_file.cache.get.size", file_size, tags={"hit": hit, "cutoff": False})
-        return FileObj(open(file_path, "rb"))
+        metrics.timing("release_file.cache.get.size", file_size, tags={"cutoff": False})
+        return self.file_cache.open(
+            os.path.join(organization_id, file_id), releasefile.file.save_to
+        )
 
     def clear_old_entries(self):
-        clear_cached_files(self.cache_path)
+        self.file_cache.clear_old_entries()
 
 
 ReleaseFile.cache = ReleaseFileCache()
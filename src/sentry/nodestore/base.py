@@ -3,6 +3,7 @@ from threading import local
 import sentry_sdk
 from django.core.cache import InvalidCacheBackendError, caches
 
+from sentry.nodestore.local_cache import get_local_cache
 from sentry.utils import json
 from sentry.utils.cache import memoize
 from sentry.utils.services import Service
@@ -65,6 +66,7 @@ class NodeStorage(local, Service):
         "get_multi",
         "set",
         "set_subkeys",
+        "set_subkeys_multi",
         "cleanup",
         "validate",
         "bootstrap",
@@ -133,7 +135,10 @@ class NodeStorage(local, Service):
                     return item_from_cache
 
             span.set_tag("subkey", str(subkey))
-            bytes_data = self._get_bytes(id)
+            if self.local_cache is not None:
+                bytes_data = self._get_local_bytes_multi([id]).get(id)
+            else:
+                bytes_data = self._get_bytes(id)
             rv = self._decode(bytes_data, subkey=subkey)
             if subkey is None:
                 # set cache item only after we know decoding did not fail
@@ -156,6 +161,15 @@ class NodeStorage(local, Service):
         """
         return {id: self._get_bytes(id) for id in id_list}
 
+    def _get_local_bytes_multi(self, id_list):
+        """
+        Like ``_get_bytes_multi``, but served from the process-local cache
+        if it is enabled.
+        """
+        if self.local_cache is None:
+            return self._get_bytes_multi(id_list)
+        return self.local_cache.get_many(id_list, self._get_bytes_multi)
+
     def get_multi(self, id_list, subkey=None):
         """
         >>> nodestore.get_multi(['key1', 'key2')
@@ -180,7 +194,7 @@ class NodeStorage(local, Service):
 
             items = {
                 id: self._decode(value, subkey=subkey)
-                for id, value in self._get_bytes_multi(uncached_ids).items()
+                for id, value in self._get_local_bytes_multi(uncached_ids).items()
             }
             if subkey is None:
                 self._set_cache_items(items)
@@ -242,6 +256,40 @@ class NodeStorage(local, Service):
             self._set_bytes(id, bytes_data, ttl=ttl)
             # set cache only after encoding and write to nodestore has succeeded
             self._set_cache_item(id, cache_item)
+            self._set_local_cache_items({id: bytes_data})
+
+    def _set_bytes_multi(self, items, ttl=None):
+        """
+        >>> nodestore._set_bytes_multi({
+        ...    'key1': b"{'foo': 'bar'}",
+        ...    'key2': b"{'foo': 'baz'}",
+        ... })
+        """
+        for id, data in items.items():
+            self._set_bytes(id, data, ttl=ttl)
+
+    def set_subkeys_multi(self, items, ttl=None):
+        """
+        Set values and subkeys for multiple ids at once. Backends that support
+        batched writes persist all items with a single request.
+
+        Note: This is not guaranteed to be atomic and may result in a partial
+        write.
+
+        >>> nodestore.set_subkeys_multi({
+        ...    'key1': {None: {'foo': 'bar'}, "unprocessed": {'foo': 'bam'}},
+        ...    'key2': {None: {'foo': 'baz'}},
+        ... })
+        """
+        with sentry_sdk.start_span(op="nodestore.set_subkeys_multi") as span:
+            span.set_tag("num_ids", len(items))
+
+            cache_items = {id: data.get(None) for id, data in items.items()}
+            bytes_data = {id: self._encode(data) for id, data in items.items()}
+            self._set_bytes_multi(bytes_data, ttl=ttl)
+            # set cache only after encoding and write to nodestore has succeeded
+            self._set_cache_items({id: data for id, data in cache_items.items() if data})
+            self._set_local_cache_items(bytes_data)
 
     def cleanup(self, cutoff_timestamp):
         raise NotImplementedError
@@ -269,10 +317,22 @@ class NodeStorage(local, Service):
     def _delete_cache_item(self, id):
         if self.cache:
             self.cache.delete(id)
+        if self.local_cache is not None:
+            self.local_cache.delete_many([id])
 
     def _delete_cache_items(self, id_list):
         if self.cache:
             self.cache.delete_many([id for id in id_list])
+        if self.local_cache is not None:
+            self.local_cache.delete_many(id_list)
+
+    def _set_local_cache_items(self, items):
+        if self.local_cache is not None:
+            self.local_cache.set_many(items)
+
+    @memoize
+    def local_cache(self):
+        return get_local_cache()
 
     @memoize
     def cache(self):
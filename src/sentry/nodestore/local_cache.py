@@ -0,0 +1,182 @@
+import threading
+from collections import OrderedDict
+from time import time
+
+from django.conf import settings
+
+from sentry.utils import metrics
+
+_local_cache = None
+_local_cache_lock = threading.Lock()
+
+
+def get_local_cache():
+    """
+    Returns the process-wide ``LocalNodeCache`` configured through
+    ``SENTRY_NODESTORE_LOCAL_CACHE_SIZE``, or ``None`` if it is disabled.
+    """
+    global _local_cache
+
+    max_size = settings.SENTRY_NODESTORE_LOCAL_CACHE_SIZE
+    if not max_size:
+        return None
+
+    with _local_cache_lock:
+        if _local_cache is None:
+            _local_cache = LocalNodeCache(
+                max_size=max_size, ttl=settings.SENTRY_NODESTORE_LOCAL_CACHE_TTL
+            )
+        return _local_cache
+
+
+class _Fetch:
+    """
+    A backend request for some node ids that other threads can wait on.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+    def resolve(self, result):
+        self.result = result
+        self.done.set()
+
+    def wait(self):
+        self.done.wait()
+        return self.result
+
+
+class LocalNodeCache:
+    """
+    A bounded in-process LRU cache for raw nodestore payloads that is shared by
+    all threads of a process.
+
+    The cache is bounded by the total size of the cached payloads
+    (``max_size`` bytes) and entries expire after ``ttl`` seconds, since nodes
+    can be rewritten by other processes (e.g. by reprocessing).
+
+    Concurrent requests for the same ids are de-duplicated: while one thread
+    fetches an id from the backend, other threads asking for it wait for that
+    result instead of issuing their own request.
+    """
+
+    def __init__(self, max_size, ttl=None):
+        assert max_size > 0
+        self.max_size = max_size
+        self.ttl = ttl
+        self.size = 0
+        self._items = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def _get(self, id, now):
+        item = self._items.get(id)
+        if item is None:
+            return None
+
+        expires, value = item
+        if expires is not None and expires < now:
+            self._pop(id)
+            return None
+
+        self._items.move_to_end(id)
+        return value
+
+    def _pop(self, id):
+        item = self._items.pop(id, None)
+        if item is not None:
+            self.size -= len(item[1])
+
+    def _set(self, id, value, now):
+        self._pop(id)
+        if len(value) > self.max_size:
+            return
+
+        expires = now + self.ttl if self.ttl else None
+        self._items[id] = (expires, value)
+        self.size += len(value)
+        while self.size > self.max_size:
+            _, (_, evicted) = self._items.popitem(last=False)
+            self.size -= len(evicted)
+
+    def set_many(self, items):
+        with self._lock:
+            now = time()
+            for id, value in items.items():
+                # Any fetch that is in flight might return an outdated value.
+                self._inflight.pop(id, None)
+                if value is not None:
+                    self._set(id, value, now)
+                else:
+                    self._pop(id)
+
+    def delete_many(self, id_list):
+        with self._lock:
+            for id in id_list:
+                self._inflight.pop(id, None)
+                self._pop(id)
+
+    def get_many(self, id_list, fetch):
+        """
+        Returns ``{id: bytes}`` for all ``id_list``, calling ``fetch`` with the
+        list of ids that are neither cached nor already being fetched by
+        another thread.
+        """
+        rv = {}
+        waiting = {}
+        missing = []
+
+        with self._lock:
+            now = time()
+            for id in id_list:
+                value = self._get(id, now)
+                if value is not None:
+                    rv[id] = value
+                elif id in self._inflight:
+                    waiting[id] = self._inflight[id]
+                elif id not in missing:
+                    missing.append(id)
+
+            if missing:
+                own_fetch = _Fetch()
+                for id in missing:
+                    self._inflight[id] = own_fetch
+
+        metrics.incr("nodestore.local_cache.hit", amount=len(rv), skip_internal=True)
+        metrics.incr("nodestore.local_cache.wait", amount=len(waiting), skip_internal=True)
+        metrics.incr("nodestore.local_cache.miss", amount=len(missing), skip_internal=True)
+
+        if missing:
+            result = None
+            try:
+                result = fetch(missing)
+            finally:
+                with self._lock:
+                    now = time()
+                    for id in missing:
+                        # Ids that were written or deleted in the meantime
+                        # are no longer registered to this fetch.
+                        if self._inflight.get(id) is not own_fetch:
+                            continue
+                        del self._inflight[id]
+                        if result is not None and result.get(id) is not None:
+                            self._set(id, result[id], now)
+                # Waiting threads fetch themselves if this request failed.
+                own_fetch.resolve(result)
+            rv.update(result)
+
+        retry = []
+        for id, other_fetch in waiting.items():
+            result = other_fetch.wait()
+            if result is None:
+                retry.append(id)
+            elif id in result:
+                rv[id] = result[id]
+        if retry:
+            rv.update(fetch(retry))
+
+        return rv
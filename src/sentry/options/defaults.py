@@ -51,6 +51,9 @@ register(
     flags=FLAG_PRIORITIZE_DISK,
 )
 register("releasefile.cache-limit", type=Int, default=10 * 1024 * 1024, flags=FLAG_PRIORITIZE_DISK)
+# Size budgets of the caches above in bytes, 0 means unbounded
+register("dsym.cache-max-size", type=Int, default=0, flags=FLAG_PRIORITIZE_DISK)
+register("releasefile.cache-max-size", type=Int, default=0, flags=FLAG_PRIORITIZE_DISK)
 
 # Mail
 register("mail.backend", default="smtp", flags=FLAG_NOSTORE)
@@ -207,6 +210,17 @@ register("snuba.search.max-chunk-size", default=2000)
 register("snuba.search.max-total-chunk-time-seconds", default=30.0)
 register("snuba.search.hits-sample-size", default=100)
 register("snuba.track-outcomes-sample-rate", default=0.0)
+
+# Snuba query cache: TTLs in seconds of cached results by referrer, falling back
+# to SENTRY_SNUBA_CACHE_TTL_SECONDS.
+register("snuba.query-cache.referrer-ttls", type=Dict, default={})
+# Number of seconds that expired results are still served while they are
+# refreshed in the background. A value of 0 disables serving stale results.
+register("snuba.query-cache.stale-seconds", default=0)
+# Maximum number of seconds to wait for the result of an identical query that is
+# already running instead of sending it again. A value of 0 disables waiting.
+register("snuba.query-cache.single-flight-timeout", default=0.0)
+
 register("snuba.snql.referrer-rate", default=0.0)
 register("snuba.snql.snql_only", default=0.0)
 
@@ -337,6 +351,14 @@ register("store.load-shed-process-event-projects", type=Any, default=[])
 # Killswitch for dropping events in symbolicate_event
 register("store.load-shed-symbolicate-event-projects", type=Any, default=[])
 
+# Maximum number of error events of one project that the ingest consumer saves
+# with a single save_event_batch task. A value of 1 disables batching.
+register("store.save-event-batch-size", default=1)
+
+# Number of time slices that Discover exports of raw (non-aggregated) rows are
+# split into and fetched from concurrently. A value of 1 disables slicing.
+register("data-export.discover-time-slices", default=1)
+
 # Store release files bundled as zip files
 register("processing.save-release-archives", default=False)
 
@@ -347,5 +369,37 @@ register("processing.release-archive-min-files", default=10)
 # Try to read release artifacts from zip archives
 register("processing.use-release-archives-sample-rate", default=0.0)
 
+# Number of source files and source maps of a JavaScript event that are fetched
+# concurrently. A value of 1 fetches them one after another.
+register("processing.javascript-fetch-concurrency", default=1)
+
+# Number of shards that the groups of a deleted project are deleted in. Each
+# shard is deleted by its own task. A value of 1 deletes them one after another.
+register("deletions.project.group-shards", default=1)
+
+# Seconds that a task deleting a shard of groups runs before rescheduling itself.
+register("deletions.project.group-shard-time-budget", default=300)
+
+# Seconds that an unmerge task processes batches of events before rescheduling
+# itself. A value of 0 processes a single batch per task.
+register("unmerge.time-budget", default=0)
+
+# How paginators count the hits of list endpoints, up to their maximum number
+# of hits: "exact" counts them, "estimate" uses the query planner's estimate
+# to skip counting if there are clearly more than the maximum.
+register("api.paginator.count-hits-strategy", default="exact")
+
+# The "estimate" strategy skips counting if the planner estimates at least this
+# many times the maximum number of hits.
+register("api.paginator.count-hits-estimate-factor", default=2.0)
+
+# Seconds that hit counts of paginated list endpoints are cached for. A value
+# of 0 disables caching.
+register("api.paginator.count-hits-cache-ttl", default=0)
+
+# Number of ready digests that are delivered by one task. A value of 1 delivers
+# every digest with its own task.
+register("digests.delivery-batch-size", default=1)
+
 # All Relay options (statically authenticated Relays can be registered here)
 register("relay.static_auth", default={}, flags=FLAG_NOSTORE)
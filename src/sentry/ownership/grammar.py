@@ -5,10 +5,10 @@ from typing import List, Tuple
 from parsimonious.exceptions import ParseError  # noqa
 from parsimonious.grammar import Grammar, NodeVisitor
 
-from sentry.utils.glob import glob_match
+from sentry.utils.glob import GLOB_CHARACTERS, glob_match
 from sentry.utils.safe import get_path
 
-__all__ = ("parse_rules", "dump_schema", "load_schema")
+__all__ = ("parse_rules", "dump_schema", "load_schema", "RuleIndex")
 
 VERSION = 1
 
@@ -219,6 +219,153 @@ def _iter_frames(data):
             continue
 
 
+class _PatternTrie:
+    """
+    A character trie over literal pattern affixes, used to find all patterns
+    whose affix a value starts with.
+    """
+
+    def __init__(self):
+        self.root = {}
+
+    def add(self, key, item):
+        node = self.root
+        for char in key:
+            node = node.setdefault(char, {})
+        node.setdefault(None, []).append(item)
+
+    def find(self, value, rv):
+        node = self.root
+        for char in value:
+            node = node.get(char)
+            if node is None:
+                return
+            rv.update(node.get(None, ()))
+
+
+_GLOB_SPECIAL_CHARACTERS = GLOB_CHARACTERS - {"*"}
+
+
+class _GlobIndex:
+    """
+    Narrows down which glob patterns can possibly match a value.
+
+    Patterns are bucketed by their literal prefix, or their literal suffix if
+    they start with a wildcard, so finding the candidates for a value only
+    depends on the length of the value and not on the number of patterns.
+    This is a conservative pre-filter, candidates still have to be tested with
+    ``glob_match``.
+    """
+
+    def __init__(self, ignorecase=False, path_normalize=False):
+        self.ignorecase = ignorecase
+        self.path_normalize = path_normalize
+        self.exact = {}
+        self.prefixes = _PatternTrie()
+        self.suffixes = _PatternTrie()
+        self.always = []
+
+    def normalize(self, value):
+        if self.path_normalize:
+            value = value.replace("\\", "/")
+        if self.ignorecase:
+            value = value.casefold()
+        return value
+
+    def add(self, pattern, item):
+        # Only ``*`` wildcards are understood here. Case folding rules for
+        # non-ascii characters may differ from the ones used by
+        # ``glob_match``, so these patterns are never filtered either.
+        if _GLOB_SPECIAL_CHARACTERS.intersection(pattern) or (
+            self.ignorecase and not pattern.isascii()
+        ):
+            self.always.append(item)
+            return
+
+        pattern = self.normalize(pattern)
+        if "*" not in pattern:
+            self.exact.setdefault(pattern, []).append(item)
+            return
+
+        prefix, _, rest = pattern.partition("*")
+        suffix = rest.rpartition("*")[2]
+        if prefix:
+            self.prefixes.add(prefix, item)
+        elif suffix:
+            self.suffixes.add(suffix[::-1], item)
+        else:
+            self.always.append(item)
+
+    def find(self, value, rv):
+        value = self.normalize(value)
+        rv.update(self.exact.get(value, ()))
+        self.prefixes.find(value, rv)
+        self.suffixes.find(value[::-1], rv)
+        rv.update(self.always)
+
+
+class RuleIndex:
+    """
+    An index over a list of rules that finds the rules matching an event
+    without testing each of them.
+
+    Building the index is comparatively expensive, so it should be reused for
+    as long as the rules do not change.
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.url = _GlobIndex(ignorecase=True)
+        self.path = _GlobIndex(ignorecase=True, path_normalize=True)
+        self.module = _GlobIndex(ignorecase=True, path_normalize=True)
+        self.tags = {}
+
+        for i, rule in enumerate(rules):
+            type, pattern = rule.matcher
+            if type == "url":
+                self.url.add(pattern, i)
+            elif type == "path":
+                self.path.add(pattern, i)
+            elif type == "module":
+                self.module.add(pattern, i)
+            elif type.startswith("tags."):
+                self.tags.setdefault(type[5:], _GlobIndex()).add(pattern, i)
+
+    @classmethod
+    def from_schema(cls, schema):
+        return cls(load_schema(schema))
+
+    def get_matching_rules(self, data):
+        """Returns all rules matching the event ``data`` in their original order"""
+        candidates = set()
+
+        url = get_path(data, "request", "url")
+        if url:
+            self.url.find(url, candidates)
+
+        paths = set()
+        modules = set()
+        for frame in _iter_frames(data):
+            path = frame.get("filename") or frame.get("abs_path")
+            if path:
+                paths.add(path)
+            module = frame.get("module")
+            if module:
+                modules.add(module)
+        for path in paths:
+            self.path.find(path, candidates)
+        for module in modules:
+            self.module.find(module, candidates)
+
+        if self.tags:
+            for tag in get_path(data, "tags", filter=True) or ():
+                index = self.tags.get(tag[0])
+                if index is not None:
+                    index.find(tag[1] or "", candidates)
+
+        return [self.rules[i] for i in sorted(candidates) if self.rules[i].test(data)]
+
+
 def parse_rules(data):
     """Convert a raw text input into a Rule tree"""
     tree = ownership_grammar.parse(data)
@@ -205,6 +205,7 @@ class Quota(Service):
         "get_organization_quota",
         "get_project_quota",
         "is_rate_limited",
+        "is_rate_limited_many",
         "validate",
         "refund",
         "get_event_retention",
@@ -261,6 +262,27 @@ class Quota(Service):
         """
         return NotRateLimited()
 
+    def is_rate_limited_many(self, items, timestamp=None):
+        """
+        Checks and records consumption of quotas for many items at once, like
+        ``is_rate_limited`` does for a single item.
+
+        Items are checked in order, so that consumption of accepted items is
+        counted against the quotas of all items that follow. Backends may
+        check all items with a single request to their storage.
+
+        The return value is a list with a ``RateLimit`` for every item.
+
+        :param items:     A list of ``(project, key, category, quantity)``
+                          tuples. ``key`` may be ``None`` to only check
+                          project and organization quotas, ``category``
+                          defaults to ``DataCategory.ERROR`` and ``quantity``
+                          defaults to ``1``.
+        :param timestamp: The time at which the items are ingested. Defaults
+                          to now.
+        """
+        return [self.is_rate_limited(project, key=key) for project, key, _, _ in items]
+
     def refund(self, project, key=None, timestamp=None, category=None, quantity=None):
         """
         Signals event rejection after ``quotas.is_rate_limited`` has been called
@@ -1,4 +1,5 @@
 import functools
+from collections import defaultdict
 from time import time
 
 from sentry.constants import DataCategory
@@ -11,6 +12,7 @@ from sentry.utils.redis import (
 )
 
 is_rate_limited = load_script("quotas/is_rate_limited.lua")
+is_rate_limited_many = load_script("quotas/is_rate_limited_many.lua")
 
 
 class RedisQuota(Quota):
@@ -211,6 +213,95 @@ class RedisQuota(Quota):
         if not quotas:
             return NotRateLimited()
 
+        rate_limited, keys, args = self.__get_rate_limit_args(
+            quotas, timestamp, project.organization_id
+        )
+        if rate_limited is not None:
+            return rate_limited
+
+        if not keys or not args:
+            return NotRateLimited()
+
+        client = self.__get_redis_client(str(project.organization_id))
+        rejections = is_rate_limited(client, keys, args)
+
+        return self.__get_rate_limit_result(quotas, rejections, timestamp, project.organization_id)
+
+    def is_rate_limited_many(self, items, timestamp=None):
+        if timestamp is None:
+            timestamp = time()
+
+        quotas_cache = {}
+        results = [None] * len(items)
+
+        # Items are checked with one script invocation per Redis node (or per
+        # organization on Redis Cluster, where keys are slotted by
+        # organization).
+        batches = defaultdict(list)
+        for index, (project, key, category, quantity) in enumerate(items):
+            if category is None:
+                category = DataCategory.ERROR
+            if quantity is None:
+                quantity = 1
+
+            cache_key = (project.id, key.id if key else None)
+            if cache_key not in quotas_cache:
+                quotas_cache[cache_key] = self.get_quotas(project, key=key)
+
+            quotas = [
+                q for q in quotas_cache[cache_key] if not q.categories or category in q.categories
+            ]
+
+            rate_limited, keys, args = self.__get_rate_limit_args(
+                quotas, timestamp, project.organization_id
+            )
+            if rate_limited is not None:
+                results[index] = rate_limited
+            elif not keys:
+                results[index] = NotRateLimited()
+            else:
+                batches[self.__get_routing_id(str(project.organization_id))].append(
+                    (index, project.organization_id, quotas, quantity, keys, args)
+                )
+
+        for routing_id, batch in batches.items():
+            keys = []
+            args = []
+            for _, _, quotas, quantity, item_keys, item_args in batch:
+                keys.extend(item_keys)
+                args.extend((quantity, len(quotas)))
+                args.extend(item_args)
+
+            client = self.__get_redis_client_for_routing_id(routing_id)
+            rejections = is_rate_limited_many(client, keys, args)
+
+            for (index, organization_id, quotas, _, _, _), item_rejections in zip(
+                batch, rejections
+            ):
+                results[index] = self.__get_rate_limit_result(
+                    quotas, item_rejections, timestamp, organization_id
+                )
+
+        return results
+
+    def __get_routing_id(self, routing_key):
+        if self.is_redis_cluster:
+            return routing_key
+        else:
+            return self.cluster.get_router().get_host_for_key(routing_key)
+
+    def __get_redis_client_for_routing_id(self, routing_id):
+        if self.is_redis_cluster:
+            return self.cluster
+        else:
+            return self.cluster.get_local_client(routing_id)
+
+    def __get_rate_limit_args(self, quotas, timestamp, organization_id):
+        """
+        Returns the ``KEYS`` and ``ARGV`` to check ``quotas`` with the
+        ``is_rate_limited`` script, or a ``RateLimited`` if a quota rejects all
+        data without a trip to Redis.
+        """
         keys = []
         args = []
         for quota in quotas:
@@ -221,12 +312,12 @@ class RedisQuota(Quota):
                 # as well).
                 assert quota.window is None
                 assert not quota.should_track
-                return RateLimited(retry_after=None, reason_code=quota.reason_code)
+                return RateLimited(retry_after=None, reason_code=quota.reason_code), None, None
 
             assert quota.should_track
 
-            shift = project.organization_id % quota.window
-            key = self.__get_redis_key(quota, timestamp, shift, project.organization_id)
+            shift = organization_id % quota.window
+            key = self.__get_redis_key(quota, timestamp, shift, organization_id)
             return_key = self.get_refunded_quota_key(key)
             keys.extend((key, return_key))
             expiry = self.get_next_period_start(quota.window, shift, timestamp) + self.grace
@@ -235,12 +326,9 @@ class RedisQuota(Quota):
             lua_quota = quota.limit if quota.limit is not None else -1
             args.extend((lua_quota, int(expiry)))
 
-        if not keys or not args:
-            return NotRateLimited()
-
-        client = self.__get_redis_client(str(project.organization_id))
-        rejections = is_rate_limited(client, keys, args)
+        return None, keys, args
 
+    def __get_rate_limit_result(self, quotas, rejections, timestamp, organization_id):
         if not any(rejections):
             return NotRateLimited()
 
@@ -249,7 +337,7 @@ class RedisQuota(Quota):
             if not rejected:
                 continue
 
-            shift = project.organization_id % quota.window
+            shift = organization_id % quota.window
             delay = self.get_next_period_start(quota.window, shift, timestamp) - timestamp
             if delay > worst_case[0]:
                 worst_case = (delay, quota.reason_code)
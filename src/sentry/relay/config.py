@@ -16,7 +16,7 @@ from sentry.ingest.inbound_filters import (
     get_filter_key,
 )
 from sentry.interfaces.security import DEFAULT_DISALLOWED_SOURCES
-from sentry.models import Project, ProjectKeyStatus
+from sentry.models import OrganizationOption, Project, ProjectKeyStatus, ProjectOption
 from sentry.relay.utils import to_camel_case_name
 from sentry.utils.http import get_origins
 from sentry.utils.sdk import configure_scope
@@ -26,23 +26,77 @@ EXPOSABLE_FEATURES = [
     "organizations:metrics-extraction",
 ]
 
+#: These features are checked while building the project config
+CONFIG_FEATURES = EXPOSABLE_FEATURES + [
+    "organizations:filters-and-sampling",
+    "organizations:performance-ops-breakdown",
+    "projects:custom-inbound-filters",
+]
+
+
+def _has_feature(feature, project, org_context=None):
+    if org_context is not None:
+        return feature in org_context["features"].get(project.id, ())
+
+    if feature.startswith("organizations:"):
+        return features.has(feature, project.organization)
 
-def get_exposed_features(project: Project) -> List[str]:
+    elif feature.startswith("projects:"):
+        return features.has(feature, project)
+
+    else:
+        raise RuntimeError("Features must start with 'organizations:' or 'projects:'")
+
+
+def get_exposed_features(project: Project, org_context=None) -> List[str]:
 
     active_features = []
     for feature in EXPOSABLE_FEATURES:
-        if feature.startswith("organizations:"):
-            if features.has(feature, project.organization):
-                active_features.append(feature)
+        if _has_feature(feature, project, org_context):
+            active_features.append(feature)
 
-        elif feature.startswith("projects:"):
-            if features.has(feature, project):
-                active_features.append(feature)
+    return active_features
+
+
+def get_organization_context(organization, projects):
+    """
+    Computes the organization-scoped inputs of the project configs for all
+    ``projects`` of ``organization`` at once. The result can be passed to
+    ``get_project_config`` as ``org_context`` to avoid recomputing them for
+    every project and project key.
+
+    This also binds ``organization`` to the projects and loads all their
+    options in bulk.
+    """
+    for project in projects:
+        # Try to prevent organization from being fetched again in quotas.
+        project.organization = organization
+        project._organization_cache = organization
+
+    OrganizationOption.objects.get_all_values(organization)
+    ProjectOption.objects.get_all_values_bulk(projects)
 
+    organization_features = set()
+    project_features = {project.id: set() for project in projects}
+    for feature in CONFIG_FEATURES:
+        if feature.startswith("organizations:"):
+            if features.has(feature, organization):
+                organization_features.add(feature)
+        elif feature.startswith("projects:"):
+            for project in projects:
+                if features.has(feature, project):
+                    project_features[project.id].add(feature)
         else:
-            raise RuntimeError("EXPOSABLE_FEATURES must start with 'organizations:' or 'projects:'")
+            raise RuntimeError("CONFIG_FEATURES must start with 'organizations:' or 'projects:'")
 
-    return active_features
+    return {
+        "features": {
+            project_id: active_features | organization_features
+            for project_id, active_features in project_features.items()
+        },
+        "trustedRelays": get_trusted_relays(organization),
+        "eventRetention": quotas.get_event_retention(organization),
+    }
 
 
 def get_project_key_config(project_key):
@@ -70,7 +124,11 @@ def get_public_key_configs(project, full_config, project_keys=None):
     return public_keys
 
 
-def get_filter_settings(project):
+def get_trusted_relays(organization):
+    return [r["public_key"] for r in organization.get_option("sentry:trusted-relays", []) if r]
+
+
+def get_filter_settings(project, org_context=None):
     filter_settings = {}
 
     for flt in get_all_filter_specs():
@@ -78,7 +136,7 @@ def get_filter_settings(project):
         settings = _load_filter_settings(flt, project)
         filter_settings[filter_id] = settings
 
-    if features.has("projects:custom-inbound-filters", project):
+    if _has_feature("projects:custom-inbound-filters", project, org_context):
         invalid_releases = project.get_option(f"sentry:{FilterTypes.RELEASES}")
         if invalid_releases:
             filter_settings["releases"] = {"releases": invalid_releases}
@@ -105,7 +163,7 @@ def get_quotas(project, keys=None):
     return [quota.to_json() for quota in quotas.get_quotas(project, keys=keys)]
 
 
-def get_project_config(project, full_config=True, project_keys=None):
+def get_project_config(project, full_config=True, project_keys=None, org_context=None):
     """
     Constructs the ProjectConfig information.
 
@@ -119,6 +177,9 @@ def get_project_config(project, full_config=True, project_keys=None):
         no project keys are provided it is assumed that the config does not
         need to contain auth information (this is the case when used in
         python's StoreView)
+    :param org_context: Organization-scoped inputs as returned by
+        ``get_organization_context``. If omitted, they are computed for this
+        project only.
 
     :return: a ProjectConfig object for the given project
     """
@@ -141,21 +202,20 @@ def get_project_config(project, full_config=True, project_keys=None):
             "publicKeys": public_keys,
             "config": {
                 "allowedDomains": list(get_origins(project)),
-                "trustedRelays": [
-                    r["public_key"]
-                    for r in project.organization.get_option("sentry:trusted-relays", [])
-                    if r
-                ],
+                "trustedRelays": (
+                    org_context["trustedRelays"]
+                    if org_context is not None
+                    else get_trusted_relays(project.organization)
+                ),
                 "piiConfig": get_pii_config(project),
                 "datascrubbingSettings": get_datascrubbing_settings(project),
-                "features": get_exposed_features(project),
+                "features": get_exposed_features(project, org_context),
             },
             "organizationId": project.organization_id,
             "projectId": project.id,  # XXX: Unused by Relay, required by Python store
         }
-    allow_dynamic_sampling = features.has(
-        "organizations:filters-and-sampling",
-        project.organization,
+    allow_dynamic_sampling = _has_feature(
+        "organizations:filters-and-sampling", project, org_context
     )
     if allow_dynamic_sampling:
         dynamic_sampling = project.get_option("sentry:dynamic_sampling")
@@ -166,20 +226,69 @@ def get_project_config(project, full_config=True, project_keys=None):
         # This is all we need for external Relay processors
         return ProjectConfig(project, **cfg)
 
-    if features.has("organizations:performance-ops-breakdown", project.organization):
+    if _has_feature("organizations:performance-ops-breakdown", project, org_context):
         cfg["config"]["breakdownsV2"] = project.get_option("sentry:breakdowns")
     with Hub.current.start_span(op="get_filter_settings"):
-        cfg["config"]["filterSettings"] = get_filter_settings(project)
+        cfg["config"]["filterSettings"] = get_filter_settings(project, org_context)
     with Hub.current.start_span(op="get_grouping_config_dict_for_project"):
         cfg["config"]["groupingConfig"] = get_grouping_config_dict_for_project(project)
     with Hub.current.start_span(op="get_event_retention"):
-        cfg["config"]["eventRetention"] = quotas.get_event_retention(project.organization)
+        if org_context is not None:
+            cfg["config"]["eventRetention"] = org_context["eventRetention"]
+        else:
+            cfg["config"]["eventRetention"] = quotas.get_event_retention(project.organization)
     with Hub.current.start_span(op="get_all_quotas"):
         cfg["config"]["quotas"] = get_quotas(project, keys=project_keys)
 
     return ProjectConfig(project, **cfg)
 
 
+def get_project_key_config_dict(project, project_config, project_key):
+    """
+    Derives the full config of a single active ``project_key`` from the full
+    config dict of its project, which must have been generated with all
+    project keys (including ``project_key``). Only the quotas are recomputed.
+    """
+    if project_config.get("disabled"):
+        return project_config
+
+    cfg = dict(project_config)
+    cfg["publicKeys"] = [
+        key for key in project_config["publicKeys"] if key["publicKey"] == project_key.public_key
+    ]
+    cfg["config"] = dict(project_config["config"])
+    with Hub.current.start_span(op="get_all_quotas"):
+        cfg["config"]["quotas"] = get_quotas(project, keys=[project_key])
+    return cfg
+
+
+def get_project_configs_for_organization(organization, projects, project_keys):
+    """
+    Generates the full configs of all ``projects`` of ``organization`` and of
+    their active project keys, computing organization-scoped parts only once.
+
+    :param project_keys: A mapping of project ids to all their project keys.
+    :return: A dict mapping project ids and public keys to config dicts, as
+        stored in the project config cache.
+    """
+    org_context = get_organization_context(organization, projects)
+
+    configs = {}
+    for project in projects:
+        keys = project_keys.get(project.id) or []
+        project_config = get_project_config(
+            project, full_config=True, project_keys=keys, org_context=org_context
+        ).to_dict()
+        configs[project.id] = project_config
+
+        for key in keys:
+            if key.status != ProjectKeyStatus.ACTIVE:
+                continue
+            configs[key.public_key] = get_project_key_config_dict(project, project_config, key)
+
+    return configs
+
+
 class _ConfigBase:
     """
     Base class for configuration objects
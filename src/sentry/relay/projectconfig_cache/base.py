@@ -2,7 +2,7 @@ from sentry.utils.services import Service
 
 
 class ProjectConfigCache(Service):
-    __all__ = ("set_many", "delete_many", "get")
+    __all__ = ("set_many", "delete_many", "get", "get_many")
 
     def __init__(self, **options):
         pass
@@ -15,3 +15,10 @@ class ProjectConfigCache(Service):
 
     def get(self, project_id):
         raise NotImplementedError()
+
+    def get_many(self, project_ids):
+        """
+        Returns ``{project_id: config}`` for all ``project_ids``, where the
+        config is ``None`` if it is not cached.
+        """
+        raise NotImplementedError()
@@ -24,29 +24,43 @@ class RedisProjectConfigCache(ProjectConfigCache):
         else:
             return self.cluster.get_local_client_for_key(routing_key)
 
-    def set_many(self, configs):
-        for project_id, config in configs.items():
-            # XXX(markus): Figure out how to do pipelining here. We may have
-            # multiple routing keys (-> multiple clients).
-            #
-            # We cannot route by org, because Relay does not know the org when
-            # fetching.
+    def __get_redis_clients(self, keys):
+        """
+        Groups ``keys`` by the client that serves them so that each client can
+        be sent a single pipeline.
+        """
+        if self.is_redis_cluster:
+            return [(self.cluster, keys)]
 
-            key = self.__get_redis_key(project_id)
-            client = self.__get_redis_client(key)
-            client.setex(key, REDIS_CACHE_TIMEOUT, json.dumps(config))
+        router = self.cluster.get_router()
+        keys_by_host = {}
+        for key in keys:
+            keys_by_host.setdefault(router.get_host_for_key(key), []).append(key)
 
-    def delete_many(self, project_ids):
-        for project_id in project_ids:
-            # XXX(markus): Figure out how to do pipelining here. We may have
-            # multiple routing keys (-> multiple clients).
-            #
-            # We cannot route by org, because Relay does not know the org when
-            # fetching.
+        return [
+            (self.cluster.get_local_client(host), host_keys)
+            for host, host_keys in keys_by_host.items()
+        ]
 
-            key = self.__get_redis_key(project_id)
-            client = self.__get_redis_client(key)
-            client.delete(key)
+    def set_many(self, configs):
+        # We cannot route by org, because Relay does not know the org when
+        # fetching.
+        values = {
+            self.__get_redis_key(project_id): config for project_id, config in configs.items()
+        }
+        for client, keys in self.__get_redis_clients(list(values)):
+            pipeline = client.pipeline(transaction=False)
+            for key in keys:
+                pipeline.setex(key, REDIS_CACHE_TIMEOUT, json.dumps(values[key]))
+            pipeline.execute()
+
+    def delete_many(self, project_ids):
+        keys = [self.__get_redis_key(project_id) for project_id in project_ids]
+        for client, client_keys in self.__get_redis_clients(keys):
+            pipeline = client.pipeline(transaction=False)
+            for key in client_keys:
+                pipeline.delete(key)
+            pipeline.execute()
 
     def get(self, project_id):
         key = self.__get_redis_key(project_id)
@@ -55,3 +69,15 @@ class RedisProjectConfigCache(ProjectConfigCache):
         if rv is not None:
             return json.loads(rv)
         return None
+
+    def get_many(self, project_ids):
+        keys = {self.__get_redis_key(project_id): project_id for project_id in project_ids}
+        rv = {project_id: None for project_id in project_ids}
+        for client, client_keys in self.__get_redis_clients(list(keys)):
+            pipeline = client.pipeline(transaction=False)
+            for key in client_keys:
+                pipeline.get(key)
+            for key, value in zip(client_keys, pipeline.execute()):
+                if value is not None:
+                    rv[keys[key]] = json.loads(value)
+        return rv
@@ -9,6 +9,7 @@ from sentry import tsdb
 from sentry.receivers.rules import DEFAULT_RULE_LABEL
 from sentry.rules.conditions.base import EventCondition
 from sentry.utils import metrics
+from sentry.utils.safe import safe_execute
 from sentry.utils.snuba import Dataset, raw_query
 
 standard_intervals = {
@@ -42,6 +43,8 @@ class BaseEventFrequencyCondition(EventCondition):
 
     def __init__(self, *args, **kwargs):
         self.tsdb = kwargs.pop("tsdb", tsdb)
+        # Rates that were queried upfront for multiple conditions, see ``get_rates``.
+        self.rates = kwargs.pop("rates", None)
         self.form_fields = {
             "value": {"type": "number", "placeholder": 100},
             "interval": {
@@ -86,7 +89,35 @@ class BaseEventFrequencyCondition(EventCondition):
         """ """
         raise NotImplementedError  # subclass must implement
 
+    def batch_query(self, group_ids, start, end, environment_id):
+        query_result = self.batch_query_hook(group_ids, start, end, environment_id)
+        if query_result is not None:
+            metrics.incr(
+                "rules.conditions.queried_snuba",
+                tags={
+                    "condition": re.sub("(?!^)([A-Z]+)", r"_\1", self.__class__.__name__).lower(),
+                    "is_created_on_project_creation": self.is_guessed_to_be_created_on_project_creation,
+                    "batch": True,
+                },
+            )
+        return query_result
+
+    def batch_query_hook(self, group_ids, start, end, environment_id):
+        """
+        Returns a mapping of group ID => rate for all ``group_ids``, or ``None``
+        if the rate cannot be queried for multiple groups at once.
+        """
+        return None
+
+    def get_rate_key(self, group_id, interval, environment_id):
+        return (self.__class__, interval, environment_id, group_id)
+
     def get_rate(self, event, interval, environment_id):
+        if self.rates is not None:
+            key = self.get_rate_key(event.group_id, interval, environment_id)
+            if key in self.rates:
+                return self.rates[key]
+
         _, duration = self.intervals[interval]
         end = timezone.now()
         return self.query(event, end - duration, end, environment_id=environment_id)
@@ -116,6 +147,16 @@ class EventFrequencyCondition(BaseEventFrequencyCondition):
             use_cache=True,
         )[event.group_id]
 
+    def batch_query_hook(self, group_ids, start, end, environment_id):
+        return self.tsdb.get_sums(
+            model=self.tsdb.models.group,
+            keys=group_ids,
+            start=start,
+            end=end,
+            environment_id=environment_id,
+            use_cache=True,
+        )
+
 
 class EventUniqueUserFrequencyCondition(BaseEventFrequencyCondition):
     label = "The issue is seen by more than {value} users in {interval}"
@@ -130,6 +171,86 @@ class EventUniqueUserFrequencyCondition(BaseEventFrequencyCondition):
             use_cache=True,
         )[event.group_id]
 
+    def batch_query_hook(self, group_ids, start, end, environment_id):
+        return self.tsdb.get_distinct_counts_totals(
+            model=self.tsdb.models.users_affected_by_group,
+            keys=group_ids,
+            start=start,
+            end=end,
+            environment_id=environment_id,
+            use_cache=True,
+        )
+
+
+class LazyRates:
+    """
+    A mapping of rate key => rate for many frequency conditions, see
+    ``get_rates``.
+
+    Rates are queried on first access. Conditions of the same type that query
+    the same interval and environment share a single query over the groups of
+    all their events, which is only issued once one of them needs its rate.
+    """
+
+    def __init__(self, conditions):
+        self._batches = {}
+        for condition, event in conditions:
+            interval = condition.get_option("interval")
+            if interval not in condition.intervals:
+                continue
+
+            key = (condition.__class__, interval, condition.rule.environment_id)
+            if key not in self._batches:
+                self._batches[key] = (condition, set())
+            self._batches[key][1].add(event.group_id)
+
+        self._rates = {}
+
+    def _load(self, rate_key):
+        _, interval, environment_id, _ = rate_key
+        batch = self._batches.pop(rate_key[:3], None)
+        if batch is None:
+            return
+
+        condition, group_ids = batch
+        _, duration = condition.intervals[interval]
+        end = timezone.now()
+        result = safe_execute(
+            condition.batch_query,
+            sorted(group_ids),
+            end - duration,
+            end,
+            environment_id,
+            _with_transaction=False,
+        )
+        if result is None:
+            return
+
+        for group_id, rate in result.items():
+            self._rates[condition.get_rate_key(group_id, interval, environment_id)] = rate
+
+    def __contains__(self, rate_key):
+        self._load(rate_key)
+        return rate_key in self._rates
+
+    def __getitem__(self, rate_key):
+        self._load(rate_key)
+        return self._rates[rate_key]
+
+
+def get_rates(conditions):
+    """
+    Returns the rates of many frequency conditions, given as a list of
+    ``(condition, event)`` tuples, which can be passed to conditions as
+    ``rates``.
+
+    Rates are queried lazily, so conditions that are never evaluated do not
+    cause any queries. Rates of conditions that do not support batch queries,
+    or whose batch query failed, are left out and queried by the conditions
+    themselves.
+    """
+    return LazyRates(conditions)
+
 
 percent_intervals = {
     "1m": ("1 minute", timedelta(minutes=1)),
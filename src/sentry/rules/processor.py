@@ -9,6 +9,7 @@ from django.utils import timezone
 from sentry import analytics
 from sentry.models import GroupRuleStatus, Rule
 from sentry.rules import EventState, rules
+from sentry.rules.conditions.event_frequency import BaseEventFrequencyCondition, get_rates
 from sentry.utils.hashlib import hash_values
 from sentry.utils.safe import safe_execute
 
@@ -29,6 +30,7 @@ class RuleProcessor:
         self.has_reappeared = has_reappeared
 
         self.grouped_futures = {}
+        self.rates = None
 
     def get_rules(self):
         """
@@ -54,9 +56,38 @@ class RuleProcessor:
             self.logger.warn("Unregistered condition %r", condition["id"])
             return
 
-        condition_inst = condition_cls(self.project, data=condition, rule=rule)
+        if issubclass(condition_cls, BaseEventFrequencyCondition):
+            condition_inst = condition_cls(
+                self.project, data=condition, rule=rule, rates=self.rates
+            )
+        else:
+            condition_inst = condition_cls(self.project, data=condition, rule=rule)
         return safe_execute(condition_inst.passes, self.event, state, _with_transaction=False)
 
+    def get_frequency_conditions(self, rule_list):
+        """
+        Get the frequency conditions of all rules that apply to the event.
+
+        :return: a list of `(condition, event)` tuples, see `get_rates`
+        """
+        environment_id = None
+        conditions = []
+        for rule in rule_list:
+            if rule.environment_id is not None:
+                if environment_id is None:
+                    environment_id = self.event.get_environment().id
+                if environment_id != rule.environment_id:
+                    continue
+
+            for condition in rule.data.get("conditions", ()):
+                condition_cls = rules.get(condition["id"])
+                if condition_cls is not None and issubclass(
+                    condition_cls, BaseEventFrequencyCondition
+                ):
+                    condition_inst = condition_cls(self.project, data=condition, rule=rule)
+                    conditions.append((condition_inst, self.event))
+        return conditions
+
     def get_rule_type(self, condition):
         rule_cls = rules.get(condition["id"])
         if rule_cls is None:
@@ -188,12 +219,41 @@ class RuleProcessor:
                 else:
                     self.grouped_futures[key][1].append(rule_future)
 
-    def apply(self):
+    def apply(self, rates=None):
+        """
+        Apply all rules of the project to the event.
+
+        :param rates: rates of frequency conditions returned by `get_rates`.
+            If not given, the rates of all rules are queried together once a
+            frequency condition is evaluated.
+        :return: the grouped futures of all actions to execute
+        """
         # we should only apply rules on unresolved issues
         if not self.event.group.is_unresolved():
             return {}.values()
 
         self.grouped_futures.clear()
-        for rule in self.get_rules():
+        rule_list = self.get_rules()
+        if rates is None:
+            rates = get_rates(self.get_frequency_conditions(rule_list))
+        self.rates = rates
+        for rule in rule_list:
             self.apply_rule(rule)
         return self.grouped_futures.values()
+
+    @classmethod
+    def apply_many(cls, processors):
+        """
+        Apply rules to the events of multiple processors, sharing the rate
+        queries of the frequency conditions of all of them.
+
+        :param processors: a list of `RuleProcessor`s
+        :return: a list with the grouped futures of each processor
+        """
+        conditions = []
+        for rp in processors:
+            if rp.event.group.is_unresolved():
+                conditions.extend(rp.get_frequency_conditions(rp.get_rules()))
+
+        rates = get_rates(conditions)
+        return [rp.apply(rates=rates) for rp in processors]
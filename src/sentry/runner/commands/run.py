@@ -354,6 +354,19 @@ def post_process_forwarder(**options):
     type=int,
     help="How many messages to process before committing offsets.",
 )
+@click.option(
+    "--max-batch-size",
+    default=100,
+    type=int,
+    help="How many messages to pass to subscribers at once.",
+)
+@click.option(
+    "--max-batch-time-ms",
+    "max_batch_time",
+    default=1000,
+    type=int,
+    help="How long to wait for a batch to fill up before processing it.",
+)
 @click.option(
     "--initial-offset-reset",
     default="latest",
@@ -377,6 +390,8 @@ def query_subscription_consumer(**options):
         commit_batch_size=options["commit_batch_size"],
         initial_offset_reset=options["initial_offset_reset"],
         force_offset_reset=options["force_offset_reset"],
+        max_batch_size=options["max_batch_size"],
+        max_batch_time=options["max_batch_time"],
     )
 
     def handler(signum, frame):
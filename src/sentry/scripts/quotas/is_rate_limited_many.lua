@@ -0,0 +1,60 @@
+-- Check the quotas of many items at once, see ``is_rate_limited.lua`` for the
+-- semantics of a single check. Items are checked in order, so an accepted item
+-- counts against the quotas of all items that follow it.
+--
+-- ``KEYS`` contains the counter and refund keys of all quotas of all items.
+-- ``ARGV`` contains, for every item, the quantity to count and the number of
+-- quotas of the item, followed by the limit and expiration time of each of
+-- those quotas.
+--
+-- For example, to check an item with a quantity of 1 against the quotas
+-- ``foo`` (limit 10) and ``bar`` (limit 20), and an item with a quantity of 5
+-- against the quota ``foo``, all expiring at the Unix timestamp ``100``:
+--
+--   KEYS = {"foo", "r:foo", "bar", "r:bar", "foo", "r:foo"}
+--   ARGV = {1, 2, 10, 100, 20, 100, 5, 1, 10, 100}
+--
+-- If all checks of an item pass, its counters are incremented by its
+-- quantity. The result is a Lua table/array (Redis multi bulk reply) with one
+-- entry per item, which in turn specifies for every quota of the item whether
+-- it was *rejected*.
+local results = {}
+local k = 1
+local a = 1
+while a <= #ARGV do
+    local quantity = tonumber(ARGV[a])
+    local count = tonumber(ARGV[a + 1])
+    a = a + 2
+
+    local rejections = {}
+    local failed = false
+    for j=0, count - 1 do
+        local key = KEYS[k + j * 2]
+        local limit = tonumber(ARGV[a + j * 2])
+        local rejected = false
+        -- limit=-1 means "no limit"
+        if limit >= 0 then
+            rejected = (redis.call('GET', key) or 0) - (redis.call('GET', KEYS[k + j * 2 + 1]) or 0) + quantity > limit
+        end
+
+        if rejected then
+            failed = true
+        end
+        rejections[j + 1] = rejected
+    end
+
+    if not failed then
+        for j=0, count - 1 do
+            redis.call('INCRBY', KEYS[k + j * 2], quantity)
+            redis.call('EXPIREAT', KEYS[k + j * 2], ARGV[a + j * 2 + 1])
+        end
+    end
+
+    results[#results + 1] = rejections
+    k = k + count * 2
+    a = a + count * 2
+end
+
+assert(k == #KEYS + 1, "incorrect number of keys and arguments provided")
+
+return results
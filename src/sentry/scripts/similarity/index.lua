@@ -455,6 +455,15 @@ local function set_frequencies(configuration, index, item, frequencies, expirati
     redis.call('EXPIREAT', key, expiration)
 end
 
+local function record_signature(configuration, index, key, frequencies)
+    set_frequencies(configuration, index, key, frequencies)
+    for band, buckets in ipairs(frequencies) do
+        for bucket in pairs(buckets) do
+            get_bucket_membership_set(configuration, index, band, bucket):add(key)
+        end
+    end
+end
+
 local function merge_frequencies(configuration, index, source, destination)
     local source_key = get_frequency_key(configuration, index, source)
     local destination_key = get_frequency_key(configuration, index, destination)
@@ -621,12 +630,28 @@ local commands = {
         return table.imap(
             signatures,
             function (signature)
-                set_frequencies(configuration, signature.index, key, signature.frequencies)
-                for band, buckets in ipairs(signature.frequencies) do
-                    for bucket in pairs(buckets) do
-                        get_bucket_membership_set(configuration, signature.index, band, bucket):add(key)
-                    end
-                end
+                record_signature(configuration, signature.index, key, signature.frequencies)
+            end
+        )
+    end,
+    RECORD_MANY = function (configuration, cursor, arguments)
+        --[[
+        Records signatures for multiple keys with a single script call. Each
+        entry consists of a ``key``, ``index`` and signature, and a key may be
+        repeated to record signatures for multiple indices.
+        ]]--
+        local cursor, entries = variadic_argument_parser(
+            object_argument_parser({
+                {"key", argument_parser(validate_value)},
+                {"index", argument_parser(validate_value)},
+                {"frequencies", frequencies_argument_parser(configuration)},
+            })
+        )(cursor, arguments)
+
+        return table.imap(
+            entries,
+            function (entry)
+                record_signature(configuration, entry.index, entry.key, entry.frequencies)
             end
         )
     end,
@@ -648,6 +673,37 @@ local commands = {
             limit
         )
     end,
+    CLASSIFY_MANY = function (configuration, cursor, arguments)
+        --[[
+        Performs multiple ``CLASSIFY`` requests with a single script call.
+        Each request is prefixed with the number of index parameters that it
+        contains, and the results are returned in the same order as the
+        requests.
+        ]]--
+        local cursor, limit, requests = multiple_argument_parser(
+            argument_parser(validate_integer),
+            variadic_argument_parser(
+                repeated_argument_parser(
+                    object_argument_parser({
+                        {"index", argument_parser(validate_value)},
+                        {"threshold", argument_parser(validate_integer)},
+                        {"frequencies", frequencies_argument_parser(configuration)},
+                    })
+                )
+            )
+        )(cursor, arguments)
+
+        return table.imap(
+            requests,
+            function (parameters)
+                return search(
+                    configuration,
+                    parameters,
+                    limit
+                )
+            end
+        )
+    end,
     COMPARE = function (configuration, cursor, arguments)
         local cursor, limit, item_key = multiple_argument_parser(
             argument_parser(validate_integer),
@@ -6,6 +6,10 @@ class AbstractIndexBackend(metaclass=ABCMeta):
     def classify(self, scope, items, limit=None, timestamp=None):
         pass
 
+    @abstractmethod
+    def classify_many(self, scope, requests, limit=None, timestamp=None):
+        pass
+
     @abstractmethod
     def compare(self, scope, key, items, limit=None, timestamp=None):
         pass
@@ -14,6 +18,10 @@ class AbstractIndexBackend(metaclass=ABCMeta):
     def record(self, scope, key, items, timestamp=None):
         pass
 
+    @abstractmethod
+    def record_many(self, scope, items, timestamp=None):
+        pass
+
     @abstractmethod
     def merge(self, scope, destination, items, timestamp=None):
         pass
@@ -5,12 +5,18 @@ class DummyIndexBackend(AbstractIndexBackend):
     def classify(self, scope, items, limit=None, timestamp=None):
         return []
 
+    def classify_many(self, scope, requests, limit=None, timestamp=None):
+        return [[] for _ in requests]
+
     def compare(self, scope, key, items, limit=None, timestamp=None):
         return []
 
     def record(self, scope, key, items, timestamp=None):
         return {}
 
+    def record_many(self, scope, items, timestamp=None):
+        return {}
+
     def merge(self, scope, destination, items, timestamp=None):
         return False
 
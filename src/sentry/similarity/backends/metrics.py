@@ -25,9 +25,15 @@ class MetricsWrapper(AbstractIndexBackend):
     def classify(self, *args, **kwargs):
         return self.__instrumented_method_call("classify", *args, **kwargs)
 
+    def classify_many(self, *args, **kwargs):
+        return self.__instrumented_method_call("classify_many", *args, **kwargs)
+
     def compare(self, *args, **kwargs):
         return self.__instrumented_method_call("compare", *args, **kwargs)
 
+    def record_many(self, *args, **kwargs):
+        return self.__instrumented_method_call("record_many", *args, **kwargs)
+
     def merge(self, *args, **kwargs):
         return self.__instrumented_method_call("merge", *args, **kwargs)
 
@@ -96,6 +96,40 @@ class RedisScriptMinHashIndexBackend(AbstractIndexBackend):
 
         return self._as_search_result(self.__index(scope, arguments))
 
+    def classify_many(self, scope, requests, limit=None, timestamp=None):
+        if timestamp is None:
+            timestamp = int(time.time())
+
+        arguments = [
+            "CLASSIFY_MANY",
+            timestamp,
+            self.namespace,
+            self.bands,
+            self.interval,
+            self.retention,
+            self.candidate_set_limit,
+            scope,
+            limit if limit is not None else -1,
+        ]
+
+        # Requests without any items can't match anything, so they are not
+        # sent to the script at all.
+        positions = []
+        for position, items in enumerate(requests):
+            if not items:
+                continue
+            positions.append(position)
+            arguments.append(len(items))
+            for idx, threshold, features in items:
+                arguments.extend([idx, threshold])
+                arguments.extend(self._build_signature_arguments(features))
+
+        results = [[] for _ in requests]
+        if positions:
+            for position, result in zip(positions, self.__index(scope, arguments)):
+                results[position] = self._as_search_result(result)
+        return results
+
     def compare(self, scope, key, items, limit=None, timestamp=None):
         if timestamp is None:
             timestamp = int(time.time())
@@ -143,6 +177,31 @@ class RedisScriptMinHashIndexBackend(AbstractIndexBackend):
 
         return self.__index(scope, arguments)
 
+    def record_many(self, scope, items, timestamp=None):
+        if not any(signatures for _, signatures in items):
+            return  # nothing to do
+
+        if timestamp is None:
+            timestamp = int(time.time())
+
+        arguments = [
+            "RECORD_MANY",
+            timestamp,
+            self.namespace,
+            self.bands,
+            self.interval,
+            self.retention,
+            self.candidate_set_limit,
+            scope,
+        ]
+
+        for key, signatures in items:
+            for idx, features in signatures:
+                arguments.extend([key, idx])
+                arguments.extend(self._build_signature_arguments(features))
+
+        return self.__index(scope, arguments)
+
     def merge(self, scope, destination, items, timestamp=None):
         if timestamp is None:
             timestamp = int(time.time())
@@ -95,14 +95,44 @@ class FeatureSet:
                 )
         return results
 
+    def __encode(self, event, label, features):
+        try:
+            return map(self.encoder.dumps, features)
+        except Exception as error:
+            log = (
+                logger.debug
+                if isinstance(error, self.expected_encoding_errors)
+                else functools.partial(logger.warning, exc_info=True)
+            )
+            log(
+                "Could not encode features from %r for %r due to error: %r",
+                event,
+                label,
+                error,
+            )
+
+    def __get_classify_items(self, event, thresholds):
+        labels = []
+        items = []
+        for label, features in self.extract(event).items():
+            features = self.__encode(event, label, features)
+            if features:
+                items.append((self.aliases[label], thresholds.get(label, 0), features))
+                labels.append(label)
+        return labels, items
+
     def record(self, events):
+        """
+        Records the features of all ``events`` in the index with one request
+        per distinct event timestamp. Events may belong to different groups,
+        but all of them must belong to the same project.
+        """
         if not events:
             return []
 
         scope = None
-        key = None
 
-        items = []
+        items = {}
         for event in events:
             if not event.group_id:
                 continue
@@ -114,32 +144,17 @@ class FeatureSet:
                         self.__get_scope(event.project) == scope
                     ), "all events must be associated with the same project"
 
-                if key is None:
-                    key = self.__get_key(event.group)
-                else:
-                    assert (
-                        self.__get_key(event.group) == key
-                    ), "all events must be associated with the same group"
-
-                try:
-                    features = map(self.encoder.dumps, features)
-                except Exception as error:
-                    log = (
-                        logger.debug
-                        if isinstance(error, self.expected_encoding_errors)
-                        else functools.partial(logger.warning, exc_info=True)
-                    )
-                    log(
-                        "Could not encode features from %r for %r due to error: %r",
-                        event,
-                        label,
-                        error,
-                    )
-                else:
-                    if features:
-                        items.append((self.aliases[label], features))
+                features = self.__encode(event, label, features)
+                if features:
+                    timestamp = int(to_timestamp(event.datetime))
+                    items.setdefault(timestamp, {}).setdefault(
+                        self.__get_key(event.group), []
+                    ).append((self.aliases[label], features))
 
-        return self.index.record(scope, key, items, timestamp=int(to_timestamp(event.datetime)))
+        return [
+            self.index.record_many(scope, list(keys.items()), timestamp=timestamp)
+            for timestamp, keys in items.items()
+        ]
 
     def classify(self, events, limit=None, thresholds=None):
         if not events:
@@ -153,32 +168,16 @@ class FeatureSet:
         labels = []
         items = []
         for event in events:
-            for label, features in self.extract(event).items():
-                if scope is None:
-                    scope = self.__get_scope(event.project)
-                else:
-                    assert (
-                        self.__get_scope(event.project) == scope
-                    ), "all events must be associated with the same project"
+            if scope is None:
+                scope = self.__get_scope(event.project)
+            else:
+                assert (
+                    self.__get_scope(event.project) == scope
+                ), "all events must be associated with the same project"
 
-                try:
-                    features = map(self.encoder.dumps, features)
-                except Exception as error:
-                    log = (
-                        logger.debug
-                        if isinstance(error, self.expected_encoding_errors)
-                        else functools.partial(logger.warning, exc_info=True)
-                    )
-                    log(
-                        "Could not encode features from %r for %r due to error: %r",
-                        event,
-                        label,
-                        error,
-                    )
-                else:
-                    if features:
-                        items.append((self.aliases[label], thresholds.get(label, 0), features))
-                        labels.append(label)
+            event_labels, event_items = self.__get_classify_items(event, thresholds)
+            labels.extend(event_labels)
+            items.extend(event_items)
 
         return map(
             lambda key__scores: (int(key__scores[0]), dict(zip(labels, key__scores[1]))),
@@ -187,6 +186,44 @@ class FeatureSet:
             ),
         )
 
+    def classify_many(self, events, limit=None, thresholds=None):
+        """
+        Classifies each of ``events`` separately with a single request to the
+        index, returning the results in the same order as the events. All
+        events must belong to the same project.
+        """
+        if not events:
+            return []
+
+        if thresholds is None:
+            thresholds = {}
+
+        scope = None
+
+        labels = []
+        requests = []
+        for event in events:
+            if scope is None:
+                scope = self.__get_scope(event.project)
+            else:
+                assert (
+                    self.__get_scope(event.project) == scope
+                ), "all events must be associated with the same project"
+
+            event_labels, event_items = self.__get_classify_items(event, thresholds)
+            labels.append(event_labels)
+            requests.append(event_items)
+
+        return [
+            [(int(key), dict(zip(event_labels, scores))) for key, scores in results]
+            for event_labels, results in zip(
+                labels,
+                self.index.classify_many(
+                    scope, requests, limit=limit, timestamp=int(to_timestamp(event.datetime))
+                ),
+            )
+        ]
+
     def compare(self, group, limit=None, thresholds=None):
         if thresholds is None:
             thresholds = {}
@@ -1,7 +1,5 @@
 import mmh3
 
-from sentry.utils.compat import map
-
 
 class MinHashSignatureBuilder:
     def __init__(self, columns, rows):
@@ -9,9 +7,12 @@ class MinHashSignatureBuilder:
         self.rows = rows
 
     def __call__(self, features):
-        return map(
-            lambda column: min(
-                map(lambda feature: mmh3.hash(feature, column) % self.rows, features)
-            ),
-            range(self.columns),
-        )
+        # Repeated features can't change the minimum of a column, so every
+        # distinct feature is only hashed once per column.
+        features = set(features)
+        rows = self.rows
+        hash_feature = mmh3.hash
+        return [
+            min([hash_feature(feature, column) % rows for feature in features])
+            for column in range(self.columns)
+        ]
@@ -1,6 +1,7 @@
 import logging
+import time
 from random import random
-from typing import Any, Callable, Dict, Iterable, List, Optional, cast
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, cast
 
 import jsonschema
 import pytz
@@ -19,8 +20,11 @@ from sentry.utils.batching_kafka_consumer import wait_for_topics
 logger = logging.getLogger(__name__)
 
 TQuerySubscriptionCallable = Callable[[Dict[str, Any], QuerySubscription], None]
+TQuerySubscriptionUpdate = Tuple[Dict[str, Any], QuerySubscription]
+TQuerySubscriptionBatchCallable = Callable[[List[TQuerySubscriptionUpdate]], None]
 
 subscriber_registry: Dict[str, TQuerySubscriptionCallable] = {}
+batch_subscriber_registry: Dict[str, TQuerySubscriptionBatchCallable] = {}
 
 CONSUMER_TRANSACTION_SAMPLE_RATE = 0.01
 
@@ -37,6 +41,25 @@ def register_subscriber(
     return inner
 
 
+def register_batch_subscriber(
+    subscriber_key: str,
+) -> Callable[[TQuerySubscriptionBatchCallable], TQuerySubscriptionBatchCallable]:
+    """
+    Registers a callback that receives all updates of a batch of messages for
+    subscriptions of the given type at once, as a list of `(contents, subscription)`
+    tuples in the order they were consumed. Takes precedence over a callback registered
+    with `register_subscriber` for the same type.
+    """
+
+    def inner(func: TQuerySubscriptionBatchCallable) -> TQuerySubscriptionBatchCallable:
+        if subscriber_key in batch_subscriber_registry:
+            raise Exception("Batch handler already registered for %s" % subscriber_key)
+        batch_subscriber_registry[subscriber_key] = func
+        return func
+
+    return inner
+
+
 class InvalidMessageError(Exception):
     pass
 
@@ -64,6 +87,8 @@ class QuerySubscriptionConsumer:
         commit_batch_size: int = 100,
         initial_offset_reset: str = "earliest",
         force_offset_reset: Optional[str] = None,
+        max_batch_size: int = 1,
+        max_batch_time: int = 1000,
     ):
         self.group_id = group_id
         if not topic:
@@ -73,6 +98,8 @@ class QuerySubscriptionConsumer:
         self.topic = topic
         cluster_name: str = settings.KAFKA_TOPICS[topic]["cluster"]
         self.commit_batch_size = commit_batch_size
+        self.max_batch_size = max_batch_size
+        self.max_batch_time = max_batch_time
         self.initial_offset_reset = initial_offset_reset
         self.offsets: Dict[int, Optional[int]] = {}
         self.consumer: Consumer = None
@@ -114,6 +141,7 @@ class QuerySubscriptionConsumer:
     def run(self) -> None:
         logger.debug("Starting snuba query subscriber")
         self.offsets.clear()
+        batch: List[Message] = []
 
         def on_assign(consumer: Consumer, partitions: List[TopicPartition]) -> None:
             updated_partitions: List[TopicPartition] = []
@@ -139,6 +167,10 @@ class QuerySubscriptionConsumer:
 
         def on_revoke(consumer: Consumer, partitions: List[TopicPartition]) -> None:
             partition_numbers = [partition.partition for partition in partitions]
+            # Messages from revoked partitions will be processed by their new owner.
+            batch[:] = [
+                message for message in batch if message.partition() not in partition_numbers
+            ]
             self.commit_offsets(partition_numbers)
             for partition_number in partition_numbers:
                 self.offsets.pop(partition_number, None)
@@ -161,31 +193,41 @@ class QuerySubscriptionConsumer:
 
         self.consumer.subscribe([self.topic], on_assign=on_assign, on_revoke=on_revoke)
 
-        i = 0
+        uncommitted = 0
+        batch_deadline = 0.0
         while not self.__shutdown_requested:
             message = self.consumer.poll(0.1)
-            if message is None:
-                continue
+            if message is not None:
+                error = message.error()
+                if error is not None:
+                    raise KafkaException(error)
 
-            error = message.error()
-            if error is not None:
-                raise KafkaException(error)
+                if not batch:
+                    batch_deadline = time.time() + self.max_batch_time / 1000.0
+                batch.append(message)
 
-            i = i + 1
+                if len(batch) < self.max_batch_size and time.time() < batch_deadline:
+                    continue
+            elif not batch:
+                continue
 
             with sentry_sdk.start_transaction(
                 op="handle_message",
                 name="query_subscription_consumer_process_message",
                 sampled=random() <= CONSUMER_TRANSACTION_SAMPLE_RATE,
             ), metrics.timer("snuba_query_subscriber.handle_message"):
-                self.handle_message(message)
+                handled = self.handle_messages(batch)
 
-            # Track latest completed message here, for use in `shutdown` handler.
-            self.offsets[message.partition()] = message.offset() + 1
+            # Track latest completed messages here, for use in `shutdown` handler.
+            for message in batch[:handled]:
+                self.offsets[message.partition()] = message.offset() + 1
+            batch.clear()
 
-            if i % self.commit_batch_size == 0:
+            uncommitted += handled
+            if uncommitted >= self.commit_batch_size:
                 logger.debug("Committing offsets")
                 self.commit_offsets()
+                uncommitted = 0
 
         logger.debug("Committing offsets and closing consumer")
         self.commit_offsets()
@@ -221,80 +263,131 @@ class QuerySubscriptionConsumer:
         :param message:
         :return:
         """
-        with sentry_sdk.push_scope() as scope:
-            try:
-                with metrics.timer("snuba_query_subscriber.parse_message_value"):
-                    contents = self.parse_message_value(message.value())
-            except InvalidMessageError:
-                # If the message is in an invalid format, just log the error
-                # and continue
-                logger.exception(
-                    "Subscription update could not be parsed",
-                    extra={
-                        "offset": message.offset(),
-                        "partition": message.partition(),
-                        "value": message.value(),
-                    },
-                )
-                return
-            scope.set_tag("query_subscription_id", contents["subscription_id"])
+        self.handle_messages([message])
 
-            try:
-                with metrics.timer("snuba_query_subscriber.fetch_subscription"):
-                    subscription: QuerySubscription = QuerySubscription.objects.get_from_cache(
-                        subscription_id=contents["subscription_id"]
-                    )
-                    if subscription.status != QuerySubscription.Status.ACTIVE.value:
-                        metrics.incr("snuba_query_subscriber.subscription_inactive")
-                        return
-            except QuerySubscription.DoesNotExist:
-                metrics.incr("snuba_query_subscriber.subscription_doesnt_exist")
-                logger.error(
-                    "Received subscription update, but subscription does not exist",
-                    extra={
-                        "offset": message.offset(),
-                        "partition": message.partition(),
-                        "value": message.value(),
-                    },
-                )
-                try:
-                    _delete_from_snuba(
-                        self.topic_to_dataset[message.topic()], contents["subscription_id"]
-                    )
-                except Exception:
-                    logger.exception("Failed to delete unused subscription from snuba.")
-                return
-
-            if subscription.type not in subscriber_registry:
-                metrics.incr("snuba_query_subscriber.subscription_type_not_registered")
-                logger.error(
-                    "Received subscription update, but no subscription handler registered",
-                    extra={
-                        "offset": message.offset(),
-                        "partition": message.partition(),
-                        "value": message.value(),
-                    },
-                )
-                return
+    def handle_messages(self, messages: Sequence[Message]) -> int:
+        """
+        Handles a batch of messages like `handle_message`. Updates for subscription types that
+        have a batch subscriber registered are collected and passed to it at once, in the order
+        they were consumed. Stops early if a shutdown is requested while handling the messages.
+        :param messages:
+        :return: The number of messages that were handled
+        """
+        batches: Dict[str, List[TQuerySubscriptionUpdate]] = {}
+        handled = 0
+        for message in messages:
+            if self.__shutdown_requested:
+                break
+
+            with sentry_sdk.push_scope():
+                update = self.get_subscription_update(message)
+                if update is not None:
+                    contents, subscription = update
+                    if subscription.type in batch_subscriber_registry:
+                        batches.setdefault(subscription.type, []).append(update)
+                    else:
+                        self.run_subscriber(message, contents, subscription)
+            handled += 1
+
+        for subscription_type, updates in batches.items():
+            callback = batch_subscriber_registry[subscription_type]
+            with sentry_sdk.start_span(op="process_messages") as span, metrics.timer(
+                "snuba_query_subscriber.batch_callback.duration", instance=subscription_type
+            ):
+                span.set_data("batch_size", len(updates))
+                callback(updates)
 
-            sentry_sdk.set_tag("project_id", subscription.project_id)
-            sentry_sdk.set_tag("query_subscription_id", contents["subscription_id"])
+        return handled
 
-            callback = subscriber_registry[subscription.type]
-            with sentry_sdk.start_span(op="process_message") as span, metrics.timer(
-                "snuba_query_subscriber.callback.duration", instance=subscription.type
-            ):
-                span.set_data("payload", contents)
-                span.set_data("subscription_dataset", subscription.snuba_query.dataset)
-                span.set_data("subscription_query", subscription.snuba_query.query)
-                span.set_data("subscription_aggregation", subscription.snuba_query.aggregate)
-                span.set_data("subscription_time_window", subscription.snuba_query.time_window)
-                span.set_data("subscription_resolution", subscription.snuba_query.resolution)
-                span.set_data("message_offset", message.offset())
-                span.set_data("message_partition", message.partition())
-                span.set_data("message_value", message.value())
-
-                callback(contents, subscription)
+    def get_subscription_update(self, message: Message) -> Optional[TQuerySubscriptionUpdate]:
+        """
+        Parses the value from Kafka and fetches the related subscription. Returns `None` if the
+        message is invalid, or if the subscription is inactive, doesn't exist or has no
+        registered callback.
+        :param message:
+        :return: A tuple of the parsed message and the subscription
+        """
+        try:
+            with metrics.timer("snuba_query_subscriber.parse_message_value"):
+                contents = self.parse_message_value(message.value())
+        except InvalidMessageError:
+            # If the message is in an invalid format, just log the error
+            # and continue
+            logger.exception(
+                "Subscription update could not be parsed",
+                extra={
+                    "offset": message.offset(),
+                    "partition": message.partition(),
+                    "value": message.value(),
+                },
+            )
+            return None
+        sentry_sdk.set_tag("query_subscription_id", contents["subscription_id"])
+
+        try:
+            with metrics.timer("snuba_query_subscriber.fetch_subscription"):
+                subscription: QuerySubscription = QuerySubscription.objects.get_from_cache(
+                    subscription_id=contents["subscription_id"]
+                )
+                if subscription.status != QuerySubscription.Status.ACTIVE.value:
+                    metrics.incr("snuba_query_subscriber.subscription_inactive")
+                    return None
+        except QuerySubscription.DoesNotExist:
+            metrics.incr("snuba_query_subscriber.subscription_doesnt_exist")
+            logger.error(
+                "Received subscription update, but subscription does not exist",
+                extra={
+                    "offset": message.offset(),
+                    "partition": message.partition(),
+                    "value": message.value(),
+                },
+            )
+            try:
+                _delete_from_snuba(
+                    self.topic_to_dataset[message.topic()], contents["subscription_id"]
+                )
+            except Exception:
+                logger.exception("Failed to delete unused subscription from snuba.")
+            return None
+
+        if (
+            subscription.type not in subscriber_registry
+            and subscription.type not in batch_subscriber_registry
+        ):
+            metrics.incr("snuba_query_subscriber.subscription_type_not_registered")
+            logger.error(
+                "Received subscription update, but no subscription handler registered",
+                extra={
+                    "offset": message.offset(),
+                    "partition": message.partition(),
+                    "value": message.value(),
+                },
+            )
+            return None
+
+        return contents, subscription
+
+    def run_subscriber(
+        self, message: Message, contents: Dict[str, Any], subscription: QuerySubscription
+    ) -> None:
+        sentry_sdk.set_tag("project_id", subscription.project_id)
+        sentry_sdk.set_tag("query_subscription_id", contents["subscription_id"])
+
+        callback = subscriber_registry[subscription.type]
+        with sentry_sdk.start_span(op="process_message") as span, metrics.timer(
+            "snuba_query_subscriber.callback.duration", instance=subscription.type
+        ):
+            span.set_data("payload", contents)
+            span.set_data("subscription_dataset", subscription.snuba_query.dataset)
+            span.set_data("subscription_query", subscription.snuba_query.query)
+            span.set_data("subscription_aggregation", subscription.snuba_query.aggregate)
+            span.set_data("subscription_time_window", subscription.snuba_query.time_window)
+            span.set_data("subscription_resolution", subscription.snuba_query.resolution)
+            span.set_data("message_offset", message.offset())
+            span.set_data("message_partition", message.partition())
+            span.set_data("message_value", message.value())
+
+            callback(contents, subscription)
 
     def parse_message_value(self, value: str) -> Dict[str, Any]:
         """
@@ -1,10 +1,12 @@
 import logging
+import time
 from uuid import uuid4
 
 from django.apps import apps
 from django.db import transaction
 from django.utils import timezone
 
+from sentry import options
 from sentry.constants import ObjectStatus
 from sentry.exceptions import DeleteAborted
 from sentry.signals import pending_delete
@@ -204,6 +206,77 @@ def delete_project(object_id, transaction_id=None, **kwargs):
         )
 
 
+@instrumented_task(
+    name="sentry.tasks.deletion.delete_project_groups",
+    queue="cleanup",
+    default_retry_delay=60 * 5,
+    max_retries=MAX_RETRIES,
+)
+@retry(exclude=(DeleteAborted,))
+def delete_project_groups(
+    project_id,
+    num_shards,
+    shard_id,
+    transaction_id=None,
+    date_started=None,
+    initial_count=None,
+    **kwargs,
+):
+    """
+    Deletes the groups of a deleted project whose id modulo `num_shards` is
+    `shard_id`, rescheduling itself after each time budget until none are
+    left.
+    """
+    from sentry import deletions
+    from sentry.models import Group
+
+    transaction_id = transaction_id or uuid4().hex
+    task = deletions.get(
+        model=Group,
+        query={"project_id": project_id},
+        transaction_id=transaction_id,
+        num_shards=num_shards,
+        shard_id=shard_id,
+    )
+
+    remaining = task.get_queryset(num_shards, shard_id).count()
+    now = time.time()
+    if date_started is None:
+        date_started, initial_count = now, remaining
+    elif remaining < initial_count:
+        rate = (initial_count - remaining) / max(now - date_started, 1)
+        logger.info(
+            "object.delete.progress",
+            extra={
+                "transaction_id": transaction_id,
+                "model": "Group",
+                "project_id": project_id,
+                "shard_id": shard_id,
+                "num_shards": num_shards,
+                "deleted": initial_count - remaining,
+                "remaining": remaining,
+                "eta": int(remaining / rate),
+            },
+        )
+
+    deadline = now + options.get("deletions.project.group-shard-time-budget")
+    has_more = remaining > 0
+    while has_more and time.time() < deadline:
+        has_more = task.chunk()
+
+    if has_more:
+        delete_project_groups.apply_async(
+            kwargs={
+                "project_id": project_id,
+                "num_shards": num_shards,
+                "shard_id": shard_id,
+                "transaction_id": transaction_id,
+                "date_started": date_started,
+                "initial_count": initial_count,
+            }
+        )
+
+
 @instrumented_task(
     name="sentry.tasks.deletion.delete_groups",
     queue="cleanup",
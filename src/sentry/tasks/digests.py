@@ -1,9 +1,10 @@
 import logging
 import time
 
+from sentry import options
 from sentry.digests import get_option_key
 from sentry.digests.backends.base import InvalidState
-from sentry.digests.notifications import build_digest, split_key
+from sentry.digests.notifications import build_digest, fetch_state_many, split_key, split_keys
 from sentry.models import Project, ProjectOption
 from sentry.tasks.base import instrumented_task
 from sentry.utils import snuba
@@ -28,8 +29,20 @@ def schedule_digests():
     timeout = 300
     digests.maintenance(deadline - timeout)
 
+    batch_size = options.get("digests.delivery-batch-size")
+    if batch_size <= 1:
+        for entry in digests.schedule(deadline):
+            deliver_digest.delay(entry.key, entry.timestamp)
+        return
+
+    batch = []
     for entry in digests.schedule(deadline):
-        deliver_digest.delay(entry.key, entry.timestamp)
+        batch.append(entry.key)
+        if len(batch) >= batch_size:
+            deliver_digests.delay(batch)
+            batch = []
+    if batch:
+        deliver_digests.delay(batch)
 
 
 @instrumented_task(name="sentry.tasks.digests.deliver_digest", queue="digests.delivery")
@@ -67,3 +80,53 @@ def deliver_digest(key, schedule_timestamp=None):
                     "target_identifier": target_identifier,
                 },
             )
+
+
+@instrumented_task(name="sentry.tasks.digests.deliver_digests", queue="digests.delivery")
+def deliver_digests(keys):
+    """
+    Delivers the digests of several timelines, opening and closing them
+    together and loading what they refer to with one query per model.
+    """
+    from sentry import digests
+    from sentry.mail import mail_adapter
+
+    split = split_keys(keys)
+    for key in set(keys) - set(split):
+        logger.info("Cannot deliver digest %r due to error: project does not exist", key)
+        digests.delete(key)
+
+    minimum_delays = {
+        key: ProjectOption.objects.get_value(project, get_option_key("mail", "minimum_delay"))
+        for key, (project, _, _) in split.items()
+    }
+
+    with snuba.options_override({"consistent": True}):
+        with digests.digest_many(list(split), minimum_delays=minimum_delays) as records_by_key:
+            items = [
+                (key, split[key][0], records) for key, records in records_by_key.items() if records
+            ]
+            states = fetch_state_many([(project, records) for _, project, records in items])
+
+            built = []
+            for (key, project, records), state in zip(items, states):
+                try:
+                    built.append((key, build_digest(project, records, state=state)))
+                except Exception:
+                    # Keep the timeline, so that it is digested again later.
+                    logger.exception("Failed to build digest %r", key)
+                    del records_by_key[key]
+
+        for key, digest in built:
+            project, target_type, target_identifier = split[key]
+            if digest:
+                mail_adapter.notify_digest(project, digest, target_type, target_identifier)
+            else:
+                logger.info(
+                    "Skipped digest delivery due to empty digest",
+                    extra={
+                        "project": project.id,
+                        "target_type": target_type.value,
+                        "target_identifier": target_identifier,
+                    },
+                )
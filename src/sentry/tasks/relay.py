@@ -5,12 +5,30 @@ from django.conf import settings
 
 from sentry.relay import projectconfig_debounce_cache
 from sentry.tasks.base import instrumented_task
-from sentry.utils import metrics
+from sentry.utils import json, metrics
 from sentry.utils.sdk import set_current_event_project
 
 logger = logging.getLogger(__name__)
 
 
+#: Fields of project configs that change on every generation, even if nothing
+#: else in the config changed.
+VOLATILE_CONFIG_FIELDS = ("lastFetch", "lastChange", "rev")
+
+
+def _is_config_unchanged(cached_config, config):
+    if cached_config is None:
+        return False
+
+    # Compare the configs as they are stored in the cache.
+    config = json.loads(json.dumps(config))
+    for field in VOLATILE_CONFIG_FIELDS:
+        cached_config.pop(field, None)
+        config.pop(field, None)
+
+    return cached_config == config
+
+
 @instrumented_task(name="sentry.tasks.relay.update_config_cache", queue="relay_config")
 def update_config_cache(generate, organization_id=None, project_id=None, update_reason=None):
     """
@@ -26,9 +44,9 @@ def update_config_cache(generate, organization_id=None, project_id=None, update_
         invalidated.
     """
 
-    from sentry.models import Project, ProjectKey, ProjectKeyStatus
+    from sentry.models import Organization, Project, ProjectKey
     from sentry.relay import projectconfig_cache
-    from sentry.relay.config import get_project_config
+    from sentry.relay.config import get_project_configs_for_organization
 
     if project_id:
         set_current_event_project(project_id)
@@ -51,34 +69,37 @@ def update_config_cache(generate, organization_id=None, project_id=None, update_
 
     if project_id:
         projects = [Project.objects.get_from_cache(id=project_id)]
+        organization_id = projects[0].organization_id
     elif organization_id:
         # XXX(markus): I feel like we should be able to cache this but I don't
         # want to add another method to src/sentry/db/models/manager.py
-        projects = Project.objects.filter(organization_id=organization_id)
+        projects = list(Project.objects.filter(organization_id=organization_id))
 
     project_keys = {}
     for key in ProjectKey.objects.filter(project_id__in=[project.id for project in projects]):
         project_keys.setdefault(key.project_id, []).append(key)
 
     if generate:
-        config_cache = {}
-        for project in projects:
-            project_config = get_project_config(
-                project, project_keys=project_keys.get(project.id, []), full_config=True
+        if projects:
+            organization = Organization.objects.get_from_cache(id=organization_id)
+            config_cache = get_project_configs_for_organization(
+                organization, projects, project_keys
             )
-            config_cache[project.id] = project_config.to_dict()
-
-            for key in project_keys.get(project.id) or ():
-                # XXX(markus): This is currently the cleanest way to get only
-                # state for a single projectkey (considering quotas and
-                # everything)
-                if key.status != ProjectKeyStatus.ACTIVE:
-                    continue
-
-                project_config = get_project_config(project, project_keys=[key], full_config=True)
-                config_cache[key.public_key] = project_config.to_dict()
-
-        projectconfig_cache.set_many(config_cache)
+        else:
+            config_cache = {}
+
+        # Only write configs that actually changed to keep bulk updates of
+        # large organizations cheap.
+        cached_configs = projectconfig_cache.get_many(list(config_cache))
+        changed_configs = {
+            cache_key: config
+            for cache_key, config in config_cache.items()
+            if not _is_config_unchanged(cached_configs.get(cache_key), config)
+        }
+        metrics.timing("relay.projectconfig_cache.configs_generated", len(config_cache))
+        metrics.timing("relay.projectconfig_cache.configs_changed", len(changed_configs))
+
+        projectconfig_cache.set_many(changed_configs)
     else:
         cache_keys_to_delete = []
         for project in projects:
@@ -1,4 +1,5 @@
 import logging
+from collections import defaultdict
 from datetime import datetime
 from time import sleep, time
 
@@ -87,7 +88,12 @@ def submit_symbolicate(project, from_reprocessing, cache_key, event_id, start_ti
     task.delay(cache_key=cache_key, start_time=start_time, event_id=event_id)
 
 
-def submit_save_event(project, from_reprocessing, cache_key, event_id, start_time, data):
+def submit_save_event(
+    project, from_reprocessing, cache_key, event_id, start_time, data, save_batch=None
+):
+    if save_batch is not None and save_batch.add(project, cache_key, event_id, start_time, data):
+        return
+
     if cache_key:
         data = None
 
@@ -102,7 +108,68 @@ def submit_save_event(project, from_reprocessing, cache_key, event_id, start_tim
     )
 
 
-def _do_preprocess_event(cache_key, data, start_time, event_id, process_task, project):
+class SaveEventBatch:
+    """
+    Collects error events that are ready to be saved, so that they are saved
+    with one ``save_event_batch`` task per project instead of one
+    ``save_event`` task per event. Call ``submit`` to dispatch the remaining
+    events once no more events are added.
+
+    ``on_submit`` is called with the project id and the events of every batch
+    after the batch has been dispatched.
+    """
+
+    def __init__(self, max_size, on_submit=None):
+        self.max_size = max_size
+        self.on_submit = on_submit
+        self.__events = defaultdict(list)
+        self.__pending = set()
+
+    def add(self, project, cache_key, event_id, start_time, data):
+        """
+        Adds an event to the batch. Returns ``False`` if the event cannot be
+        saved as part of a batch.
+        """
+        if not cache_key or data is None or data.get("type") == "transaction":
+            return False
+
+        events = self.__events[project.id]
+        events.append({"cache_key": cache_key, "event_id": event_id, "start_time": start_time})
+        self.__pending.add(cache_key)
+
+        if len(events) >= self.max_size:
+            self.__submit(project.id)
+
+        return True
+
+    def is_pending(self, cache_key):
+        """
+        Returns whether an event has been added but not dispatched yet.
+        """
+        return cache_key in self.__pending
+
+    def submit(self):
+        for project_id in list(self.__events):
+            self.__submit(project_id)
+
+    def __submit(self, project_id):
+        events = self.__events.pop(project_id)
+        self.__pending.difference_update(event["cache_key"] for event in events)
+
+        metrics.timing("tasks.store.save_event_batch.size", len(events))
+
+        if len(events) == 1:
+            save_event.delay(data=None, project_id=project_id, **events[0])
+        else:
+            save_event_batch.delay(events=events, project_id=project_id)
+
+        if self.on_submit is not None:
+            self.on_submit(project_id, events)
+
+
+def _do_preprocess_event(
+    cache_key, data, start_time, event_id, process_task, project, save_batch=None
+):
     from sentry.lang.native.processing import should_process_with_symbolicator
 
     if cache_key and data is None:
@@ -148,7 +215,15 @@ def _do_preprocess_event(cache_key, data, start_time, event_id, process_task, pr
         )
         return
 
-    submit_save_event(project, from_reprocessing, cache_key, event_id, start_time, original_data)
+    submit_save_event(
+        project,
+        from_reprocessing,
+        cache_key,
+        event_id,
+        start_time,
+        original_data,
+        save_batch=save_batch,
+    )
 
 
 @instrumented_task(
@@ -158,7 +233,13 @@ def _do_preprocess_event(cache_key, data, start_time, event_id, process_task, pr
     soft_time_limit=60,
 )
 def preprocess_event(
-    cache_key=None, data=None, start_time=None, event_id=None, project=None, **kwargs
+    cache_key=None,
+    data=None,
+    start_time=None,
+    event_id=None,
+    project=None,
+    save_batch=None,
+    **kwargs,
 ):
     return _do_preprocess_event(
         cache_key=cache_key,
@@ -167,6 +248,7 @@ def preprocess_event(
         event_id=event_id,
         process_task=process_event,
         project=project,
+        save_batch=save_batch,
     )
 
 
@@ -791,6 +873,131 @@ def _do_save_event(
             time_synthetic_monitoring_event(data, project_id, start_time)
 
 
+def _do_save_event_batch(events, project_id):
+    """
+    Saves a batch of error events of the same project to the database.
+
+    :param events: A list of dictionaries with ``cache_key``, ``event_id`` and
+        ``start_time`` of every event.
+    """
+
+    set_current_event_project(project_id)
+
+    from sentry.event_manager import save_error_events
+
+    with metrics.timer("tasks.store.do_save_event_batch.get_cache"):
+        datas = event_processing_store.get_many([event["cache_key"] for event in events])
+
+    jobs = []
+
+    for event in events:
+        cache_key = event["cache_key"]
+        data = datas.get(cache_key)
+        if data is not None:
+            data = CanonicalKeyDict(data)
+
+        event_id = event["event_id"]
+        if event_id is None and data is not None:
+            event_id = data["event_id"]
+
+        # See ``_do_save_event`` for why raw events are deleted even if the
+        # data cannot be found.
+        if not data or reprocessing.event_supports_reprocessing(data):
+            with metrics.timer("tasks.store.do_save_event.delete_raw_event"):
+                delete_raw_event(project_id, event_id, allow_hint_clear=True)
+
+        if not data:
+            metrics.incr(
+                "events.failed", tags={"reason": "cache", "stage": "post"}, skip_internal=False
+            )
+            continue
+
+        jobs.append(
+            {
+                "data": data,
+                "project_id": project_id,
+                "raw": False,
+                "start_time": event["start_time"],
+                "cache_key": cache_key,
+            }
+        )
+
+    if not jobs:
+        return
+
+    project = Project.objects.get_from_cache(id=project_id)
+
+    # Events that are not assigned to a group have not been written yet and
+    # are saved on their own instead, so that a single event that cannot be
+    # saved does not take the rest of the batch with it. Their payloads and
+    # attachments are still cached.
+    failed_jobs = []
+    saved = False
+    try:
+        with metrics.timer("tasks.store.do_save_event_batch.save_error_events"):
+            save_error_events(jobs, {project.id: project}, failed_jobs=failed_jobs)
+        saved = True
+    except Exception:
+        error_logger.exception(
+            "tasks.store.save_event_batch.failed", extra={"project_id": project_id}
+        )
+        if not any("group" in job or "hash_discarded" in job for job in jobs):
+            failed_jobs = jobs
+
+    if failed_jobs:
+        metrics.incr(
+            "tasks.store.save_event_batch.fallback", amount=len(failed_jobs), skip_internal=True
+        )
+        for job in failed_jobs:
+            save_event.delay(
+                cache_key=job["cache_key"],
+                data=None,
+                start_time=job["start_time"],
+                event_id=job["data"].get("event_id"),
+                project_id=project_id,
+            )
+
+    # Events that were (partially) written are never saved again, as that
+    # would count them twice.
+    failed_job_ids = {id(job) for job in failed_jobs}
+    handled_jobs = [job for job in jobs if id(job) not in failed_job_ids]
+
+    try:
+        for job in handled_jobs:
+            if job.get("hash_discarded") is not None:
+                # Delete the event payload from cache since it won't show up in post-processing.
+                with metrics.timer("tasks.store.do_save_event.delete_cache"):
+                    event_processing_store.delete_by_key(job["cache_key"])
+                continue
+
+            if not saved:
+                continue
+
+            # Put the updated event back into the cache so that post_process
+            # has the most recent data.
+            data = job["event"].data.data
+            if isinstance(data, CANONICAL_TYPES):
+                data = dict(data.items())
+            with metrics.timer("tasks.store.do_save_event.write_processing_cache"):
+                event_processing_store.store(data)
+
+    finally:
+        for job in handled_jobs:
+            data = job["data"]
+            start_time = job["start_time"]
+
+            reprocessing2.mark_event_reprocessed(data)
+            with metrics.timer("tasks.store.do_save_event.delete_attachment_cache"):
+                attachment_cache.delete(job["cache_key"])
+
+            if start_time:
+                metrics.timing(
+                    "events.time-to-process", time() - start_time, instance=data["platform"]
+                )
+
+            time_synthetic_monitoring_event(data, project_id, start_time)
+
+
 def time_synthetic_monitoring_event(data, project_id, start_time):
     """
     For special events produced by the recurring synthetic monitoring
@@ -849,3 +1056,13 @@ def save_event(
     cache_key=None, data=None, start_time=None, event_id=None, project_id=None, **kwargs
 ):
     _do_save_event(cache_key, data, start_time, event_id, project_id, **kwargs)
+
+
+@instrumented_task(
+    name="sentry.tasks.store.save_event_batch",
+    queue="events.save_event",
+    time_limit=305,
+    soft_time_limit=300,
+)
+def save_event_batch(events=None, project_id=None, **kwargs):
+    _do_save_event_batch(events, project_id)
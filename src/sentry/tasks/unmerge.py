@@ -1,12 +1,14 @@
 import logging
+import time
 from collections import OrderedDict, defaultdict
 from functools import reduce
 from typing import Any, Mapping, Optional, Tuple
 
+from celery.task import current
 from django.db import transaction
 
-from sentry import eventstore, similarity
-from sentry.app import tsdb
+from sentry import eventstore, options, similarity
+from sentry.app import locks, tsdb
 from sentry.constants import DEFAULT_LOGGER_NAME, LOG_LEVELS_MAP
 from sentry.event_manager import generate_culprit
 from sentry.models import (
@@ -24,10 +26,24 @@ from sentry.models import (
 )
 from sentry.tasks.base import instrumented_task
 from sentry.unmerge import InitialUnmergeArgs, SuccessiveUnmergeArgs, UnmergeArgs, UnmergeArgsBase
+from sentry.utils import metrics
+from sentry.utils.cache import default_cache
+from sentry.utils.hashlib import hash_values
+from sentry.utils.locking import UnableToAcquireLock
 from sentry.utils.query import celery_run_batch_query
+from sentry.utils.sdk import capture_exception
 
 logger = logging.getLogger(__name__)
 
+MAX_RETRIES = 5
+
+# Checkpoints outlive retries and the time an unmerge waits in the queue.
+CHECKPOINT_TTL = 60 * 60 * 24
+
+# Seconds a task may take for a batch on top of the time budget before its
+# lock expires.
+LOCK_TIMEOUT = 60 * 10
+
 
 def cache(function):
     results = {}
@@ -395,16 +411,27 @@ def collect_tsdb_data(caches, project, events):
 def repair_tsdb_data(caches, project, events):
     counters, sets, frequencies = collect_tsdb_data(caches, project, events)
 
+    # Write each kind of data with one bulk request per environment rather
+    # than one request per key.
+    counters_by_environment = defaultdict(list)
     for timestamp, data in counters.items():
         for model, keys in data.items():
             for (key, environment_id), value in keys.items():
-                tsdb.incr(model, key, timestamp, value, environment_id=environment_id)
+                counters_by_environment[environment_id].append(
+                    (model, key, {"timestamp": timestamp, "count": value})
+                )
+
+    for environment_id, items in counters_by_environment.items():
+        tsdb.incr_multi(items, environment_id=environment_id)
 
     for timestamp, data in sets.items():
+        sets_by_environment = defaultdict(list)
         for model, keys in data.items():
             for (key, environment_id), values in keys.items():
-                # TODO: This should use `record_multi` rather than `record`.
-                tsdb.record(model, key, values, timestamp, environment_id=environment_id)
+                sets_by_environment[environment_id].append((model, key, values))
+
+        for environment_id, items in sets_by_environment.items():
+            tsdb.record_multi(items, timestamp, environment_id=environment_id)
 
     for timestamp, data in frequencies.items():
         tsdb.record_frequency_multi(data.items(), timestamp)
@@ -415,8 +442,7 @@ def repair_denormalizations(caches, project, events):
     repair_group_release_data(caches, project, events)
     repair_tsdb_data(caches, project, events)
 
-    for event in events:
-        similarity.record(project, [event])
+    similarity.record(project, events)
 
 
 def lock_hashes(project_id, source_id, fingerprints):
@@ -444,36 +470,91 @@ def unlock_hashes(project_id, locked_primary_hashes):
     ).update(state=GroupHash.State.UNLOCKED)
 
 
-@instrumented_task(name="sentry.tasks.unmerge", queue="unmerge")
-def unmerge(*posargs, **kwargs):
-    args = UnmergeArgsBase.parse_arguments(*posargs, **kwargs)
+class RetryUnmerge(Exception):
+    """
+    Raised if a batch failed before it changed anything, so that the unmerge
+    can be retried from the arguments the batch started with.
+    """
 
-    source = Group.objects.get(project_id=args.project_id, id=args.source_id)
+    def __init__(self, unmerge_args):
+        super().__init__(unmerge_args)
+        self.unmerge_args = unmerge_args
 
-    caches = get_caches()
 
-    project = caches["Project"](args.project_id)
+def get_checkpoint_key(args: UnmergeArgs) -> str:
+    hashes = hash_values(sorted(args.replacement.primary_hashes_to_lock))
+    return f"unmerge:checkpoint:{args.project_id}:{args.source_id}:{hashes}"
 
-    # On the first iteration of this loop, we clear out all of the
-    # denormalizations from the source group so that we can have a clean slate
-    # for the new, repaired data.
-    if isinstance(args, InitialUnmergeArgs):
-        locked_primary_hashes = lock_hashes(
-            args.project_id, args.source_id, args.replacement.primary_hashes_to_lock
-        )
-        truncate_denormalizations(project, source)
-        last_event = None
-    else:
-        last_event = args.last_event
-        locked_primary_hashes = args.locked_primary_hashes
 
-    last_event, events = celery_run_batch_query(
-        filter=eventstore.Filter(project_ids=[args.project_id], group_ids=[source.id]),
+def load_checkpoint(args: UnmergeArgs) -> Optional[UnmergeArgs]:
+    """
+    Returns the arguments of the next batch of the unmerge described by
+    ``args``, if a previous attempt of it already made progress, or ``None``
+    if the unmerge has already been completed.
+    """
+    data = default_cache.get(get_checkpoint_key(args))
+    if data is not None:
+        return UnmergeArgsBase.parse_arguments(**data)
+
+    # Hashes are unlocked once all events have been migrated, so this is a
+    # duplicate of a task that has already been processed.
+    if (
+        isinstance(args, SuccessiveUnmergeArgs)
+        and args.locked_primary_hashes
+        and not GroupHash.objects.filter(
+            project_id=args.project_id,
+            hash__in=args.locked_primary_hashes,
+            state=GroupHash.State.LOCKED_IN_MIGRATION,
+        ).exists()
+    ):
+        return None
+
+    return args
+
+
+def start_unmerge(source, project, args: InitialUnmergeArgs) -> SuccessiveUnmergeArgs:
+    """
+    Locks the hashes to migrate and clears out all of the denormalizations
+    from the source group, so that we can have a clean slate for the new,
+    repaired data.
+    """
+    locked_primary_hashes = lock_hashes(
+        args.project_id, args.source_id, args.replacement.primary_hashes_to_lock
+    )
+    truncate_denormalizations(project, source)
+
+    return SuccessiveUnmergeArgs(
+        project_id=args.project_id,
+        source_id=args.source_id,
+        replacement=args.replacement,
+        actor_id=args.actor_id,
         batch_size=args.batch_size,
-        state=last_event,
-        referrer="unmerge",
+        last_event=None,
+        destinations=args.destinations,
+        locked_primary_hashes=locked_primary_hashes,
+        source_fields_reset=False,
     )
 
+
+def unmerge_batch(
+    source, caches, project, args: SuccessiveUnmergeArgs
+) -> Optional[SuccessiveUnmergeArgs]:
+    """
+    Migrates the next batch of events of ``source``. Returns the arguments to
+    continue with, or ``None`` once all events have been processed.
+    """
+    locked_primary_hashes = args.locked_primary_hashes
+
+    try:
+        last_event, events = celery_run_batch_query(
+            filter=eventstore.Filter(project_ids=[args.project_id], group_ids=[source.id]),
+            batch_size=args.batch_size,
+            state=args.last_event,
+            referrer="unmerge",
+        )
+    except Exception as error:
+        raise RetryUnmerge(args) from error
+
     # If there are no more events to process, we're done with the migration.
     if not events:
         unlock_hashes(args.project_id, locked_primary_hashes)
@@ -481,7 +562,7 @@ def unmerge(*posargs, **kwargs):
             logger.warning("Unmerge complete (eventstream state: %s)", eventstream_state)
             if eventstream_state:
                 args.replacement.stop_snuba_replacement(eventstream_state)
-        return
+        return None
 
     source_events = []
     destination_events = {}
@@ -493,7 +574,7 @@ def unmerge(*posargs, **kwargs):
         else:
             source_events.append(event)
 
-    source_fields_reset = isinstance(args, SuccessiveUnmergeArgs) and args.source_fields_reset
+    source_fields_reset = args.source_fields_reset
 
     if source_events:
         if not source_fields_reset:
@@ -525,7 +606,7 @@ def unmerge(*posargs, **kwargs):
 
     repair_denormalizations(caches, project, events)
 
-    new_args = SuccessiveUnmergeArgs(
+    return SuccessiveUnmergeArgs(
         project_id=args.project_id,
         source_id=args.source_id,
         replacement=args.replacement,
@@ -537,4 +618,71 @@ def unmerge(*posargs, **kwargs):
         source_fields_reset=source_fields_reset,
     )
 
-    unmerge.delay(**new_args.dump_arguments())
+
+def run_unmerge(args: UnmergeArgs) -> Optional[SuccessiveUnmergeArgs]:
+    """
+    Processes batches of events until the ``unmerge.time-budget`` is used up.
+    Returns the arguments to continue with, or ``None`` once the unmerge is
+    complete.
+    """
+    # Progress is checkpointed after every batch, so that a task that is
+    # delivered more than once continues after the last batch that was
+    # completed.
+    checkpoint_key = get_checkpoint_key(args)
+    args = load_checkpoint(args)
+    if args is None:
+        return None
+
+    source = Group.objects.get(project_id=args.project_id, id=args.source_id)
+
+    caches = get_caches()
+
+    project = caches["Project"](args.project_id)
+
+    if isinstance(args, InitialUnmergeArgs):
+        args = start_unmerge(source, project, args)
+        default_cache.set(checkpoint_key, args.dump_arguments(), CHECKPOINT_TTL)
+
+    deadline = time.time() + options.get("unmerge.time-budget")
+    while True:
+        args = unmerge_batch(source, caches, project, args)
+        if args is None:
+            default_cache.delete(checkpoint_key)
+            return None
+
+        default_cache.set(checkpoint_key, args.dump_arguments(), CHECKPOINT_TTL)
+        metrics.incr("unmerge.batch", skip_internal=True)
+
+        if time.time() >= deadline:
+            return args
+
+
+@instrumented_task(
+    name="sentry.tasks.unmerge",
+    queue="unmerge",
+    default_retry_delay=60,
+    max_retries=MAX_RETRIES,
+)
+def unmerge(*posargs, **kwargs):
+    args = UnmergeArgsBase.parse_arguments(*posargs, **kwargs)
+
+    # Only one task of an unmerge may process its batches at a time.
+    lock = locks.get(
+        get_checkpoint_key(args),
+        duration=options.get("unmerge.time-budget") + LOCK_TIMEOUT,
+    )
+
+    try:
+        with lock.acquire():
+            args = run_unmerge(args)
+    except UnableToAcquireLock as error:
+        logger.warning("unmerge.locked", extra={"error": error, "source_id": args.source_id})
+        return
+    except RetryUnmerge as error:
+        # Batches are not idempotent, so they are only retried if they failed
+        # before they changed anything.
+        capture_exception()
+        current.retry(kwargs=error.unmerge_args.dump_arguments(), exc=error.__cause__)
+
+    if args is not None:
+        unmerge.delay(**args.dump_arguments())
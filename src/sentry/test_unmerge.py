@@ -75,3 +75,23 @@ def test_argument_parsing_page2():
     )
 
     assert UnmergeArgsBase.parse_arguments(**args.dump_arguments()) == args
+
+
+def test_argument_parsing_locked_hashes():
+    """
+    Tests task invocations after the hashes have been locked, but before the
+    first page has been processed.
+    """
+    args = SuccessiveUnmergeArgs(
+        project_id=123,
+        source_id=345,
+        destinations={},
+        replacement=PrimaryHashUnmergeReplacement(fingerprints=["a" * 32]),
+        actor_id=None,
+        last_event=None,
+        locked_primary_hashes=["a" * 32],
+        batch_size=500,
+        source_fields_reset=False,
+    )
+
+    assert UnmergeArgsBase.parse_arguments(**args.dump_arguments()) == args
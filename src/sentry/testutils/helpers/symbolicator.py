@@ -0,0 +1,114 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+from uuid import uuid4
+
+from sentry.utils import json
+
+__all__ = ["LocalSymbolicator"]
+
+
+class LocalSymbolicator:
+    """
+    A stand-in for the symbolicator HTTP API that runs in a background thread,
+    for tests and benchmarks that should not depend on a symbolicator
+    service::
+
+        with LocalSymbolicator(pending_polls=1) as symbolicator:
+            with self.options({"symbolicator.options": {"url": symbolicator.url}}):
+                ...
+
+    Every task it creates is reported as pending ``pending_polls`` times
+    before it returns ``response``. It keeps the requests it received in
+    ``requests`` as ``(method, path, client_address)`` tuples.
+    """
+
+    def __init__(self, response=None, pending_polls=0):
+        self.response = response or {"status": "completed", "stacktraces": [], "modules": []}
+        self.pending_polls = pending_polls
+        self.requests = []
+        self.tasks = {}
+        self.lock = threading.Lock()
+        self.server = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return f"http://{host}:{port}/"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _create_task(self):
+        with self.lock:
+            task_id = uuid4().hex
+            self.tasks[task_id] = self.pending_polls
+        return self._poll_task(task_id)
+
+    def _poll_task(self, task_id):
+        with self.lock:
+            remaining = self.tasks.get(task_id)
+            if remaining is None:
+                return None
+            if remaining > 0:
+                self.tasks[task_id] = remaining - 1
+                return {"status": "pending", "request_id": task_id, "retry_after": 0}
+            # Symbolicator forgets a task once its result has been fetched.
+            del self.tasks[task_id]
+        return self.response
+
+    def _make_handler(self):
+        symbolicator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _respond(self, body):
+                if body is None:
+                    self.send_response(404)
+                    payload = b""
+                else:
+                    self.send_response(200)
+                    payload = json.dumps(body).encode("utf-8")
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                path = urlparse(self.path).path
+                symbolicator.requests.append(("GET", path, self.client_address))
+                if path == "/healthcheck":
+                    self._respond({})
+                elif path.startswith("/requests/"):
+                    self._respond(symbolicator._poll_task(path[len("/requests/") :]))
+                else:
+                    self._respond(None)
+
+            def do_POST(self):
+                path = urlparse(self.path).path
+                symbolicator.requests.append(("POST", path, self.client_address))
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if path in ("/symbolicate", "/minidump", "/applecrashreport"):
+                    self._respond(symbolicator._create_task())
+                else:
+                    self._respond(None)
+
+        return Handler
@@ -164,6 +164,17 @@ class RedisTSDB(BaseTSDB):
 
         Returns a 2-tuple that contains the hash key and the hash field.
         """
+        vnode, hash_field = self.get_counter_vnode_and_field(key, environment_id)
+        return (
+            self.make_counter_hash_key(model, self.normalize_to_rollup(timestamp, rollup), vnode),
+            hash_field,
+        )
+
+    def get_counter_vnode_and_field(self, key, environment_id):
+        """
+        Returns a 2-tuple of the vnode and the hash field that are used for the
+        counter values of ``key``. Both are the same for all rollup epochs.
+        """
         model_key = self.get_model_key(key)
 
         if isinstance(model_key, int):
@@ -171,14 +182,15 @@ class RedisTSDB(BaseTSDB):
         else:
             vnode = crc32(force_bytes(model_key)) % self.vnodes
 
-        return (
-            "{prefix}{model}:{epoch}:{vnode}".format(
-                prefix=self.prefix,
-                model=model.value,
-                epoch=self.normalize_to_rollup(timestamp, rollup),
-                vnode=vnode,
-            ),
-            self.add_environment_parameter(model_key, environment_id),
+        return vnode, self.add_environment_parameter(model_key, environment_id)
+
+    def make_counter_hash_key(self, model, epoch, vnode):
+        """
+        Make the key of the hash that holds the counter values of all keys of
+        a vnode for the rollup epoch ``epoch``.
+        """
+        return "{prefix}{model}:{epoch}:{vnode}".format(
+            prefix=self.prefix, model=model.value, epoch=epoch, vnode=vnode
         )
 
     def get_model_key(self, key):
@@ -279,27 +291,34 @@ class RedisTSDB(BaseTSDB):
         self.validate_arguments([model], [environment_id])
 
         rollup, series = self.get_optimal_rollup_series(start, end, rollup)
-        series = map(to_datetime, series)
 
-        results = []
+        # All keys that share a vnode are stored in the same hash for a rollup
+        # epoch, so their counters are fetched with a single HMGET per vnode
+        # and epoch rather than one HGET per key and epoch.
+        fields_by_vnode = defaultdict(list)
+        for key in keys:
+            vnode, hash_field = self.get_counter_vnode_and_field(key, environment_id)
+            fields_by_vnode[vnode].append((key, hash_field))
+
+        responses = []
         cluster, _ = self.get_cluster(environment_id)
         with cluster.map() as client:
-            for key in keys:
-                for timestamp in series:
-                    hash_key, hash_field = self.make_counter_key(
-                        model, rollup, timestamp, key, environment_id
-                    )
-                    results.append(
-                        (to_timestamp(timestamp), key, client.hget(hash_key, hash_field))
+            for vnode, fields in fields_by_vnode.items():
+                hash_fields = [hash_field for _, hash_field in fields]
+                for index, timestamp in enumerate(series):
+                    hash_key = self.make_counter_hash_key(
+                        model, self.normalize_ts_to_rollup(timestamp, rollup), vnode
                     )
+                    responses.append((index, fields, client.hmget(hash_key, hash_fields)))
 
-        results_by_key = defaultdict(dict)
-        for epoch, key, count in results:
-            results_by_key[key][epoch] = int(count.value or 0)
+        counts_by_key = {key: [0] * len(series) for key in keys}
+        for index, fields, response in responses:
+            for (key, _), count in zip(fields, response.value):
+                if count is not None:
+                    counts_by_key[key][index] = int(count)
 
-        for key, points in results_by_key.items():
-            results_by_key[key] = sorted(points.items())
-        return dict(results_by_key)
+        timestamps = [to_timestamp(to_datetime(timestamp)) for timestamp in series]
+        return {key: list(zip(timestamps, counts)) for key, counts in counts_by_key.items()}
 
     def merge(self, model, destination, sources, timestamp=None, environment_ids=None):
         environment_ids = (set(environment_ids) if environment_ids is not None else set()).union(
@@ -174,7 +174,7 @@ class UnmergeArgsBase(abc.ABC):
             else:
                 destinations = {}
 
-        if last_event is None:
+        if last_event is None and locked_primary_hashes is None:
             assert eventstream_state is None
             assert not source_fields_reset
 
@@ -218,6 +218,8 @@ class InitialUnmergeArgs(UnmergeArgsBase):
 
 @dataclass(frozen=True)
 class SuccessiveUnmergeArgs(UnmergeArgsBase):
+    # ``None`` if the hashes have been locked but no page has been processed
+    # yet.
     last_event: Optional[Any]
     locked_primary_hashes: Collection[str]
 
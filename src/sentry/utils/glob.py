@@ -1,5 +1,8 @@
 import sentry_relay
 
+#: Characters with a special meaning in glob patterns.
+GLOB_CHARACTERS = frozenset("*?[]{}\\")
+
 
 def glob_match(
     value, pat, doublestar=False, ignorecase=False, path_normalize=False, allow_newline=True
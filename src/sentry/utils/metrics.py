@@ -1,9 +1,10 @@
-__all__ = ["timing", "incr"]
+__all__ = ["timing", "incr", "gauge"]
 
 
 import functools
 import logging
 import time
+from collections import defaultdict
 from contextlib import contextmanager
 from queue import Queue
 from random import random
@@ -87,19 +88,33 @@ class InternalMetrics:
             from sentry import tsdb
 
             while True:
-                key, instance, tags, amount, sample_rate = q.get()
-                amount = _sampled_value(amount, sample_rate)
-                if instance:
-                    full_key = f"{key}.{instance}"
-                else:
-                    full_key = key
+                # Everything that is queued up is written at once, summing up
+                # the increments of each key.
+                items = [q.get()]
+                while len(items) < 1000 and not q.empty():
+                    items.append(q.get_nowait())
+
+                counts = defaultdict(int)
+                for key, instance, tags, amount, sample_rate in items:
+                    if instance:
+                        full_key = f"{key}.{instance}"
+                    else:
+                        full_key = key
+                    counts[full_key] += _sampled_value(amount, sample_rate)
+
+                keys_by_count = defaultdict(list)
+                for full_key, count in counts.items():
+                    keys_by_count[count].append((tsdb.models.internal, full_key))
+
                 try:
-                    tsdb.incr(tsdb.models.internal, full_key, count=amount)
+                    for count, keys in keys_by_count.items():
+                        tsdb.incr_multi(keys, count=count)
                 except Exception:
                     logger = logging.getLogger("sentry.errors")
                     logger.exception("Unable to incr internal metric")
                 finally:
-                    q.task_done()
+                    for _ in items:
+                        q.task_done()
 
         t = Thread(target=worker)
         t.setDaemon(True)
@@ -166,6 +181,18 @@ def timing(key, value, instance=None, tags=None, sample_rate=settings.SENTRY_MET
         logger.exception("Unable to record backend metric")
 
 
+def gauge(key, value, instance=None, tags=None, sample_rate=settings.SENTRY_METRICS_SAMPLE_RATE):
+    current_tags = _get_current_global_tags()
+    if tags is not None:
+        current_tags.update(tags)
+
+    try:
+        backend.gauge(key, value, instance, current_tags, sample_rate)
+    except Exception:
+        logger = logging.getLogger("sentry.errors")
+        logger.exception("Unable to record backend metric")
+
+
 @contextmanager
 def timer(key, instance=None, tags=None, sample_rate=settings.SENTRY_METRICS_SAMPLE_RATE):
     current_tags = _get_current_global_tags()
@@ -1,8 +1,10 @@
 import functools
 import logging
 import os
+import random
 import re
 import time
+import zlib
 from collections import OrderedDict, namedtuple
 from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
@@ -23,6 +25,7 @@ from sentry_sdk import Hub
 from snuba_sdk.legacy import json_to_snql
 from snuba_sdk.query import Query
 
+from sentry import options
 from sentry.models import (
     Environment,
     Group,
@@ -39,6 +42,7 @@ from sentry.snuba.events import Columns
 from sentry.utils import json, metrics
 from sentry.utils.compat import map
 from sentry.utils.dates import outside_retention_with_modified_start, to_timestamp
+from sentry.utils.locking import UnableToAcquireLock
 from sentry.utils.snql import SNQLOption, should_use_snql
 
 logger = logging.getLogger(__name__)
@@ -683,8 +687,9 @@ def get_cache_key(query: SnubaQuery) -> str:
     else:
         hashable = json.dumps(query, sort_keys=True)
 
-    # sqc - Snuba Query Cache
-    return f"sqc:{sha1(hashable.encode('utf-8')).hexdigest()}"
+    # sqc - Snuba Query Cache. The version is part of the key, so that results
+    # cached by previous versions in another format are never read.
+    return f"sqc2:{sha1(hashable.encode('utf-8')).hexdigest()}"
 
 
 def bulk_raw_query(
@@ -713,29 +718,56 @@ def _apply_cache_and_build_results(
     query_param_list = list(enumerate(snuba_param_list))
 
     results = []
+    locked = []
+    waiting = []
 
     if use_cache:
+        metric_tags = {"referrer": referrer} if referrer else None
         cache_keys = [get_cache_key(query_params) for _, query_params in query_param_list]
         cache_data = cache.get_many(cache_keys)
         to_query: List[Tuple[int, SnubaQueryBody, Optional[str]]] = []
+        now = time.time()
         for (query_pos, query_params), cache_key in zip(query_param_list, cache_keys):
             cached_result = cache_data.get(cache_key)
-            metric_tags = {"referrer": referrer} if referrer else None
             if cached_result is None:
                 metrics.incr("snuba.query_cache.miss", tags=metric_tags)
                 to_query.append((query_pos, query_params, cache_key))
+                continue
+
+            result, fresh_until = _load_cached_result(cached_result)
+            if fresh_until < now and options.get("snuba.query-cache.stale-seconds") > 0:
+                metrics.incr("snuba.query_cache.stale", tags=metric_tags)
+                _revalidate_cached_result(query_params, cache_key, referrer, headers, snql_option)
             else:
                 metrics.incr("snuba.query_cache.hit", tags=metric_tags)
-                results.append((query_pos, json.loads(cached_result)))
+            results.append((query_pos, result))
+
+        # Identical queries that are already running elsewhere are not sent
+        # again, their results are picked up from the cache instead.
+        if to_query and options.get("snuba.query-cache.single-flight-timeout") > 0:
+            own_queries = []
+            for item in to_query:
+                lock = _get_query_lock(item[2])
+                try:
+                    lock.acquire()
+                except UnableToAcquireLock:
+                    waiting.append(item)
+                else:
+                    locked.append(lock)
+                    own_queries.append(item)
+            to_query = own_queries
     else:
         to_query = [(query_pos, query_params, None) for query_pos, query_params in query_param_list]
 
-    if to_query:
-        query_results = _bulk_snuba_query(map(itemgetter(1), to_query), headers, snql_option)
-        for result, (query_pos, _, cache_key) in zip(query_results, to_query):
-            if cache_key:
-                cache.set(cache_key, json.dumps(result), settings.SENTRY_SNUBA_CACHE_TTL_SECONDS)
-            results.append((query_pos, result))
+    try:
+        if to_query:
+            results.extend(_run_cacheable_queries(to_query, referrer, headers, snql_option))
+    finally:
+        for lock in locked:
+            lock.release()
+
+    if waiting:
+        results.extend(_wait_for_cached_results(waiting, referrer, headers, snql_option))
 
     # Sort so that we get the results back in the original param list order
     results.sort()
@@ -743,6 +775,124 @@ def _apply_cache_and_build_results(
     return map(itemgetter(1), results)
 
 
+def _get_cache_ttl(referrer: Optional[str]) -> int:
+    ttls = options.get("snuba.query-cache.referrer-ttls")
+    return ttls.get(referrer, settings.SENTRY_SNUBA_CACHE_TTL_SECONDS)
+
+
+def _get_query_lock(cache_key: str):
+    from sentry.app import locks
+
+    return locks.get(f"{cache_key}:lock", duration=settings.SENTRY_SNUBA_TIMEOUT)
+
+
+def _dump_cached_result(result: Mapping[str, Any], ttl: int) -> Tuple[float, bytes]:
+    return time.time() + ttl, zlib.compress(json.dumps(result).encode("utf-8"))
+
+
+def _load_cached_result(cached_result: Any) -> Tuple[Mapping[str, Any], float]:
+    """
+    Returns a cached result and the timestamp until which it is fresh.
+    """
+    fresh_until, payload = cached_result
+    return json.loads(zlib.decompress(payload)), fresh_until
+
+
+def _run_cacheable_queries(
+    to_query: Sequence[Tuple[int, SnubaQueryBody, Optional[str]]],
+    referrer: Optional[str],
+    headers: Mapping[str, str],
+    snql_option: Optional[SNQLOption],
+) -> List[Tuple[int, Mapping[str, Any]]]:
+    """
+    Runs queries and caches the results of those with a cache key.
+    """
+    results = []
+    ttl = _get_cache_ttl(referrer)
+    metric_tags = {"referrer": referrer} if referrer else None
+
+    with metrics.timer("snuba.query_cache.query", tags=metric_tags):
+        query_results = _bulk_snuba_query(map(itemgetter(1), to_query), headers, snql_option)
+
+    for result, (query_pos, _, cache_key) in zip(query_results, to_query):
+        if cache_key:
+            cache.set(
+                cache_key,
+                _dump_cached_result(result, ttl),
+                ttl + options.get("snuba.query-cache.stale-seconds"),
+            )
+        results.append((query_pos, result))
+    return results
+
+
+def _wait_for_cached_results(
+    waiting: Sequence[Tuple[int, SnubaQueryBody, str]],
+    referrer: Optional[str],
+    headers: Mapping[str, str],
+    snql_option: Optional[SNQLOption],
+) -> List[Tuple[int, Mapping[str, Any]]]:
+    """
+    Polls the cache for the results of queries that are run by someone else,
+    and runs the queries whose results do not show up in time.
+    """
+    results = []
+    metric_tags = {"referrer": referrer} if referrer else None
+    stop = time.monotonic() + options.get("snuba.query-cache.single-flight-timeout")
+    delay = 0.01
+
+    while waiting and time.monotonic() < stop:
+        time.sleep(min(delay * random.random(), max(stop - time.monotonic(), 0)))
+        delay *= 2
+
+        cache_data = cache.get_many([cache_key for _, _, cache_key in waiting])
+        still_waiting = []
+        for item in waiting:
+            cached_result = cache_data.get(item[2])
+            if cached_result is None:
+                still_waiting.append(item)
+            else:
+                metrics.incr("snuba.query_cache.coalesced", tags=metric_tags)
+                results.append((item[0], _load_cached_result(cached_result)[0]))
+        waiting = still_waiting
+
+    if waiting:
+        metrics.incr("snuba.query_cache.coalesce_timeout", amount=len(waiting), tags=metric_tags)
+        results.extend(_run_cacheable_queries(waiting, referrer, headers, snql_option))
+
+    return results
+
+
+def _revalidate_cached_result(
+    query_params: SnubaQueryBody,
+    cache_key: str,
+    referrer: Optional[str],
+    headers: Mapping[str, str],
+    snql_option: Optional[SNQLOption],
+) -> None:
+    """
+    Refreshes a stale cached result in the background, unless someone else is
+    already doing it.
+    """
+    lock = _get_query_lock(cache_key)
+    try:
+        lock.acquire()
+    except UnableToAcquireLock:
+        return
+
+    # `_bulk_snuba_query` may modify the headers
+    headers = dict(headers)
+
+    def revalidate():
+        try:
+            _run_cacheable_queries([(0, query_params, cache_key)], referrer, headers, snql_option)
+        except Exception:
+            logger.warning("snuba.query_cache.revalidate_failed", exc_info=True)
+        finally:
+            lock.release()
+
+    _query_thread_pool.submit(revalidate)
+
+
 def _bulk_snuba_query(
     snuba_param_list: Sequence[SnubaQueryBody],
     headers: Mapping[str, str],
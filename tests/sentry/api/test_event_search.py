@@ -13,6 +13,7 @@ from sentry.api.event_search import (
     SearchFilter,
     SearchKey,
     SearchValue,
+    _parse_tree,
     parse_search_query,
 )
 from sentry.constants import MODULE_ROOT
@@ -241,6 +242,36 @@ class ParseSearchQueryBackendTest(unittest.TestCase):
                 SearchFilter(key=SearchKey(name="random"), operator="=", value=SearchValue("-2w"))
             ]
 
+    def test_parse_tree_cache(self):
+        now = timezone.now()
+        _parse_tree.cache_clear()
+        with freeze_time(now):
+            assert parse_search_query("first_seen:-1d") == [
+                SearchFilter(
+                    key=SearchKey(name="first_seen"),
+                    operator=">=",
+                    value=SearchValue(raw_value=now - timedelta(days=1)),
+                )
+            ]
+
+        # Relative dates are resolved again when the cached tree is reused
+        with freeze_time(now + timedelta(hours=1)):
+            assert parse_search_query("first_seen:-1d") == [
+                SearchFilter(
+                    key=SearchKey(name="first_seen"),
+                    operator=">=",
+                    value=SearchValue(raw_value=now + timedelta(hours=1) - timedelta(days=1)),
+                )
+            ]
+
+        # The config is applied to cached trees
+        config = SearchConfig(key_mappings={"seen": ["first_seen"]})
+        assert parse_search_query("first_seen:-1d", config=config)[0].key == SearchKey(name="seen")
+
+        cache_info = _parse_tree.cache_info()
+        assert cache_info.misses == 1
+        assert cache_info.hits == 2
+
     def test_aggregate_rel_time_filter(self):
         now = timezone.now()
         with freeze_time(now):
@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+from sentry.api.event_search import _parse_tree, parse_search_query
+from sentry.exceptions import InvalidSearchQuery
+from sentry.utils import json
+from tests.sentry.api.test_event_search import abs_fixtures_path
+
+
+def benchmark_available():
+    try:
+        import pytest_benchmark  # NOQA
+    except ModuleNotFoundError:
+        return False
+    else:
+        return True
+
+
+def load_queries():
+    queries = []
+    for file in sorted(os.listdir(abs_fixtures_path)):
+        with open(os.path.join(abs_fixtures_path, file)) as fp:
+            queries.extend(case["query"] for case in json.load(fp))
+    return queries
+
+
+QUERIES = load_queries()
+
+
+def parse_queries(queries):
+    for query in queries:
+        try:
+            parse_search_query(query)
+        except InvalidSearchQuery:
+            pass
+
+
+@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@pytest.mark.parametrize("cached", [False, True], ids=["uncached", "cached"])
+def test_benchmark_parse_search_query(cached, benchmark):
+    def setup():
+        if cached:
+            parse_queries(QUERIES)
+        else:
+            _parse_tree.cache_clear()
+        return (QUERIES,), {}
+
+    benchmark.pedantic(parse_queries, setup=setup, rounds=20)
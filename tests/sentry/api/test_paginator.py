@@ -63,6 +63,39 @@ class PaginatorTest(TestCase):
         result = paginator.count_hits(1)
         assert result == 1
 
+    def test_count_hits_estimate(self):
+        self.create_user("foo@example.com")
+        self.create_user("bar@example.com")
+
+        paginator = self.cls(User.objects.all(), "id")
+        with self.options(
+            {
+                "api.paginator.count-hits-strategy": "estimate",
+                "api.paginator.count-hits-estimate-factor": 1000.0,
+            }
+        ):
+            assert paginator.count_hits(1000) == 2
+
+        with self.options(
+            {
+                "api.paginator.count-hits-strategy": "estimate",
+                "api.paginator.count-hits-estimate-factor": 0.0,
+            }
+        ):
+            assert paginator.count_hits(1000) == 1000
+
+    def test_count_hits_cached(self):
+        self.create_user("foo@example.com")
+
+        paginator = self.cls(User.objects.all(), "id")
+        with self.options({"api.paginator.count-hits-cache-ttl": 60}):
+            assert paginator.count_hits(1000) == 1
+            self.create_user("bar@example.com")
+            assert paginator.count_hits(1000) == 1
+            assert paginator.count_hits(1) == 1
+
+        assert paginator.count_hits(1000) == 2
+
     def test_prev_emptyset(self):
         queryset = User.objects.all()
 
@@ -73,3 +73,32 @@ class BufferTest(TestCase):
         self.buf.process(Group, columns, filters, {"last_seen": the_date}, signal_only=True)
         group.refresh_from_db()
         assert group.times_seen == prev_times_seen
+
+    def test_process_batch(self):
+        project = self.create_project()
+        group = Group.objects.create(project=project)
+        other_group = Group.objects.create(project=project)
+        the_date = timezone.now() + timedelta(days=5)
+        self.buf.process_batch(
+            Group,
+            [
+                ({"times_seen": 2}, {"id": group.id}, {"last_seen": the_date}, None),
+                ({"times_seen": 3}, {"pk": other_group.id}, {}, None),
+                ({"times_seen": 1}, {"message": "foo bar", "project_id": project.id}, {}, None),
+            ],
+        )
+        group_ = Group.objects.get(id=group.id)
+        assert group_.times_seen == group.times_seen + 2
+        assert group_.last_seen == the_date
+        assert group_.score != group.score
+        assert Group.objects.get(id=other_group.id).times_seen == other_group.times_seen + 3
+        assert Group.objects.get(message="foo bar").times_seen == 2
+
+    @mock.patch("sentry.buffer.base.buffer_incr_complete")
+    def test_process_batch_signal_only(self, buffer_incr_complete):
+        group = Group.objects.create(project=Project(id=1))
+        prev_times_seen = group.times_seen
+        self.buf.process_batch(Group, [({"times_seen": 1}, {"id": group.id}, {}, True)])
+        group.refresh_from_db()
+        assert group.times_seen == prev_times_seen
+        assert buffer_incr_complete.send_robust.call_count == 1
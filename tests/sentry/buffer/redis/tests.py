@@ -121,6 +121,55 @@ class RedisBufferTest(TestCase):
         pending = client.zrange("b:p", 0, -1)
         assert pending == [b"foo"]
 
+    @mock.patch("sentry.buffer.redis.process_incr", mock.Mock())
+    def test_incr_coalesces(self):
+        self.buf.incr_coalesce_window = 60
+        client = self.buf.cluster.get_routing_client()
+        columns = {"times_seen": 1}
+        filters = {"pk": 1}
+        key = self.buf._make_key(Group, filters)
+        self.buf.incr(Group, columns, filters, extra={"foo": "bar"})
+        self.buf.incr(Group, columns, filters, extra={"foo": "baz"})
+        assert client.hgetall(key) == {}
+
+        self.buf.flush_pending_incrs()
+        result = {force_text(k): v for k, v in client.hgetall(key).items()}
+        assert pickle.loads(result.pop("f")) == filters
+        assert pickle.loads(result.pop("e+foo")) == "baz"
+        assert result == {"i+times_seen": b"2", "m": b"sentry.models.group.Group"}
+        assert client.zrange("b:p", 0, -1) == [key.encode("utf-8")]
+
+    @mock.patch("sentry.buffer.redis.process_incr", mock.Mock())
+    def test_incr_coalesce_max_keys(self):
+        self.buf.incr_coalesce_window = 60
+        self.buf.incr_coalesce_max_keys = 2
+        client = self.buf.cluster.get_routing_client()
+        self.buf.incr(Group, {"times_seen": 1}, {"pk": 1})
+        assert client.zrange("b:p", 0, -1) == []
+        self.buf.incr(Group, {"times_seen": 1}, {"pk": 2})
+        assert len(client.zrange("b:p", 0, -1)) == 2
+
+    @mock.patch("sentry.buffer.base.Buffer.process_batch")
+    def test_process_batch_keys(self, process_batch):
+        client = self.buf.cluster.get_routing_client()
+        client.hmset(
+            "foo",
+            {"f": '{"pk": ["i","1"]}', "i+times_seen": "2", "m": "sentry.models.Group"},
+        )
+        client.hmset(
+            "bar",
+            {"f": '{"pk": ["i","2"]}', "i+times_seen": "1", "m": "sentry.models.Group"},
+        )
+        client.zadd("b:p", {"foo": 1, "bar": 2})
+        self.buf.process(batch_keys=["foo", "bar", "baz"])
+        process_batch.assert_called_once_with(
+            Group,
+            [({"times_seen": 2}, {"pk": 1}, {}, None), ({"times_seen": 1}, {"pk": 2}, {}, None)],
+        )
+        assert client.zrange("b:p", 0, -1) == []
+        assert not client.exists("foo")
+        assert not client.exists("l:foo")
+
     @mock.patch("sentry.buffer.redis.RedisBuffer._make_key", mock.Mock(return_value="foo"))
     @mock.patch("sentry.buffer.redis.process_incr")
     @mock.patch("sentry.buffer.redis.process_pending")
@@ -1,6 +1,7 @@
 from sentry.data_export.base import ExportError
 from sentry.data_export.processors.discover import DiscoverProcessor
 from sentry.testutils import SnubaTestCase, TestCase
+from sentry.testutils.helpers.datetime import before_now
 
 
 class DiscoverProcessorTest(TestCase, SnubaTestCase):
@@ -40,3 +41,26 @@ class DiscoverProcessorTest(TestCase, SnubaTestCase):
         new_result_list = processor.handle_fields(result_list)
         assert new_result_list[0] != result_list
         assert new_result_list[0]["issue"] == self.group.qualified_short_id
+
+    def test_get_time_slices(self):
+        start, end = before_now(days=1), before_now()
+        query = {"field": ["title"], "query": ""}
+        assert DiscoverProcessor.get_time_slices(query, start, end) is None
+
+        with self.options({"data-export.discover-time-slices": 4}):
+            time_slices = DiscoverProcessor.get_time_slices(query, start, end)
+            assert len(time_slices) == 4
+            assert time_slices[0][0] == start
+            assert time_slices[-1][1] == end
+            for (_, slice_end), (slice_start, _) in zip(time_slices, time_slices[1:]):
+                assert slice_end == slice_start
+
+            query["sort"] = "-timestamp"
+            assert DiscoverProcessor.get_time_slices(query, start, end) == time_slices[::-1]
+
+            query["sort"] = "title"
+            assert DiscoverProcessor.get_time_slices(query, start, end) is None
+
+            for field, q in ((["count()"], ""), (["title"], "count():>5")):
+                query = {"field": field, "query": q}
+                assert DiscoverProcessor.get_time_slices(query, start, end) is None
@@ -599,6 +599,43 @@ class AssembleDownloadTest(TestCase, SnubaTestCase):
 
         assert emailer.called
 
+    @patch("sentry.data_export.models.ExportedData.email_success")
+    def test_discover_time_slices(self, emailer):
+        for minutes, environment in ((150, "test"), (90, "stage")):
+            self.store_event(
+                data={
+                    "tags": {"foo": "bar"},
+                    "fingerprint": ["group-1"],
+                    "timestamp": iso_format(before_now(minutes=minutes)),
+                    "environment": environment,
+                },
+                project_id=self.project.id,
+            )
+        de = ExportedData.objects.create(
+            user=self.user,
+            organization=self.org,
+            query_type=ExportQueryType.DISCOVER,
+            query_info={
+                "project": [self.project.id],
+                "field": ["environment"],
+                "sort": "-timestamp",
+                "query": "",
+                "statsPeriod": "8h",
+            },
+        )
+        with self.options({"data-export.discover-time-slices": 8}), self.tasks():
+            assemble_download(de.id, batch_size=1)
+        de = ExportedData.objects.get(id=de.id)
+        assert de.date_finished is not None
+        header, *rows = de.file.getfile().read().strip().split(b"\r\n")
+        assert header == b"environment"
+        # Rows of different time slices are written in order, the first three
+        # events share a timestamp.
+        assert sorted(rows[:3]) == [b"dev", b"prod", b"prod"]
+        assert rows[3:] == [b"stage", b"test"]
+
+        assert emailer.called
+
 
 class AssembleDownloadLargeTest(TestCase, SnubaTestCase):
     def setUp(self):
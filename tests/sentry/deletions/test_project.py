@@ -18,6 +18,7 @@ from sentry.models import (
 )
 from sentry.tasks.deletion import run_deletion
 from sentry.testutils import TestCase
+from sentry.utils.compat import mock
 
 
 class DeleteProjectTest(TestCase):
@@ -87,3 +88,42 @@ class DeleteProjectTest(TestCase):
         assert Commit.objects.filter(id=commit.id).exists()
         assert not ProjectDebugFile.objects.filter(id=dif.id).exists()
         assert not File.objects.filter(id=file.id).exists()
+
+    def test_sharded_groups(self):
+        project = self.create_project(name="test")
+        group_ids = [
+            self.store_event(data={"fingerprint": [f"group{i}"]}, project_id=project.id).group_id
+            for i in range(5)
+        ]
+
+        deletion = ScheduledDeletion.schedule(project, days=0)
+        deletion.update(in_progress=True)
+
+        with self.options({"deletions.project.group-shards": 3}), self.tasks():
+            run_deletion(deletion.id)
+
+        assert not Project.objects.filter(id=project.id).exists()
+        assert not Group.objects.filter(id__in=group_ids).exists()
+
+    def test_sharded_groups_pending(self):
+        project = self.create_project(name="test")
+        group_ids = [
+            self.store_event(data={"fingerprint": [f"group{i}"]}, project_id=project.id).group_id
+            for i in range(5)
+        ]
+
+        deletion = ScheduledDeletion.schedule(project, days=0)
+        deletion.update(in_progress=True)
+
+        # The shard tasks have not run yet, so the project task only deletes
+        # its own shard and waits for them.
+        with self.options({"deletions.project.group-shards": 3}), mock.patch(
+            "sentry.tasks.deletion.delete_project_groups"
+        ), mock.patch("sentry.tasks.deletion.run_deletion.apply_async") as run_again:
+            run_deletion(deletion.id)
+
+        assert run_again.called
+        assert Project.objects.filter(id=project.id).exists()
+        assert sorted(Group.objects.filter(id__in=group_ids).values_list("id", flat=True)) == [
+            group_id for group_id in sorted(group_ids) if group_id % 3 != 0
+        ]
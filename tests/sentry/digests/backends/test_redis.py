@@ -6,6 +6,7 @@ from sentry.digests import Record
 from sentry.digests.backends.base import InvalidState
 from sentry.digests.backends.redis import RedisBackend
 from sentry.testutils import TestCase
+from sentry.utils.compat import mock
 
 
 class RedisBackendTestCase(TestCase):
@@ -151,3 +152,49 @@ class RedisBackendTestCase(TestCase):
 
         with backend.digest("timeline", 0) as records:
             assert len(set(records)) == n
+
+    def test_digest_many(self):
+        backend = RedisBackend()
+
+        record_1 = Record("record:1", "value", time.time())
+        record_2 = Record("record:2", "value", time.time())
+        record_3 = Record("record:3", "value", time.time())
+        backend.add("timeline:1", record_1)
+        backend.add("timeline:2", record_2)
+        backend.add("timeline:3", record_3)
+
+        with backend.digest_many(
+            ["timeline:1", "timeline:2", "timeline:3", "timeline:4"], {"timeline:1": 0}
+        ) as records:
+            assert records == {
+                "timeline:1": [record_1],
+                "timeline:2": [record_2],
+                "timeline:3": [record_3],
+            }
+            # Timelines that are removed are not closed.
+            del records["timeline:3"]
+
+        # The closed timelines are waiting now.
+        with pytest.raises(InvalidState):
+            with backend.digest("timeline:2", 0):
+                pass
+
+        with backend.digest("timeline:3", 0) as records:
+            assert records == [record_3]
+
+        assert {entry.key for entry in backend.schedule(time.time())} == {
+            "timeline:1",
+            "timeline:3",
+        }
+
+    def test_digest_many_lock_duration(self):
+        backend = RedisBackend()
+        keys = ["timeline:1", "timeline:2", "timeline:3"]
+
+        with mock.patch.object(
+            backend, "_get_timeline_lock", wraps=backend._get_timeline_lock
+        ) as get_timeline_lock:
+            with backend.digest_many(keys):
+                pass
+
+        assert get_timeline_lock.call_args_list == [mock.call(key, duration=90) for key in keys]
@@ -15,6 +15,7 @@ from sentry.event_manager import (
     EventUser,
     HashDiscarded,
     has_pending_commit_resolution,
+    save_error_events,
 )
 from sentry.eventstore.models import Event
 from sentry.grouping.utils import hash_from_values
@@ -821,6 +822,105 @@ class EventManagerTest(TestCase):
         assert query(tsdb.models.project, project.id, environment_id=environment_id) == 1
         assert query(tsdb.models.group, event.group.id, environment_id=environment_id) == 1
 
+    def test_save_error_events_batch(self):
+        project = self.project
+        timestamp = time() - 300
+        jobs = []
+        for event_id in ("a" * 32, "b" * 32, "c" * 32):
+            manager = EventManager(
+                make_event(
+                    event_id=event_id,
+                    message="foo",
+                    release="1.0",
+                    environment="batch",
+                    timestamp=timestamp,
+                    user={"id": "1"},
+                )
+            )
+            manager.normalize()
+            jobs.append(
+                {
+                    "data": manager.get_data(),
+                    "project_id": project.id,
+                    "raw": False,
+                    "start_time": timestamp,
+                    "cache_key": None,
+                }
+            )
+
+        jobs = save_error_events(jobs, {project.id: project})
+
+        events = [job["event"] for job in jobs]
+        assert len(events) == 3
+        assert len({event.group_id for event in events}) == 1
+        assert [job["is_new"] for job in jobs] == [True, False, False]
+        assert [job["is_new_group_environment"] for job in jobs] == [True, False, False]
+        assert len({job["user"].hash for job in jobs}) == 1
+
+        for event in events:
+            assert nodestore.get(event.data.id)["event_id"] == event.event_id
+
+        group = events[0].group
+        environment = Environment.objects.get(organization_id=project.organization_id, name="batch")
+        assert (
+            GroupRelease.objects.filter(
+                group_id=group.id, release_id=jobs[0]["release"].id, environment="batch"
+            ).count()
+            == 1
+        )
+
+        def query(model, key, **kwargs):
+            return tsdb.get_sums(model, [key], events[0].datetime, events[0].datetime, **kwargs)[
+                key
+            ]
+
+        assert query(tsdb.models.project, project.id) == 3
+        assert query(tsdb.models.group, group.id) == 3
+        assert query(tsdb.models.group, group.id, environment_id=environment.id) == 3
+        assert query(tsdb.models.release, jobs[0]["release"].id) == 3
+
+    def test_save_error_events_batch_release_dates(self):
+        project = self.project
+        now = time()
+        jobs = []
+        for event_id, timestamp in (("a" * 32, now - 300), ("b" * 32, now - 600), ("c" * 32, now)):
+            manager = EventManager(
+                make_event(
+                    event_id=event_id,
+                    message="foo",
+                    release="1.0",
+                    environment="batch",
+                    timestamp=timestamp,
+                )
+            )
+            manager.normalize()
+            jobs.append(
+                {
+                    "data": manager.get_data(),
+                    "project_id": project.id,
+                    "raw": False,
+                    "start_time": timestamp,
+                    "cache_key": None,
+                }
+            )
+
+        jobs = save_error_events(jobs, {project.id: project})
+
+        first_seen = jobs[1]["event"].datetime
+        last_seen = jobs[2]["event"].datetime
+        grouprelease = GroupRelease.objects.get(
+            group_id=jobs[0]["event"].group_id, release_id=jobs[0]["release"].id
+        )
+        assert (grouprelease.first_seen, grouprelease.last_seen) == (first_seen, last_seen)
+
+        release_project_env = ReleaseProjectEnvironment.objects.get(
+            project_id=project.id, release_id=jobs[0]["release"].id
+        )
+        assert (release_project_env.first_seen, release_project_env.last_seen) == (
+            first_seen,
+            last_seen,
+        )
+
     @pytest.mark.xfail
     def test_record_frequencies(self):
         project = self.project
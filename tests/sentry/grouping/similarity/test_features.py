@@ -1,3 +1,5 @@
+from time import time
+
 import pytest
 
 import sentry.similarity
@@ -7,7 +9,7 @@ from sentry.grouping.api import get_default_grouping_config_dict
 from sentry.grouping.strategies.configurations import CONFIGURATIONS
 from sentry.models import Group, Project
 from sentry.utils import json
-from sentry.utils.compat import zip
+from sentry.utils.compat import mock, zip
 from tests.sentry.grouping import with_fingerprint_input, with_grouping_input
 
 
@@ -53,6 +55,24 @@ def test_basic(similarity):
     assert evt2_diff[msg_label] == 0.5
 
 
+def test_record_timestamps(similarity):
+    timestamp = int(time()) - 600
+    events = [
+        create_event({"message": "hello world", "timestamp": timestamp + offset}, group_id=group_id)
+        for group_id, offset in ((123, 0), (345, 60), (567, 0))
+    ]
+
+    with mock.patch.object(similarity.index, "record_many") as record_many:
+        similarity.record(events)
+
+    # Every event is recorded with its own timestamp, in one request per
+    # distinct timestamp.
+    assert sorted(
+        (call.kwargs["timestamp"], sorted(key for key, _ in call.args[1]))
+        for call in record_many.call_args_list
+    ) == [(timestamp, ["123", "567"]), (timestamp + 60, ["345"])]
+
+
 @with_grouping_input("grouping_input")
 def test_similarity_extract_grouping_input(grouping_input, insta_snapshot):
     similarity = sentry.similarity.features2
@@ -400,3 +400,26 @@ def test_range_matching_direct():
         ],
         "python",
     )
+
+
+def test_loads_is_cached():
+    dumped = Enhancements.from_config_string("function:foo -app").dumps()
+
+    assert Enhancements.loads(dumped) is Enhancements.loads(dumped)
+    assert Enhancements.loads(dumped) is Enhancements.loads(dumped.encode("ascii"))
+
+
+def test_modifications_are_visible_to_later_rules():
+    enhancement = Enhancements.from_config_string(
+        """
+        function:foo                    +app
+        function:foo app:yes            category=bar
+        [ category:bar ] | function:*   -app
+    """
+    )
+
+    frames = [{"function": "foo"}, {"function": "bar"}, {"function": "foo"}]
+    enhancement.apply_modifications_to_frame(frames, "native", {})
+
+    assert [frame["in_app"] for frame in frames] == [True, False, True]
+    assert [frame["data"]["category"] for frame in frames[::2]] == ["bar", "bar"]
@@ -1,7 +1,11 @@
 import pytest
 
 from sentry.grouping.api import get_default_grouping_config_dict
-from sentry.grouping.fingerprinting import FingerprintingRules, InvalidFingerprintingConfig
+from sentry.grouping.fingerprinting import (
+    EventAccess,
+    FingerprintingRules,
+    InvalidFingerprintingConfig,
+)
 from tests.sentry.grouping import with_fingerprint_input
 
 GROUPING_CONFIG = get_default_grouping_config_dict()
@@ -80,6 +84,51 @@ logger:sentry.*                                 -> logger, {{ logger }}, title="
     }
 
 
+def test_candidate_rules():
+    rules = FingerprintingRules.from_config_string(
+        """
+type:DatabaseUnavailable                        -> database
+function:assertion_failed module:foo            -> assertion
+logger:sentry.*                                 -> logger
+tags.server_name:"web-1"                        -> web
+!type:DatabaseUnavailable                       -> not-database
+"""
+    )
+
+    def _get_candidates(event):
+        return [rule.fingerprint for rule in rules.iter_candidate_rules(EventAccess(event))]
+
+    event = {
+        "logger": "sentry.api",
+        "tags": [["server_name", "web-1"]],
+        "exception": {
+            "values": [
+                {
+                    "type": "DatabaseUnavailable",
+                    "stacktrace": {"frames": [{"function": "assertion_failed", "module": "foo"}]},
+                }
+            ]
+        },
+    }
+    assert _get_candidates(event) == [
+        ["database"],
+        ["assertion"],
+        ["logger"],
+        ["web"],
+        ["not-database"],
+    ]
+    assert rules.get_fingerprint_values_for_event(event)[1] == ["database"]
+
+    event = {
+        "logger": "sentry.api",
+        "exception": {
+            "values": [{"type": "ValueError", "stacktrace": {"frames": [{"function": "foo"}]}}]
+        },
+    }
+    assert _get_candidates(event) == [["logger"], ["not-database"]]
+    assert rules.get_fingerprint_values_for_event(event)[1] == ["logger"]
+
+
 def test_parsing_errors():
     with pytest.raises(InvalidFingerprintingConfig):
         FingerprintingRules.from_config_string("invalid.message:foo -> bar")
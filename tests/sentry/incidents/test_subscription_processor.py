@@ -26,8 +26,10 @@ from sentry.incidents.subscription_processor import (
     build_alert_rule_trigger_stat_key,
     build_trigger_stat_keys,
     get_alert_rule_stats,
+    get_alert_rule_stats_many,
     get_redis_client,
     partition,
+    process_updates,
     update_alert_rule_stats,
 )
 from sentry.snuba.models import QuerySubscription
@@ -208,6 +210,52 @@ class ProcessUpdateTest(TestCase):
         assert alert_stats[trigger.id] == alert_triggers
         assert resolve_stats[trigger.id] == resolve_triggers
 
+    def test_process_updates(self):
+        rule = self.rule
+        trigger = self.trigger
+        rule.update(threshold_period=2)
+        updates = [
+            (
+                self.build_subscription_update(
+                    self.sub, value=trigger.alert_threshold + 1, time_delta=timedelta(minutes=-2)
+                ),
+                self.sub,
+            ),
+            (
+                self.build_subscription_update(
+                    self.other_sub,
+                    value=trigger.alert_threshold + 1,
+                    time_delta=timedelta(minutes=-2),
+                ),
+                self.other_sub,
+            ),
+            (
+                self.build_subscription_update(
+                    self.sub, value=trigger.alert_threshold + 1, time_delta=timedelta(minutes=-1)
+                ),
+                self.sub,
+            ),
+        ]
+        with self.feature(
+            ["organizations:incidents", "organizations:performance-view"]
+        ), self.capture_on_commit_callbacks(execute=True):
+            process_updates(updates)
+
+        incident = self.assert_active_incident(rule)
+        self.assert_trigger_exists_with_status(incident, trigger, TriggerStatus.ACTIVE)
+        self.assert_actions_fired_for_incident(incident, [self.action])
+        self.assert_no_active_incident(rule, self.other_sub)
+
+        stats = get_alert_rule_stats_many(
+            [(rule, self.sub, [trigger]), (rule, self.other_sub, [trigger])]
+        )
+        assert stats[self.sub.id] == (updates[2][0]["timestamp"], {trigger.id: 0}, {trigger.id: 0})
+        assert stats[self.other_sub.id] == (
+            updates[1][0]["timestamp"],
+            {trigger.id: 1},
+            {trigger.id: 0},
+        )
+
     def test_removed_alert_rule(self):
         message = self.build_subscription_update(self.sub)
         self.rule.delete()
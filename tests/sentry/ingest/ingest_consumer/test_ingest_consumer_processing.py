@@ -5,13 +5,16 @@ import pytest
 
 from sentry.event_manager import EventManager
 from sentry.ingest.ingest_consumer import (
+    _mark_events_processed,
     process_attachment_chunk,
     process_event,
     process_individual_attachment,
     process_userreport,
 )
 from sentry.models import EventAttachment, EventUser, File, UserReport
+from sentry.tasks.store import SaveEventBatch
 from sentry.utils import json
+from sentry.utils.compat import mock
 
 
 def get_normalized_event(data, project):
@@ -56,10 +59,54 @@ def test_deduplication_works(default_project, task_runner, preprocess_event):
         "data": payload,
         "event_id": event_id,
         "project": default_project,
+        "save_batch": None,
         "start_time": start_time,
     }
 
 
+@pytest.mark.django_db
+def test_deduplication_with_save_batch(default_project, task_runner, monkeypatch):
+    calls = []
+
+    def preprocess_event(save_batch, **kwargs):
+        calls.append(kwargs)
+        assert save_batch.add(
+            kwargs["project"],
+            kwargs["cache_key"],
+            kwargs["event_id"],
+            kwargs["start_time"],
+            kwargs["data"],
+        )
+
+    monkeypatch.setattr("sentry.ingest.ingest_consumer.preprocess_event", preprocess_event)
+
+    payload = get_normalized_event({"message": "hello world"}, default_project)
+    message = {
+        "payload": json.dumps(payload),
+        "start_time": time.time() - 3600,
+        "event_id": payload["event_id"],
+        "project_id": default_project.id,
+        "remote_addr": "127.0.0.1",
+    }
+    projects = {default_project.id: default_project}
+
+    def make_save_batch():
+        return SaveEventBatch(10, on_submit=_mark_events_processed)
+
+    # Until the batch is dispatched, a redelivered event is processed again.
+    process_event(message, projects=projects, save_batch=make_save_batch())
+    save_batch = make_save_batch()
+    process_event(message, projects=projects, save_batch=save_batch)
+    assert len(calls) == 2
+
+    with mock.patch("sentry.tasks.store.save_event") as save_event:
+        save_batch.submit()
+    assert save_event.delay.call_count == 1
+
+    process_event(message, projects=projects, save_batch=make_save_batch())
+    assert len(calls) == 2
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize("missing_chunks", (True, False))
 def test_with_attachments(default_project, task_runner, missing_chunks, monkeypatch):
@@ -1,6 +1,6 @@
 from unittest import TestCase
 
-from sentry.lang.javascript.cache import SourceCache
+from sentry.lang.javascript.cache import SourceCache, SourceMapViewCache
 
 
 class BasicCacheTest(TestCase):
@@ -37,3 +37,24 @@ class BasicCacheTest(TestCase):
         # fall back to utf-8
         cache.add(url, "foobar".encode("utf-32"), encoding="utf-32")
         assert cache.get(url)[0] == "foobar"
+
+
+class SourceMapViewCacheTest(TestCase):
+    def test_eviction(self):
+        cache = SourceMapViewCache(max_size=10)
+
+        cache.set("a", "view_a", 4)
+        cache.set("b", "view_b", 4)
+        assert cache.get("a") == "view_a"
+
+        # "b" is the least recently used entry
+        cache.set("c", "view_c", 4)
+        assert cache.get("b") is None
+        assert cache.get("a") == "view_a"
+        assert cache.get("c") == "view_c"
+        assert cache.size == 8
+
+        # entries larger than the cache are never stored
+        cache.set("d", "view_d", 11)
+        assert cache.get("d") is None
+        assert len(cache) == 2
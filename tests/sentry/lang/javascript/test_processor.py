@@ -65,6 +65,44 @@ class JavaScriptStacktraceProcessorTest(TestCase):
         r = JavaScriptStacktraceProcessor({}, None, project)
         assert not r.allow_scraping
 
+    @patch("sentry.lang.javascript.processor.fetch_file")
+    def test_prefetch_sources(self, mock_fetch_file):
+        files = {
+            "http://example.com/a.js": b"//# sourceMappingURL=" + base64_sourcemap.encode(),
+            "http://example.com/b.js": b"console.log('b')",
+        }
+
+        def fetch(url, **kwargs):
+            if url not in files:
+                raise http.CannotFetch({"type": EventError.JS_MISSING_SOURCE, "url": url})
+            return http.UrlResult(url, {}, files[url], 200, None)
+
+        mock_fetch_file.side_effect = fetch
+        frames = [
+            {"abs_path": url, "lineno": 1}
+            for url in (
+                "http://example.com/a.js",
+                "http://example.com/b.js",
+                "http://example.com/c.js",
+            )
+        ]
+
+        r = JavaScriptStacktraceProcessor({}, None, self.project)
+        with self.options({"processing.javascript-fetch-concurrency": 4}):
+            r.populate_source_cache(frames)
+
+        assert mock_fetch_file.call_count == 3
+        assert not r.prefetched_files
+        assert not r.prefetched_sourcemaps
+
+        assert r.cache.get("http://example.com/b.js") is not None
+        sourcemap_url, sourcemap_view = r.sourcemaps.get_link("http://example.com/a.js")
+        assert sourcemap_url == base64_sourcemap
+        assert sourcemap_view is not None
+        assert r.cache.get_errors("http://example.com/c.js") == [
+            {"type": EventError.JS_MISSING_SOURCE, "url": "http://example.com/c.js"}
+        ]
+
 
 def test_build_fetch_retry_condition() -> None:
     e = OSError()
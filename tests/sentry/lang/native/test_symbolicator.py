@@ -3,8 +3,14 @@ import copy
 import pytest
 
 from sentry.lang.native import symbolicator
-from sentry.lang.native.symbolicator import get_sources_for_project, redact_internal_sources
+from sentry.lang.native.symbolicator import (
+    SymbolicatorSession,
+    get_pooled_session,
+    get_sources_for_project,
+    redact_internal_sources,
+)
 from sentry.testutils.helpers import Feature
+from sentry.testutils.helpers.symbolicator import LocalSymbolicator
 from sentry.utils.compat import map
 
 CUSTOM_SOURCE_CONFIG = """
@@ -265,3 +271,27 @@ class TestAliasReversion:
         reverse_aliases = symbolicator.reverse_aliases_map(builtin_sources)
         expected = {"sentry:ios-source": "sentry:ios", "sentry:tvos-source": "sentry:ios"}
         assert reverse_aliases == expected
+
+
+class TestSymbolicatorSession:
+    def test_poll_task(self):
+        with LocalSymbolicator(pending_polls=1) as server:
+            with SymbolicatorSession(url=server.url, project_id="1", event_id="a" * 32) as sess:
+                response = sess.symbolicate_stacktraces(stacktraces=[], modules=[])
+                assert response["status"] == "pending"
+
+                task_id = response["request_id"]
+                assert sess.query_task(task_id)["status"] == "completed"
+                # Symbolicator forgets about tasks once they have been fetched.
+                assert sess.query_task(task_id) is None
+
+    def test_pooled_session(self):
+        with LocalSymbolicator() as server:
+            for event_id in ("a" * 32, "b" * 32):
+                with SymbolicatorSession(url=server.url, project_id="1", event_id=event_id) as sess:
+                    assert sess.session is get_pooled_session()
+                    assert sess.symbolicate_stacktraces(stacktraces=[], modules=[])
+
+            assert len(server.requests) == 2
+            client_addresses = {client_address for _, _, client_address in server.requests}
+            assert len(client_addresses) == 1
@@ -0,0 +1,64 @@
+import pytest
+
+from sentry.metrics.buffered import BufferedMetricsBackend
+from sentry.testutils import TestCase
+from sentry.utils.compat import mock
+
+
+class BufferedMetricsBackendTest(TestCase):
+    def setUp(self):
+        self.backend = BufferedMetricsBackend(
+            "sentry.metrics.dummy.DummyMetricsBackend",
+            flush_interval=3600,
+            max_series=3,
+            max_timing_samples=2,
+        )
+        self.inner = self.backend.backend = mock.Mock()
+
+    def test_incr(self):
+        self.backend.incr("foo", tags={"a": "b"})
+        self.backend.incr("foo", tags={"a": "b"}, amount=2)
+        self.backend.incr("foo", instance="bar")
+        assert not self.inner.incr.called
+
+        self.backend.flush()
+        assert self.inner.incr.call_count == 2
+        self.inner.incr.assert_any_call("foo", None, {"a": "b"}, 3, 1)
+        self.inner.incr.assert_any_call("foo", "bar", {}, 1, 1)
+
+        self.inner.reset_mock()
+        self.backend.flush()
+        assert not self.inner.incr.called
+
+    def test_gauge(self):
+        self.backend.gauge("foo", 1)
+        self.backend.gauge("foo", 2)
+        self.backend.flush()
+        self.inner.gauge.assert_called_once_with("foo", 2, None, {}, 1)
+
+    @mock.patch("sentry.metrics.buffered.random", return_value=0.1)
+    def test_timing(self, random):
+        for value in range(10):
+            self.backend.timing("foo", value, sample_rate=0.5)
+        self.backend.flush()
+
+        assert self.inner.timing.call_count == 2
+        for args, _ in self.inner.timing.call_args_list:
+            assert args[0] == "foo"
+            assert args[1] in range(10)
+            # 2 out of 10 values that were sampled at a rate of 0.5
+            assert args[4] == pytest.approx(0.1)
+
+    @mock.patch("sentry.metrics.buffered.random", return_value=0.9)
+    def test_timing_sampled(self, random):
+        self.backend.timing("foo", 1, sample_rate=0.5)
+        self.backend.flush()
+        assert not self.inner.timing.called
+
+    def test_flush_when_full(self):
+        for i in range(3):
+            self.backend.incr(f"foo.{i}")
+        assert not self.inner.incr.called
+
+        self.backend.incr("foo.3")
+        assert self.inner.incr.call_count == 4
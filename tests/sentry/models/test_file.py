@@ -155,6 +155,28 @@ class FileTest(TestCase):
             with self.assertRaises(ValueError):
                 fp.seek(0, 666)
 
+    def test_seek_fetches_only_needed_blobs(self):
+        file1 = File.objects.create(name="baz.js", type="default", size=26)
+        file1.putfile(BytesIO(b"abcdefghijklmnopqrstuvwxyz"), 5)
+
+        with patch.object(
+            FileBlob, "getfile", autospec=True, side_effect=FileBlob.getfile
+        ) as getfile:
+            with file1.getfile() as fp:
+                fp.seek(17)
+                assert fp.read(2) == b"rs"
+                fp.seek(15)
+                assert fp.read(3) == b"pqr"
+
+            # The first blob on open and the blob containing the data
+            assert getfile.call_count == 2
+
+        with file1.getfile() as fp:
+            fp.seek(8)
+            # Reads across blobs are served by readahead
+            assert fp.read(12) == b"ijklmnopqrst"
+            assert fp.read() == b"uvwxyz"
+
     def test_multi_chunk_prefetch(self):
         random_data = os.urandom(1 << 25)
 
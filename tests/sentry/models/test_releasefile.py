@@ -2,6 +2,7 @@ import errno
 import os
 from datetime import datetime, timezone
 from io import BytesIO
+from tempfile import TemporaryDirectory
 from threading import Thread
 from time import sleep
 from zipfile import ZipFile
@@ -14,6 +15,7 @@ from sentry.models.distribution import Distribution
 from sentry.models.file import File
 from sentry.models.releasefile import (
     ARTIFACT_INDEX_FILENAME,
+    ReleaseFileCache,
     _ArtifactIndexGuard,
     delete_from_artifact_index,
     read_artifact_index,
@@ -113,6 +115,44 @@ class ReleaseFileCacheTest(TestCase):
         else:
             assert False, "file should not exist"
 
+    def test_getfile_evicts_least_recently_used(self):
+        release_files = []
+        for i in range(3):
+            file = self.create_file(name=f"dummy{i}.txt")
+            file.putfile(BytesIO(b"x" * 20))
+            release_files.append(self.create_release_file(file=file, name=f"dummy{i}.txt"))
+
+        cache = ReleaseFileCache()
+        cache.file_cache.eviction_grace_period = -1
+
+        with TemporaryDirectory() as cache_path, self.options(
+            {
+                "releasefile.cache-path": cache_path,
+                "releasefile.cache-limit": 0,
+                "releasefile.cache-max-size": 40,
+            }
+        ):
+            paths = [
+                os.path.join(cache_path, str(self.organization.id), str(release_file.file.id))
+                for release_file in release_files
+            ]
+
+            with cache.getfile(release_files[0]) as f:
+                assert f.read() == b"x" * 20
+                assert f.name == paths[0]
+            with cache.getfile(release_files[1]):
+                pass
+            os.utime(paths[0], (0, 0))
+
+            # Fetching the third file exceeds the budget and evicts the first.
+            cache.file_cache._last_eviction = 0
+            with cache.getfile(release_files[2]):
+                pass
+
+            assert not os.path.exists(paths[0])
+            assert os.path.exists(paths[1])
+            assert os.path.exists(paths[2])
+
 
 class ReleaseArchiveTestCase(TestCase):
     def create_archive(self, fields, files, dist=None):
@@ -7,6 +7,8 @@ from contextlib import contextmanager
 import pytest
 
 from sentry.nodestore.django.backend import DjangoNodeStorage
+from sentry.nodestore.local_cache import LocalNodeCache
+from sentry.utils.compat import mock
 from tests.sentry.nodestore.bigtable.backend.tests import (
     MockedBigtableNodeStorage,
     get_temporary_bigtable_nodestorage,
@@ -97,3 +99,20 @@ def test_set_subkeys(ns):
     ns.delete("node_1")
     assert ns.get("node_1") is None
     assert ns.get("node_1", subkey="other") is None
+
+
+def test_local_cache(ns):
+    ns.local_cache = LocalNodeCache(max_size=1024)
+
+    ns.set_subkeys("node_1", {None: {"foo": "a"}, "other": {"foo": "b"}})
+    assert "node_1" in ns.local_cache._items
+
+    with mock.patch.object(ns, "_get_bytes_multi") as get_bytes_multi:
+        assert ns.get("node_1") == {"foo": "a"}
+        assert ns.get("node_1", subkey="other") == {"foo": "b"}
+        assert ns.get_multi(["node_1"]) == {"node_1": {"foo": "a"}}
+    assert not get_bytes_multi.called
+
+    ns.delete("node_1")
+    assert "node_1" not in ns.local_cache._items
+    assert ns.get("node_1") is None
@@ -0,0 +1,82 @@
+import threading
+
+from sentry.nodestore.local_cache import LocalNodeCache
+from sentry.utils.compat import mock
+
+
+def test_get_many_fetches_missing():
+    cache = LocalNodeCache(max_size=100)
+    fetch = mock.Mock(return_value={"a": b"aaa"})
+
+    assert cache.get_many(["a", "b"], fetch) == {"a": b"aaa"}
+    fetch.assert_called_once_with(["a", "b"])
+
+    fetch.reset_mock()
+    fetch.return_value = {}
+    assert cache.get_many(["a", "b"], fetch) == {"a": b"aaa"}
+    # Missing nodes are not cached
+    fetch.assert_called_once_with(["b"])
+
+
+def test_evicts_by_size():
+    cache = LocalNodeCache(max_size=10)
+    cache.set_many({"a": b"aaaa", "b": b"bbbb"})
+    cache.get_many(["a"], mock.Mock())
+    cache.set_many({"c": b"cccc"})
+
+    assert set(cache._items) == {"a", "c"}
+    assert cache.size == 8
+
+    cache.set_many({"d": b"d" * 11})
+    assert "d" not in cache._items
+
+
+def test_ttl():
+    cache = LocalNodeCache(max_size=100, ttl=10)
+    with mock.patch("sentry.nodestore.local_cache.time", return_value=100):
+        cache.set_many({"a": b"aaa"})
+    with mock.patch("sentry.nodestore.local_cache.time", return_value=105):
+        assert cache.get_many(["a"], mock.Mock()) == {"a": b"aaa"}
+    with mock.patch("sentry.nodestore.local_cache.time", return_value=111):
+        assert cache.get_many(["a"], mock.Mock(return_value={})) == {}
+    assert cache.size == 0
+
+
+def test_concurrent_fetches_are_deduplicated():
+    cache = LocalNodeCache(max_size=100)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch(ids):
+        calls.append(ids)
+        started.set()
+        release.wait()
+        return {id: id.encode("utf-8") for id in ids}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.get_many(["a", "b"], fetch)))
+    leader.start()
+    started.wait()
+
+    follower = threading.Thread(target=lambda: results.append(cache.get_many(["b", "c"], fetch)))
+    follower.start()
+    follower.join(0.1)
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert calls == [["a", "b"], ["c"]]
+    assert {"a": b"a", "b": b"b"} in results
+    assert {"b": b"b", "c": b"c"} in results
+
+
+def test_writes_invalidate_inflight_fetches():
+    cache = LocalNodeCache(max_size=100)
+
+    def fetch(ids):
+        cache.set_many({"a": b"new"})
+        return {"a": b"old"}
+
+    assert cache.get_many(["a"], fetch) == {"a": b"old"}
+    assert cache.get_many(["a"], mock.Mock()) == {"a": b"new"}
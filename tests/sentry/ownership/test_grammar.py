@@ -4,6 +4,7 @@ from sentry.ownership.grammar import (
     Matcher,
     Owner,
     Rule,
+    RuleIndex,
     convert_codeowners_syntax,
     convert_schema_to_rules_text,
     dump_schema,
@@ -65,20 +66,17 @@ def test_dump_schema():
 
 
 def test_load_schema():
-    assert (
-        load_schema(
-            {
-                "$version": 1,
-                "rules": [
-                    {
-                        "matcher": {"type": "path", "pattern": "*.js"},
-                        "owners": [{"type": "team", "identifier": "frontend"}],
-                    }
-                ],
-            }
-        )
-        == [Rule(Matcher("path", "*.js"), [Owner("team", "frontend")])]
-    )
+    assert load_schema(
+        {
+            "$version": 1,
+            "rules": [
+                {
+                    "matcher": {"type": "path", "pattern": "*.js"},
+                    "owners": [{"type": "team", "identifier": "frontend"}],
+                }
+            ],
+        }
+    ) == [Rule(Matcher("path", "*.js"), [Owner("team", "frontend")])]
 
 
 def test_matcher_test_url():
@@ -186,6 +184,55 @@ def test_matcher_test_tags_without_tag_data(data):
     assert not Matcher("tags.bar", "barval").test(data)
 
 
+def test_rule_index():
+    rules = [
+        Rule(Matcher("path", "*.py"), []),
+        Rule(Matcher("path", "src/*"), []),
+        Rule(Matcher("path", "SRC/sentry/*.py"), []),
+        Rule(Matcher("path", "src/sentry/models.py"), []),
+        Rule(Matcher("path", "*"), []),
+        Rule(Matcher("path", "src/?.js"), []),
+        Rule(Matcher("module", "com.android*"), []),
+        Rule(Matcher("url", "*.example.com/*"), []),
+        Rule(Matcher("tags.foo", "foo_*"), []),
+        Rule(Matcher("tags.bar", "foo_*"), []),
+        Rule(Matcher("unknown", "*"), []),
+    ]
+    index = RuleIndex(rules)
+
+    for data in [
+        {},
+        {"stacktrace": {"frames": [{"filename": "src/sentry/models.py"}]}},
+        {"stacktrace": {"frames": [{"filename": "src\\sentry\\api.py"}]}},
+        {"stacktrace": {"frames": [{"abs_path": "src/a.js"}, {"filename": "lib/foo.PY"}]}},
+        {"exception": {"values": [{"stacktrace": {"frames": [{"module": "com.android.os"}]}}]}},
+        {"request": {"url": "https://www.example.com/foo"}},
+        {"tags": [["foo", "foo_value"], ["bar", "barval"], None]},
+    ]:
+        assert index.get_matching_rules(data) == [rule for rule in rules if rule.test(data)]
+
+
+def test_rule_index_glob_characters():
+    rules = [
+        Rule(Matcher("path", "src/[ab]*"), []),
+        Rule(Matcher("path", "src/{a,b}.js"), []),
+        Rule(Matcher("path", "src/\\*.py"), []),
+        Rule(Matcher("tags.foo", "foo\\*"), []),
+    ]
+    index = RuleIndex(rules)
+
+    for data in [
+        {"stacktrace": {"frames": [{"filename": "src/a.js"}]}},
+        {"stacktrace": {"frames": [{"filename": "src/b/c.js"}]}},
+        {"stacktrace": {"frames": [{"filename": "src/*.py"}]}},
+        {"tags": [["foo", "foo*"]]},
+    ]:
+        assert index.get_matching_rules(data) == [rule for rule in rules if rule.test(data)]
+
+    data = {"stacktrace": {"frames": [{"filename": "src/a.js"}]}}
+    assert rules[0] in index.get_matching_rules(data)
+
+
 def test_parse_code_owners():
     assert parse_code_owners(codeowners_fixture_data) == (
         ["@getsentry/frontend", "@getsentry/docs", "@getsentry/ecosystem"],
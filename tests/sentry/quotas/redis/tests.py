@@ -4,7 +4,7 @@ from exam import fixture, patcher
 
 from sentry.constants import DataCategory
 from sentry.quotas.base import QuotaConfig, QuotaScope
-from sentry.quotas.redis import RedisQuota, is_rate_limited
+from sentry.quotas.redis import RedisQuota, is_rate_limited, is_rate_limited_many
 from sentry.testutils import TestCase
 from sentry.utils.compat import map, mock
 from sentry.utils.redis import clusters
@@ -78,6 +78,31 @@ def test_is_rate_limited_script():
     assert map(bool, is_rate_limited(client, ("orange", "apple"), (1, now + 60))) == [False]
 
 
+def test_is_rate_limited_many_script():
+    now = int(time.time())
+
+    cluster = clusters.get("default")
+    client = cluster.get_local_client(next(iter(cluster.hosts)))
+
+    # The first item is accepted and counted against "foo", which rejects the
+    # second item. The third item only consumes "bar".
+    rejections = is_rate_limited_many(
+        client,
+        ("foo", "r:foo", "bar", "r:bar", "foo", "r:foo", "bar", "r:bar"),
+        (2, 2, 3, now + 60, 5, now + 120, 2, 1, 3, now + 60, 3, 1, 5, now + 120),
+    )
+    assert [list(map(bool, r)) for r in rejections] == [[False, False], [True], [False]]
+
+    assert client.get("foo") == b"2"
+    assert 59 <= client.ttl("foo") <= 60
+
+    assert client.get("bar") == b"5"
+    assert 119 <= client.ttl("bar") <= 120
+
+    assert client.get("r:foo") is None
+    assert client.get("r:bar") is None
+
+
 class RedisQuotaTest(TestCase):
     quota = fixture(RedisQuota)
 
@@ -318,3 +343,37 @@ class RedisQuotaTest(TestCase):
         # count for these quotas and None for the others.
         # The ``- 1`` is because we refunded once.
         assert usage == [n - 1 if q.id else None for q in quotas] + [0, 0]
+
+    def test_is_rate_limited_many(self):
+        timestamp = time.time()
+
+        self.get_project_quota.return_value = (3, 60)
+        self.get_organization_quota.return_value = (300, 60)
+
+        other_project = self.create_project(organization=self.organization)
+        results = self.quota.is_rate_limited_many(
+            [
+                (self.project, None, None, None),
+                (self.project, None, DataCategory.ERROR, 2),
+                (self.project, None, None, 1),
+                (other_project, None, DataCategory.TRANSACTION, 1),
+                (other_project, None, DataCategory.ERROR, 2),
+            ],
+            timestamp=timestamp,
+        )
+        assert [r.is_limited for r in results] == [False, False, True, False, False]
+        assert results[2].reason_code == "project_quota"
+
+        quotas = self.quota.get_quotas(self.project)
+        usage = self.quota.get_usage(self.project.organization_id, quotas, timestamp=timestamp)
+        assert usage == [3, 5]
+
+    @mock.patch.object(RedisQuota, "get_quotas")
+    @mock.patch("sentry.quotas.redis.is_rate_limited_many")
+    def test_is_rate_limited_many_zero_quota(self, mock_is_rate_limited_many, mock_get_quotas):
+        mock_get_quotas.return_value = (QuotaConfig(limit=0, reason_code="disabled"),)
+
+        results = self.quota.is_rate_limited_many([(self.project, None, None, None)])
+        assert not mock_is_rate_limited_many.called
+        assert results[0].is_limited
+        assert results[0].reason_code == "disabled"
@@ -1,7 +1,7 @@
 import pytest
 
-from sentry.models import ProjectKey
-from sentry.relay.config import get_project_config
+from sentry.models import ProjectKey, ProjectKeyStatus
+from sentry.relay.config import get_project_config, get_project_configs_for_organization
 from sentry.testutils.helpers import Feature
 from sentry.utils.safe import get_path
 
@@ -105,3 +105,28 @@ def test_project_config_with_breakdown(default_project, insta_snapshot):
 
     cfg = cfg.to_dict()
     insta_snapshot(cfg["config"]["breakdownsV2"])
+
+
+@pytest.mark.django_db
+def test_get_project_configs_for_organization(default_project, default_projectkey):
+    default_project.update_option("sentry:relay_pii_config", PII_CONFIG)
+    inactive_key = ProjectKey.objects.create(
+        project=default_project, status=ProjectKeyStatus.INACTIVE
+    )
+    keys = list(ProjectKey.objects.filter(project=default_project))
+
+    configs = get_project_configs_for_organization(
+        default_project.organization, [default_project], {default_project.id: keys}
+    )
+    assert inactive_key.public_key not in configs
+
+    def _strip(cfg):
+        return {k: v for k, v in cfg.items() if k not in ("lastChange", "lastFetch", "rev")}
+
+    expected = get_project_config(default_project, full_config=True, project_keys=keys)
+    assert _strip(configs[default_project.id]) == _strip(expected.to_dict())
+
+    expected = get_project_config(
+        default_project, full_config=True, project_keys=[default_projectkey]
+    )
+    assert _strip(configs[default_projectkey.public_key]) == _strip(expected.to_dict())
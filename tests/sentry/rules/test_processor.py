@@ -84,6 +84,93 @@ class RuleProcessorTest(TestCase):
         results = list(rp.apply())
         assert len(results) == 0
 
+    def test_apply_many_frequency_conditions(self):
+        event = self.store_event(data={"fingerprint": ["other"]}, project_id=self.project.id)
+        frequency_cond_data = {
+            "id": "sentry.rules.conditions.event_frequency.EventFrequencyCondition",
+            "interval": "1h",
+            "value": 5,
+        }
+        Rule.objects.filter(project=self.project).delete()
+        rules = [
+            Rule.objects.create(
+                project=self.project,
+                data={"conditions": [frequency_cond_data], "actions": [EMAIL_ACTION_DATA]},
+            )
+            for _ in range(2)
+        ]
+
+        processors = [
+            RuleProcessor(
+                e,
+                is_new=False,
+                is_regression=False,
+                is_new_group_environment=False,
+                has_reappeared=False,
+            )
+            for e in (self.event, event)
+        ]
+        with patch(
+            "sentry.rules.conditions.event_frequency.EventFrequencyCondition.batch_query_hook",
+            return_value={self.event.group_id: 10, event.group_id: 0},
+        ) as batch_query_hook, patch(
+            "sentry.rules.conditions.event_frequency.EventFrequencyCondition.query_hook"
+        ) as query_hook:
+            results = RuleProcessor.apply_many(processors)
+
+        assert batch_query_hook.call_count == 1
+        assert sorted(batch_query_hook.call_args[0][0]) == sorted(
+            [self.event.group_id, event.group_id]
+        )
+        assert not query_hook.called
+
+        fired = [future.rule for _, futures in results[0] for future in futures]
+        assert sorted(fired, key=lambda rule: rule.id) == rules
+        assert not list(results[1])
+
+    def test_skipped_frequency_conditions_not_queried(self):
+        frequency_cond_data = {
+            "id": "sentry.rules.conditions.event_frequency.EventFrequencyCondition",
+            "interval": "1h",
+            "value": 5,
+        }
+        Rule.objects.filter(project=self.project).delete()
+        # The frequency condition is never evaluated as the first one matches.
+        Rule.objects.create(
+            project=self.project,
+            data={
+                "action_match": "any",
+                "conditions": [EVERY_EVENT_COND_DATA, frequency_cond_data],
+                "actions": [EMAIL_ACTION_DATA],
+            },
+        )
+        # The rule is still in cooldown.
+        rule = Rule.objects.create(
+            project=self.project,
+            data={"conditions": [frequency_cond_data], "actions": [EMAIL_ACTION_DATA]},
+        )
+        GroupRuleStatus.objects.create(
+            rule=rule, group=self.event.group, project=self.project, last_active=timezone.now()
+        )
+
+        rp = RuleProcessor(
+            self.event,
+            is_new=False,
+            is_regression=False,
+            is_new_group_environment=False,
+            has_reappeared=False,
+        )
+        with patch(
+            "sentry.rules.conditions.event_frequency.EventFrequencyCondition.batch_query_hook"
+        ) as batch_query_hook, patch(
+            "sentry.rules.conditions.event_frequency.EventFrequencyCondition.query_hook"
+        ) as query_hook:
+            results = list(rp.apply())
+
+        assert len(results) == 1
+        assert not batch_query_hook.called
+        assert not query_hook.called
+
 
 # mock filter which always passes
 class MockFilterTrue(EventFilter):
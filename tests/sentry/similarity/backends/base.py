@@ -160,6 +160,37 @@ class MinHashIndexBackendTestMixin:
             == [("4", [1.0, None]), ("1", [1.0, 0.0]), ("2", [1.0, 0.0]), ("3", [1.0, 0.0])]
         )
 
+    def test_record_many_classify_many(self):
+        self.index.record_many(
+            "example",
+            [
+                ("1", [("index:a", "hello world"), ("index:b", "hello world")]),
+                ("2", [("index:a", "hello world")]),
+                ("3", [("index:b", "pizza world")]),
+                ("4", []),
+            ],
+        )
+
+        results = self.index.compare("example", "1", [("index:a", 0), ("index:b", 0)])
+        assert results[:2] == [("1", [1.0, 1.0]), ("2", [1.0, 0.0])]
+        assert "4" not in [key for key, _ in results]
+
+        requests = [
+            [("index:a", 0, "hello world")],
+            [],
+            [("index:b", self.index.bands, "pizza world")],
+        ]
+        assert self.index.classify_many("example", requests) == [
+            self.index.classify("example", requests[0]),
+            [],
+            self.index.classify("example", requests[2]),
+        ]
+        assert self.index.classify_many("example", requests, limit=1) == [
+            [("1", [1.0])],
+            [],
+            [("3", [1.0])],
+        ]
+
     def test_merge(self):
         self.index.record("example", "1", [("index", ["foo", "bar"])])
         self.index.record("example", "2", [("index", ["baz"])])
@@ -12,6 +12,8 @@ from sentry.snuba.query_subscription_consumer import (
     InvalidMessageError,
     InvalidSchemaError,
     QuerySubscriptionConsumer,
+    batch_subscriber_registry,
+    register_batch_subscriber,
     register_subscriber,
     subscriber_registry,
 )
@@ -113,6 +115,41 @@ class HandleMessageTest(BaseQuerySubscriptionTest, TestCase):
         )
         mock_callback.assert_called_once_with(data["payload"], sub)
 
+    def test_batch_subscription_registered(self):
+        registration_key = "registered_batch_test"
+        mock_callback = mock.Mock()
+        register_batch_subscriber(registration_key)(mock_callback)
+        with self.tasks():
+            snuba_query = create_snuba_query(
+                QueryDatasets.EVENTS,
+                "hello",
+                "count()",
+                timedelta(minutes=10),
+                timedelta(minutes=1),
+                None,
+            )
+            sub = create_snuba_subscription(self.project, registration_key, snuba_query)
+        sub.refresh_from_db()
+
+        data = self.valid_wrapper
+        data["payload"]["subscription_id"] = sub.subscription_id
+        other_data = deepcopy(data)
+        other_data["payload"]["result"] = {"data": [{"hello": 25}]}
+        assert (
+            self.consumer.handle_messages(
+                [self.build_mock_message(data), self.build_mock_message(other_data)]
+            )
+            == 2
+        )
+
+        payloads = []
+        for wrapper in (data, other_data):
+            payload = deepcopy(wrapper["payload"])
+            payload["values"] = payload["result"]
+            payload["timestamp"] = parse_date(payload["timestamp"]).replace(tzinfo=pytz.utc)
+            payloads.append(payload)
+        mock_callback.assert_called_once_with([(payloads[0], sub), (payloads[1], sub)])
+
 
 class ParseMessageValueTest(BaseQuerySubscriptionTest, unittest.TestCase):
     def run_test(self, message):
@@ -165,10 +202,13 @@ class ParseMessageValueTest(BaseQuerySubscriptionTest, unittest.TestCase):
 class RegisterSubscriberTest(unittest.TestCase):
     def setUp(self):
         self.orig_registry = deepcopy(subscriber_registry)
+        self.orig_batch_registry = deepcopy(batch_subscriber_registry)
 
     def tearDown(self):
         subscriber_registry.clear()
         subscriber_registry.update(self.orig_registry)
+        batch_subscriber_registry.clear()
+        batch_subscriber_registry.update(self.orig_batch_registry)
 
     def test_register(self):
         callback = object()
@@ -186,3 +226,12 @@ class RegisterSubscriberTest(unittest.TestCase):
         with self.assertRaises(Exception) as cm:
             register_subscriber("hello")(other_callback)
         assert str(cm.exception) == "Handler already registered for hello"
+
+    def test_register_batch(self):
+        callback = object()
+        other_callback = object()
+        register_batch_subscriber("hello")(callback)
+        assert batch_subscriber_registry["hello"] == callback
+        with self.assertRaises(Exception) as cm:
+            register_batch_subscriber("hello")(other_callback)
+        assert str(cm.exception) == "Batch handler already registered for hello"
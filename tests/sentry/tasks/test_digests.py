@@ -4,7 +4,7 @@ import sentry
 from sentry.digests.backends.redis import RedisBackend
 from sentry.digests.notifications import event_to_record
 from sentry.models.rule import Rule
-from sentry.tasks.digests import deliver_digest
+from sentry.tasks.digests import deliver_digest, deliver_digests
 from sentry.testutils import TestCase
 from sentry.testutils.helpers.datetime import before_now, iso_format
 from sentry.utils.compat.mock import patch
@@ -44,3 +44,35 @@ class DeliverDigestTest(TestCase):
     @patch.object(sentry, "digests")
     def test_member_key(self, digests):
         self.run_test(f"mail:p:{self.project.id}:Member:{self.user.id}", digests)
+
+
+class DeliverDigestsTest(TestCase):
+    @patch.object(sentry, "digests")
+    def test_batch(self, digests):
+        backend = RedisBackend()
+        digests.digest_many = backend.digest_many
+
+        project_2 = self.create_project()
+        keys = []
+        for project in (self.project, project_2):
+            rule = Rule.objects.create(project=project, label="Test Rule", data={})
+            key = f"mail:p:{project.id}:IssueOwners:"
+            for fingerprint in ("group-1", "group-2"):
+                event = self.store_event(
+                    data={
+                        "timestamp": iso_format(before_now(days=1)),
+                        "fingerprint": [fingerprint],
+                    },
+                    project_id=project.id,
+                )
+                backend.add(key, event_to_record(event, [rule]), increment_delay=0, maximum_delay=0)
+            keys.append(key)
+
+        deleted_key = "mail:p:0:IssueOwners:"
+        with self.tasks():
+            deliver_digests(keys + [deleted_key])
+
+        assert len(mail.outbox) == 2
+        for message in mail.outbox:
+            assert "2 new alerts since" in message.subject
+        digests.delete.assert_called_once_with(deleted_key)
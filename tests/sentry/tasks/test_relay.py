@@ -3,7 +3,7 @@ import pytest
 from sentry.models import ProjectKey, ProjectOption
 from sentry.relay.projectconfig_cache.redis import RedisProjectConfigCache
 from sentry.relay.projectconfig_debounce_cache.redis import RedisProjectConfigDebounceCache
-from sentry.tasks.relay import schedule_update_config_cache
+from sentry.tasks.relay import schedule_update_config_cache, update_config_cache
 from sentry.utils.compat.mock import patch
 
 
@@ -24,6 +24,7 @@ def redis_cache(monkeypatch):
     monkeypatch.setattr("sentry.relay.projectconfig_cache.set_many", cache.set_many)
     monkeypatch.setattr("sentry.relay.projectconfig_cache.delete_many", cache.delete_many)
     monkeypatch.setattr("sentry.relay.projectconfig_cache.get", cache.get)
+    monkeypatch.setattr("sentry.relay.projectconfig_cache.get_many", cache.get_many)
 
     monkeypatch.setattr(
         "django.conf.settings.SENTRY_RELAY_PROJECTCONFIG_DEBOUNCE_CACHE",
@@ -118,6 +119,42 @@ def test_generate(
     ]
 
 
+@pytest.mark.django_db
+def test_generate_only_writes_changed_configs(
+    monkeypatch,
+    factories,
+    default_project,
+    default_organization,
+    default_projectkey,
+    task_runner,
+    redis_cache,
+):
+    with task_runner():
+        other_project = factories.create_project(organization=default_organization)
+        other_projectkey = factories.create_project_key(project=other_project)
+
+    update_config_cache(generate=True, organization_id=default_organization.id)
+
+    (pk_json,) = redis_cache.get(default_projectkey.public_key)["publicKeys"]
+    assert pk_json["publicKey"] == default_projectkey.public_key
+    (pk_json,) = redis_cache.get(other_projectkey.public_key)["publicKeys"]
+    assert pk_json["publicKey"] == other_projectkey.public_key
+
+    writes = []
+    monkeypatch.setattr("sentry.relay.projectconfig_cache.set_many", writes.append)
+
+    update_config_cache(generate=True, organization_id=default_organization.id)
+    assert writes == [{}]
+
+    with task_runner():
+        other_project.update_option("sentry:scrub_ip_address", True)
+
+    assert writes[-1]
+    assert other_project.id in writes[-1]
+    assert other_projectkey.public_key in writes[-1]
+    assert default_project.id not in writes[-1]
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize("entire_organization", (True, False))
 def test_invalidate(
@@ -5,11 +5,14 @@ from django.test.utils import override_settings
 
 from sentry import quotas
 from sentry.event_manager import EventManager, HashDiscarded
+from sentry.models import Group
 from sentry.plugins.base.v2 import Plugin2
 from sentry.tasks.store import (
+    SaveEventBatch,
     preprocess_event,
     process_event,
     save_event,
+    save_event_batch,
     symbolicate_event,
     time_synthetic_monitoring_event,
 )
@@ -49,6 +52,12 @@ def mock_save_event():
         yield m
 
 
+@pytest.fixture
+def mock_save_event_batch():
+    with mock.patch("sentry.tasks.store.save_event_batch") as m:
+        yield m
+
+
 @pytest.fixture
 def mock_process_event():
     with mock.patch("sentry.tasks.store.process_event") as m:
@@ -189,6 +198,94 @@ def test_move_to_save_event(
     assert mock_save_event.delay.call_count == 1
 
 
+@pytest.mark.django_db
+def test_move_to_save_event_batch(
+    default_project,
+    mock_process_event,
+    mock_save_event,
+    mock_save_event_batch,
+    mock_symbolicate_event,
+    register_plugin,
+):
+    register_plugin(globals(), BasicPreprocessorPlugin)
+    save_batch = SaveEventBatch(max_size=10)
+
+    for i in range(3):
+        data = {
+            "project": default_project.id,
+            "platform": "NOTMATTLANG",
+            "logentry": {"formatted": "test"},
+            "event_id": EVENT_ID,
+            "extra": {"foo": "bar"},
+        }
+        preprocess_event(cache_key=f"e:{i}", data=data, start_time=1, save_batch=save_batch)
+
+    assert mock_save_event.delay.call_count == 0
+    assert mock_save_event_batch.delay.call_count == 0
+
+    save_batch.submit()
+
+    assert mock_save_event.delay.call_count == 0
+    mock_save_event_batch.delay.assert_called_once_with(
+        events=[{"cache_key": f"e:{i}", "event_id": None, "start_time": 1} for i in range(3)],
+        project_id=default_project.id,
+    )
+
+
+@pytest.mark.django_db
+def test_save_event_batch_single_event(default_project, mock_save_event, mock_save_event_batch):
+    save_batch = SaveEventBatch(max_size=10)
+    assert save_batch.add(default_project, "e:1", EVENT_ID, 1, {"type": "error"})
+    assert not save_batch.add(default_project, "e:2", EVENT_ID, 1, {"type": "transaction"})
+
+    save_batch.submit()
+
+    assert mock_save_event_batch.delay.call_count == 0
+    mock_save_event.delay.assert_called_once_with(
+        cache_key="e:1", data=None, event_id=EVENT_ID, start_time=1, project_id=default_project.id
+    )
+
+
+@pytest.mark.django_db
+def test_save_event_batch(default_project, mock_refund):
+    from sentry.eventstore.processing import event_processing_store
+
+    events = []
+    for i in range(3):
+        manager = EventManager(
+            {
+                "event_id": f"{i:032x}",
+                "logentry": {"formatted": "batched" if i else "discarded"},
+                "user": {"id": "1"},
+                "environment": "production",
+            }
+        )
+        manager.normalize(project_id=default_project.id)
+        data = dict(manager.get_data())
+        data["project"] = default_project.id
+        cache_key = event_processing_store.store(data)
+        events.append({"cache_key": cache_key, "event_id": data["event_id"], "start_time": time()})
+
+    from sentry.event_manager import _save_aggregate
+
+    def save_aggregate(event, **kwargs):
+        if event.event_id == events[0]["event_id"]:
+            raise HashDiscarded()
+        return _save_aggregate(event=event, **kwargs)
+
+    with mock.patch("sentry.event_manager._save_aggregate", side_effect=save_aggregate):
+        save_event_batch(events=events, project_id=default_project.id)
+
+    assert mock_refund.call_count == 1
+    assert event_processing_store.get(events[0]["cache_key"]) is None
+
+    first, second = (event_processing_store.get(e["cache_key"]) for e in events[1:])
+    assert first["event_id"] == events[1]["event_id"]
+    assert second["event_id"] == events[2]["event_id"]
+    assert first["environment"] == second["environment"] == "production"
+    assert first["user"] == second["user"]
+
+
 @pytest.mark.django_db
 def test_process_event_mutate_and_save(
     default_project, mock_event_processing_store, mock_save_event, register_plugin
@@ -409,3 +506,75 @@ def test_time_synthetic_monitoring_event_in_save_event(mock_metrics_timing):
         mock.ANY,
     )
     assert to_process.kwargs == {"tags": tags, "sample_rate": 1.0}
+
+
+@pytest.mark.django_db
+def test_save_event_batch_on_submit(default_project, mock_save_event, mock_save_event_batch):
+    on_submit = mock.Mock()
+    save_batch = SaveEventBatch(max_size=10, on_submit=on_submit)
+    assert save_batch.add(default_project, "e:1", EVENT_ID, 1, {"type": "error"})
+    assert save_batch.is_pending("e:1")
+    assert not on_submit.called
+
+    save_batch.submit()
+
+    assert not save_batch.is_pending("e:1")
+    on_submit.assert_called_once_with(
+        default_project.id, [{"cache_key": "e:1", "event_id": EVENT_ID, "start_time": 1}]
+    )
+
+
+def _store_batched_events(project):
+    from sentry.eventstore.processing import event_processing_store
+
+    events = []
+    for i in range(3):
+        manager = EventManager({"event_id": f"{i:032x}", "logentry": {"formatted": "batched"}})
+        manager.normalize(project_id=project.id)
+        data = dict(manager.get_data())
+        data["project"] = project.id
+        cache_key = event_processing_store.store(data)
+        events.append({"cache_key": cache_key, "event_id": data["event_id"], "start_time": 1})
+    return events
+
+
+@pytest.mark.django_db
+def test_save_event_batch_fallback(default_project, mock_save_event):
+    from sentry.event_manager import _save_aggregate
+    from sentry.eventstore.processing import event_processing_store
+
+    events = _store_batched_events(default_project)
+
+    def save_aggregate(event, **kwargs):
+        if event.event_id == events[0]["event_id"]:
+            raise ValueError("broken event")
+        return _save_aggregate(event=event, **kwargs)
+
+    with mock.patch("sentry.event_manager._save_aggregate", side_effect=save_aggregate):
+        save_event_batch(events=events, project_id=default_project.id)
+
+    # Only the broken event is saved again and its payload is kept for that.
+    mock_save_event.delay.assert_called_once_with(
+        cache_key=events[0]["cache_key"],
+        data=None,
+        start_time=1,
+        event_id=events[0]["event_id"],
+        project_id=default_project.id,
+    )
+    assert event_processing_store.get(events[0]["cache_key"]) is not None
+
+    assert Group.objects.filter(project=default_project).exists()
+
+
+@pytest.mark.django_db
+def test_save_event_batch_fails_after_write(default_project, mock_save_event):
+    events = _store_batched_events(default_project)
+
+    with mock.patch(
+        "sentry.event_manager._tsdb_record_all_metrics", side_effect=ValueError("broken")
+    ):
+        save_event_batch(events=events, project_id=default_project.id)
+
+    # The events were already assigned to groups, so saving them again would
+    # count them twice.
+    assert not mock_save_event.delay.called
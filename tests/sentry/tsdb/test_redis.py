@@ -179,6 +179,28 @@ class RedisTSDBTest(TestCase):
         results = self.db.get_sums(TSDBModel.project, [1, 2], dts[0], dts[-1], environment_id=1)
         assert results == {1: 0, 2: 0}
 
+    def test_get_range_shared_vnodes(self):
+        now = datetime.utcnow().replace(tzinfo=pytz.UTC) - timedelta(hours=2)
+        dts = [now + timedelta(hours=i) for i in range(2)]
+
+        def timestamp(d):
+            t = int(to_timestamp(d))
+            return t - (t % 3600)
+
+        # 1 and 65 are stored in the same hash (vnode 1)
+        self.db.incr_multi([(TSDBModel.group, 1), (TSDBModel.group, 65)], dts[0])
+        self.db.incr_multi([(TSDBModel.group, 65), (TSDBModel.group, "foo")], dts[1], count=2)
+
+        results = self.db.get_range(TSDBModel.group, [1, 65, "foo", 2], dts[0], dts[-1])
+        assert results == {
+            1: [(timestamp(dts[0]), 1), (timestamp(dts[1]), 0)],
+            65: [(timestamp(dts[0]), 1), (timestamp(dts[1]), 2)],
+            "foo": [(timestamp(dts[0]), 0), (timestamp(dts[1]), 2)],
+            2: [(timestamp(dts[0]), 0), (timestamp(dts[1]), 0)],
+        }
+        # Ranges can be iterated more than once.
+        assert list(results[65]) == list(results[65])
+
     def test_count_distinct(self):
         now = datetime.utcnow().replace(tzinfo=pytz.UTC) - timedelta(hours=4)
         dts = [now + timedelta(hours=i) for i in range(4)]
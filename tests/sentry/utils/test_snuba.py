@@ -1,18 +1,25 @@
+import time
 import unittest
+import zlib
 from datetime import datetime, timedelta
 
 import pytest
 import pytz
+from django.core.cache import cache
 from django.utils import timezone
 
 from sentry.models import GroupRelease, Project, Release
 from sentry.testutils import TestCase
+from sentry.utils import json
 from sentry.utils.compat import mock
 from sentry.utils.snuba import (
     Dataset,
     SnubaQueryParams,
     UnqualifiedQueryError,
+    _apply_cache_and_build_results,
+    _get_query_lock,
     _prepare_query_params,
+    get_cache_key,
     get_json_type,
     get_query_params_to_update_for_projects,
     get_snuba_column_name,
@@ -354,3 +361,58 @@ class QuantizeTimeTest(unittest.TestCase):
                 break
 
         assert i != j
+
+
+class QueryCacheTest(TestCase):
+    def setUp(self):
+        self.query = ({"project": [self.project.id]}, lambda x: x, lambda x: x)
+        self.cache_key = get_cache_key(self.query)
+        cache.delete(self.cache_key)
+
+    def query_cached(self):
+        return list(_apply_cache_and_build_results([self.query], referrer="test", use_cache=True))
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_cache(self, bulk_snuba_query):
+        bulk_snuba_query.return_value = [{"data": [1]}]
+        assert self.query_cached() == [{"data": [1]}]
+        assert self.query_cached() == [{"data": [1]}]
+        assert bulk_snuba_query.call_count == 1
+
+        # results cached in the old format are still read
+        cache.set(self.cache_key, json.dumps({"data": [2]}), 60)
+        assert self.query_cached() == [{"data": [2]}]
+        assert bulk_snuba_query.call_count == 1
+
+    @mock.patch("sentry.utils.snuba._query_thread_pool")
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_stale_while_revalidate(self, bulk_snuba_query, query_thread_pool):
+        query_thread_pool.submit.side_effect = lambda fn: fn()
+        bulk_snuba_query.return_value = [{"data": [2]}]
+        stale_result = (time.time() - 1, zlib.compress(json.dumps({"data": [1]}).encode("utf-8")))
+        cache.set(self.cache_key, stale_result, 60)
+
+        with self.options({"snuba.query-cache.stale-seconds": 60}):
+            assert self.query_cached() == [{"data": [1]}]
+            assert bulk_snuba_query.call_count == 1
+            assert self.query_cached() == [{"data": [2]}]
+            assert bulk_snuba_query.call_count == 1
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_single_flight(self, bulk_snuba_query):
+        bulk_snuba_query.return_value = [{"data": [2]}]
+        lock = _get_query_lock(self.cache_key)
+        lock.acquire()
+
+        def finish_other_query(delay):
+            cache.set(self.cache_key, json.dumps({"data": [1]}), 60)
+
+        try:
+            with self.options({"snuba.query-cache.single-flight-timeout": 5.0}), mock.patch(
+                "sentry.utils.snuba.time.sleep", side_effect=finish_other_query
+            ):
+                assert self.query_cached() == [{"data": [1]}]
+        finally:
+            lock.release()
+
+        assert bulk_snuba_query.call_count == 0
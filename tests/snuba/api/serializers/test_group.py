@@ -1,14 +1,18 @@
 import time
 from datetime import timedelta
 
+import pytest
 import pytz
 from django.utils import timezone
+from sentry_sdk import Client, Hub
 
 from sentry.api.serializers import serialize
 from sentry.api.serializers.models.group import (
     GroupSerializerSnuba,
     StreamGroupSerializerSnuba,
+    get_snuba_query_executor,
     snuba_tsdb,
+    submit_snuba_query,
 )
 from sentry.models import (
     Environment,
@@ -23,12 +27,13 @@ from sentry.models import (
     UserOption,
 )
 from sentry.notifications.types import NotificationSettingOptionValues, NotificationSettingTypes
-from sentry.testutils import APITestCase, SnubaTestCase
+from sentry.testutils import APITestCase, SnubaTestCase, TransactionTestCase
 from sentry.testutils.helpers.datetime import before_now, iso_format
 from sentry.types.integrations import ExternalProviders
 from sentry.utils.cache import cache
 from sentry.utils.compat import mock
 from sentry.utils.compat.mock import patch
+from sentry.utils.concurrent import SynchronousExecutor, ThreadedExecutor
 
 
 class GroupSerializerSnubaTest(APITestCase, SnubaTestCase):
@@ -444,6 +449,29 @@ class StreamGroupSerializerTestCase(APITestCase, SnubaTestCase):
             for args, kwargs in get_range.call_args_list:
                 assert kwargs["environment_ids"] is None
 
+    def test_snuba_queries_submitted_to_executor(self):
+        group = self.group
+        environment = Environment.get_or_create(group.project, "production")
+        serializer = StreamGroupSerializerSnuba(
+            environment_ids=[environment.id],
+            stats_period="14d",
+            start=timezone.now() - timedelta(days=7),
+            end=timezone.now(),
+            expand=["sessions"],
+        )
+        expected = serialize([group], serializer=serializer)
+
+        executor = SynchronousExecutor()
+        with mock.patch(
+            "sentry.api.serializers.models.group.get_snuba_query_executor",
+            return_value=executor,
+        ), mock.patch.object(executor, "submit", side_effect=executor.submit) as submit:
+            result = serialize([group], serializer=serializer)
+
+        # Time range and lifetime seen stats, stats and session counts.
+        assert submit.call_count == 4
+        assert result == expected
+
     def test_session_count(self):
         group = self.group
 
@@ -619,3 +647,53 @@ class StreamGroupSerializerTestCase(APITestCase, SnubaTestCase):
         assert result[0]["sessionCount"] == 2
         # No sessions in project2
         assert result[1]["sessionCount"] is None
+
+
+class StreamGroupSerializerThreadedTestCase(TransactionTestCase, SnubaTestCase):
+    # Worker threads use their own database connections, so the test data has
+    # to be committed.
+
+    def test_threaded_snuba_queries(self):
+        group = self.store_event(
+            data={"timestamp": iso_format(before_now(minutes=1)), "environment": "production"},
+            project_id=self.project.id,
+        ).group
+        environment = Environment.objects.get(name="production")
+
+        def serialize_group():
+            serializer = StreamGroupSerializerSnuba(
+                environment_ids=[environment.id],
+                stats_period="14d",
+                start=timezone.now() - timedelta(days=7),
+                end=timezone.now(),
+                expand=["sessions"],
+            )
+            return serialize([group], serializer=serializer)
+
+        expected = serialize_group()
+
+        with self.settings(SENTRY_GROUP_SERIALIZER_SNUBA_WORKERS=2), mock.patch(
+            "sentry.api.serializers.models.group._snuba_query_executor", None
+        ):
+            assert isinstance(get_snuba_query_executor(), ThreadedExecutor)
+            result = serialize_group()
+
+        assert result == expected
+        assert result[0]["count"] == "1"
+
+    @patch("sentry.api.serializers.models.group.close_old_connections")
+    def test_submit_snuba_query(self, close_old_connections):
+        executor = ThreadedExecutor(worker_count=1)
+
+        with Hub(Client()) as hub:
+            future = submit_snuba_query(executor, lambda: (Hub.current.client, hub.client))
+        client, expected_client = future.result()
+        assert client is expected_client
+        assert close_old_connections.call_count == 1
+
+        def fail():
+            raise ValueError("query failed")
+
+        with pytest.raises(ValueError):
+            submit_snuba_query(executor, fail).result()
+        assert close_old_connections.call_count == 2
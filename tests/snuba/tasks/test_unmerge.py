@@ -10,7 +10,7 @@ import pytz
 from django.utils import timezone
 
 from sentry import eventstream, tagstore
-from sentry.app import tsdb
+from sentry.app import locks, tsdb
 from sentry.models import Environment, Group, GroupHash, GroupRelease, Release, UserReport
 from sentry.similarity import _make_index_backend, features
 from sentry.tasks.merge import merge_groups
@@ -18,14 +18,18 @@ from sentry.tasks.unmerge import (
     get_caches,
     get_event_user_from_interface,
     get_fingerprint,
+    get_checkpoint_key,
     get_group_backfill_attributes,
     get_group_creation_attributes,
+    load_checkpoint,
     unmerge,
 )
 from sentry.testutils import SnubaTestCase, TestCase
 from sentry.testutils.helpers.datetime import before_now, iso_format
 from sentry.testutils.helpers.features import with_feature
+from sentry.unmerge import SuccessiveUnmergeArgs, UnmergeArgsBase
 from sentry.utils import redis
+from sentry.utils.cache import default_cache
 from sentry.utils.compat import map
 from sentry.utils.compat.mock import patch
 from sentry.utils.dates import to_timestamp
@@ -592,3 +596,71 @@ class UnmergeTestCase(TestCase, SnubaTestCase):
         )
         assert destination_similar_items[1][0] == source.id
         assert destination_similar_items[1][1]["message:message:character-shingles"] < 1.0
+
+    def test_unmerge_with_time_budget(self):
+        with self.options({"unmerge.time-budget": 60}):
+            self.test_unmerge()
+
+    def test_load_checkpoint(self):
+        args = UnmergeArgsBase.parse_arguments(
+            project_id=self.project.id,
+            source_id=1,
+            destination_id=None,
+            fingerprints=["a" * 32],
+            actor_id=None,
+        )
+        assert load_checkpoint(args) == args
+
+        checkpoint = SuccessiveUnmergeArgs(
+            project_id=self.project.id,
+            source_id=1,
+            replacement=args.replacement,
+            actor_id=None,
+            batch_size=args.batch_size,
+            last_event={"event_id": "b" * 32, "timestamp": 1},
+            destinations={"default": (2, None)},
+            locked_primary_hashes=["a" * 32],
+            source_fields_reset=True,
+        )
+        default_cache.set(get_checkpoint_key(args), checkpoint.dump_arguments(), 60)
+        assert load_checkpoint(args) == checkpoint
+
+        # Checkpoints of other unmerges of the same group are not resumed.
+        other_args = UnmergeArgsBase.parse_arguments(
+            project_id=self.project.id,
+            source_id=1,
+            destination_id=None,
+            fingerprints=["c" * 32],
+            actor_id=None,
+        )
+        assert get_checkpoint_key(other_args) != get_checkpoint_key(args)
+        assert load_checkpoint(other_args) == other_args
+
+        # Successive tasks of completed unmerges are dropped.
+        default_cache.delete(get_checkpoint_key(args))
+        assert load_checkpoint(checkpoint) is None
+
+        group = self.create_group(project=self.project)
+        GroupHash.objects.create(
+            project=self.project,
+            group=group,
+            hash="a" * 32,
+            state=GroupHash.State.LOCKED_IN_MIGRATION,
+        )
+        assert load_checkpoint(checkpoint) == checkpoint
+
+    def test_unmerge_locked(self):
+        group = self.create_group(project=self.project)
+        args = UnmergeArgsBase.parse_arguments(
+            project_id=self.project.id,
+            source_id=group.id,
+            destination_id=None,
+            fingerprints=["a" * 32],
+            actor_id=None,
+        )
+
+        with patch("sentry.tasks.unmerge.run_unmerge") as run_unmerge:
+            with locks.get(get_checkpoint_key(args), duration=10).acquire():
+                with self.tasks():
+                    unmerge.delay(**args.dump_arguments())
+            assert not run_unmerge.called